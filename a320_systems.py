@@ -1,7 +1,7 @@
 """Simplified A320 cockpit system models."""
 
 from dataclasses import dataclass, field, asdict
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Sequence
 
 from complex_navigation import ComplexNavigationSystem
 
@@ -130,6 +130,8 @@ class FlightManagementSystem:
     def __init__(self, nav: ComplexNavigationSystem, nav_db: "NavDatabase | None" = None) -> None:
         self.nav = nav
         self.nav_db = nav_db
+        # Incremented on every route edit so displays can cache their pages
+        self.version = 0
 
     @property
     def waypoints(self) -> List[tuple]:
@@ -139,19 +141,46 @@ class FlightManagementSystem:
         """Load an entirely new route."""
         self.nav.waypoints = list(wpts)
         self.nav.index = 0
+        self.version += 1
 
     def load_route_by_idents(self, idents: List[str]) -> None:
         """Load route from waypoint or airport identifiers using the nav database."""
         if not self.nav_db:
             raise ValueError("Navigation database not configured")
         waypoints: List[tuple] = []
+        # Reused idents resolve to the candidate nearest the previous fix
+        near = self.position()
         for ident in idents:
-            coords = self.nav_db.lookup(ident)
-            if not coords:
-                raise ValueError(f"Unknown fix identifier: {ident}")
+            coords = self.resolve(ident, near)
             waypoints.append((*coords, None, ident))
+            near = coords
         self.load_route(waypoints)
 
+    def resolve(self, ident: str, near: tuple) -> tuple:
+        """Return (lat, lon) of *ident*, the candidate closest to *near*.
+
+        Unknown idents raise ValueError naming the closest known idents
+        one typo away.
+        """
+        coords = self.nav_db.lookup(ident, near)
+        if not coords:
+            message = f"Unknown fix identifier: {ident}"
+            suggestions = self.nav_db.suggest(ident, near)
+            if suggestions:
+                message += f" (did you mean {', '.join(suggestions)}?)"
+            raise ValueError(message)
+        return coords
+
+    def position(self) -> tuple:
+        """Return the aircraft (lat, lon)."""
+        return self.nav.lat_prop.get(), self.nav.lon_prop.get()
+
+    def last_position(self) -> tuple:
+        """Return (lat, lon) of the last route fix, or of the aircraft."""
+        if self.nav.waypoints:
+            return tuple(self.nav.waypoints[-1][:2])
+        return self.position()
+
     def add_waypoint(
         self,
         lat_deg: float,
@@ -160,6 +189,7 @@ class FlightManagementSystem:
         ident: Optional[str] = None,
     ) -> None:
         self.nav.add_waypoint(lat_deg, lon_deg, alt_ft, ident)
+        self.version += 1
 
     def active_waypoint(self) -> Optional[tuple]:
         if self.nav.index < len(self.nav.waypoints):
@@ -174,9 +204,10 @@ class FlightManagementSystem:
         """Delete a waypoint by index."""
         if not 0 <= index < len(self.nav.waypoints):
             raise IndexError("Waypoint index out of range")
-        del self.nav.waypoints[index]
+        self.nav.remove_waypoint(index)
         if self.nav.index > index:
             self.nav.index -= 1
+        self.version += 1
 
     def set_altitude_constraint(self, index: int, alt_ft: Optional[float]) -> None:
         """Set or clear the altitude constraint for a waypoint."""
@@ -184,7 +215,8 @@ class FlightManagementSystem:
             raise IndexError("Waypoint index out of range")
         lat, lon, _, *rest = self.nav.waypoints[index]
         ident = rest[0] if rest else None
-        self.nav.waypoints[index] = (lat, lon, alt_ft, ident)
+        self.nav.set_waypoint(index, (lat, lon, alt_ft, ident))
+        self.version += 1
 
 
 class AutopilotPanel:
@@ -642,19 +674,21 @@ class OxygenPanel:
 class MCDUDisplay:
     """Expose the flight plan, active waypoint and page contents."""
 
-    flight_plan: List[tuple] = field(default_factory=list)
+    flight_plan: Sequence[tuple] = field(default_factory=list)
     active_index: int = 0
     pages: dict[str, List[str]] = field(default_factory=dict)
 
     def update(self, data: dict) -> None:
+        # The MCDU hands out cached snapshots that are replaced on change
+        # and never modified, so they are stored without copying
         plan = data.get("flight_plan")
         if plan is not None:
-            self.flight_plan = [tuple(wp) for wp in plan]
+            self.flight_plan = plan
         if "active_index" in data:
             self.active_index = data["active_index"]
         pages = data.get("pages")
         if pages is not None:
-            self.pages = {name: list(lines) for name, lines in pages.items()}
+            self.pages = pages
 
 
 @dataclass
@@ -0,0 +1,302 @@
+"""Benchmark the simulator hot paths and compare against a baseline."""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from complex_navigation import ComplexNavigationSystem
+from fake_fdm import FakeFDM
+from navdb import NavDatabase
+from tcas import TCASSystem
+
+# Default allowed slowdown before a result counts as a regression.
+DEFAULT_THRESHOLD = 0.10
+
+
+def measure(
+    fn: Callable[[], object],
+    number: int | None = None,
+    repeat: int = 5,
+    min_round_s: float = 0.05,
+) -> float:
+    """Return the best time in seconds of one call to *fn* over *repeat* rounds.
+
+    Without *number* the calls per round are doubled until a round takes
+    at least *min_round_s*, which also serves as the warm-up. As with
+    :mod:`timeit` the fastest round is reported because it is the least
+    disturbed by other load on the machine; garbage collection is paused
+    while timing.
+    """
+    timer = time.perf_counter
+    if number is None:
+        number = 1
+        while True:
+            start = timer()
+            for _ in range(number):
+                fn()
+            if timer() - start >= min_round_s:
+                break
+            number *= 2
+    else:
+        for _ in range(number):
+            fn()
+    best = float("inf")
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = timer()
+            for _ in range(number):
+                fn()
+            best = min(best, (timer() - start) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return best
+
+
+def rate(seconds: float) -> dict:
+    return {"value": 1.0 / seconds, "unit": "ops/s", "higher_is_better": True}
+
+
+def latency(seconds: float) -> dict:
+    return {"value": seconds * 1000.0, "unit": "ms", "higher_is_better": False}
+
+
+def footprint(nbytes: int) -> dict:
+    return {"value": nbytes / 1e6, "unit": "MB", "higher_is_better": False}
+
+
+def write_navdb(directory: Path, waypoints: int, airports: int, seed: int = 0) -> None:
+    """Write a reproducible synthetic nav database in the CSV layout."""
+    rng = random.Random(seed)
+    with open(directory / "airports.csv", "w") as f:
+        f.write("ident,name,lat_deg,lon_deg\n")
+        for i in range(airports):
+            f.write(
+                f"K{i:04d},Airport {i},{rng.uniform(-60, 70):.6f},"
+                f"{rng.uniform(-180, 180):.6f}\n"
+            )
+    with open(directory / "waypoints.csv", "w") as f:
+        f.write("ident,lat_deg,lon_deg\n")
+        for i in range(waypoints):
+            f.write(
+                f"W{i:05d},{rng.uniform(-60, 70):.6f},{rng.uniform(-180, 180):.6f}\n"
+            )
+    with open(directory / "ils.csv", "w") as f:
+        f.write("freq_mhz,lat_deg,lon_deg,heading_deg,alt_ft\n")
+        f.write("110.30,37.60,-122.05,270.0,10.0\n")
+
+
+def load_navdb(directory: Path, use_cache: bool = True) -> NavDatabase:
+    return NavDatabase(
+        directory / "airports.csv",
+        directory / "waypoints.csv",
+        directory / "ils.csv",
+        use_cache=use_cache,
+    )
+
+
+def _position_fdm(lat: float, lon: float, alt: float) -> FakeFDM:
+    fdm = FakeFDM()
+    fdm["ic/lat-gc-deg"] = lat
+    fdm["ic/long-gc-deg"] = lon
+    fdm["ic/h-sl-ft"] = alt
+    fdm.run_ic()
+    return fdm
+
+
+def bench_navdb(results: dict, navdb_dir: Path) -> NavDatabase:
+    # Parsing the CSVs is what a stale or missing cache costs; the plain
+    # load maps the compiled cache written by the first call.
+    results["navdb_parse"] = latency(measure(lambda: load_navdb(navdb_dir, False), 1))
+    results["navdb_load"] = latency(measure(lambda: load_navdb(navdb_dir), 1))
+    # The spatial index is built by the first query of a fresh database
+    results["navdb_index"] = latency(
+        measure(lambda: load_navdb(navdb_dir).nearest(37.6, -122.0), 1)
+    )
+    nav_db = load_navdb(navdb_dir)
+    results["navdb_nearest"] = latency(measure(lambda: nav_db.nearest(37.6, -122.0, 5)))
+    results["navdb_within_40nm"] = latency(measure(lambda: nav_db.within(37.6, -122.0, 40.0)))
+    results["navdb_complete"] = latency(measure(lambda: nav_db.complete("W01", 20)))
+    results["navdb_suggest"] = latency(measure(lambda: nav_db.suggest("W0O12", (37.6, -122.0))))
+    usage = nav_db.memory_usage()
+    results["navdb_tables_size"] = footprint(usage["tables"])
+    results["navdb_private_size"] = footprint(usage["private"])
+    return nav_db
+
+
+def bench_tcas(results: dict) -> None:
+    rng = random.Random(1)
+    fdm = _position_fdm(37.6, -122.0, 10000.0)
+    for count in (10, 100, 1000):
+        # Distant traffic never alerts, so every target is checked
+        traffic = [
+            {
+                "lat": 37.6 + rng.uniform(1.0, 3.0),
+                "lon": -122.0 + rng.uniform(-3.0, 3.0),
+                "alt": rng.uniform(0.0, 40000.0),
+            }
+            for _ in range(count)
+        ]
+        tcas = TCASSystem(fdm, traffic)
+        results[f"tcas_update_{count}"] = latency(measure(tcas.update))
+
+
+def bench_navigation(results: dict) -> None:
+    for count in (100, 1000):
+        route = [
+            (37.0 + i * 0.05, -122.0 + (i % 2) * 0.05, 10000.0 + i, f"R{i}")
+            for i in range(count)
+        ]
+        mid = route[count // 2]
+        fdm = _position_fdm(mid[0] + 0.01, mid[1], 10000.0)
+        nav = ComplexNavigationSystem(fdm, route)
+        nav.index = count // 2
+        results[f"nav_update_{count}"] = latency(measure(nav.update))
+        results[f"nav_remaining_{count}"] = latency(measure(nav.remaining_distance))
+
+
+def bench_sim(results: dict, args, nav_db: NavDatabase) -> None:
+    from cockpit import A320Cockpit
+    from ifrsim import A320IFRSim
+
+    def backend():
+        return FakeFDM() if args.fdm == "fake" else None
+
+    sim = A320IFRSim(args.root_dir, seed=0, nav_db=nav_db, fdm=backend())
+    results["sim_startup"] = latency(sim.startup.total)
+    for _ in range(args.warmup):
+        sim.step(real_time=False)
+    state = sim.save_state()
+
+    def sim_round():
+        sim.restore_state(state)
+        for _ in range(args.steps):
+            sim.step(real_time=False)
+
+    results["sim_step"] = rate(measure(sim_round, 1) / args.steps)
+
+    cp = A320Cockpit(args.root_dir, seed=0, nav_db=nav_db, fdm=backend())
+    for _ in range(args.warmup):
+        cp.step(real_time=False)
+    state = cp.sim.save_state()
+
+    def cockpit_round():
+        cp.sim.restore_state(state)
+        for _ in range(args.steps):
+            cp.step(real_time=False)
+
+    results["cockpit_step"] = rate(measure(cockpit_round, 1) / args.steps)
+    # Hardware bridge style consumer reading only the flight and warning data
+    token = cp.subscribe(("pfd", "warnings"))
+    results["cockpit_step_projected"] = rate(measure(cockpit_round, 1) / args.steps)
+    cp.unsubscribe(token)
+    results["snapshot"] = latency(measure(cp.cockpit_systems.snapshot))
+    results["mcdu_all_pages"] = latency(measure(cp.mcdu.all_pages))
+    results["ecam_all_pages"] = latency(measure(cp.ecam.all_pages))
+
+
+def run_benchmarks(args) -> dict:
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        navdb_dir = Path(args.navdb_dir) if args.navdb_dir else Path(tmp)
+        if not args.navdb_dir:
+            write_navdb(navdb_dir, args.navdb_waypoints, args.navdb_airports)
+        nav_db = bench_navdb(results, navdb_dir)
+    bench_tcas(results)
+    bench_navigation(results)
+    bench_sim(results, args, nav_db)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fdm": args.fdm,
+            "steps": args.steps,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Return one row per benchmark present in both result sets.
+
+    ``change`` is the relative slowdown (positive is worse) and
+    ``regression`` is set when it exceeds *threshold*.
+    """
+    rows = []
+    base = baseline["results"]
+    for name, result in current["results"].items():
+        if name not in base:
+            continue
+        old = base[name]["value"]
+        new = result["value"]
+        if result["higher_is_better"]:
+            change = old / new - 1.0 if new else float("inf")
+        else:
+            change = new / old - 1.0 if old else 0.0
+        rows.append(
+            {
+                "name": name,
+                "unit": result["unit"],
+                "baseline": old,
+                "current": new,
+                "change": change,
+                "regression": change > threshold,
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed relative slowdown, e.g. 0.1 for 10%%",
+    )
+    parser.add_argument("--fdm", choices=("jsbsim", "fake"), default="jsbsim")
+    parser.add_argument("--root-dir", default="jsbsim-master")
+    parser.add_argument("--navdb-dir", help="use real CSVs instead of synthetic data")
+    parser.add_argument("--navdb-waypoints", type=int, default=20000)
+    parser.add_argument("--navdb-airports", type=int, default=5000)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=100)
+    args = parser.parse_args()
+
+    current = run_benchmarks(args)
+    Path(args.output).write_text(json.dumps(current, indent=2) + "\n")
+    for name, result in current["results"].items():
+        print(f"{name:24} {result['value']:14.4f} {result['unit']}")
+    if not args.baseline:
+        return
+    baseline = json.loads(Path(args.baseline).read_text())
+    rows = compare(current, baseline, args.threshold)
+    print()
+    failed = False
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['name']:24} {row['baseline']:14.4f} -> {row['current']:14.4f} "
+            f"{row['unit']:6} {row['change'] * 100:+7.1f}% {flag}"
+        )
+        failed |= row["regression"]
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
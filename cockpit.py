@@ -6,7 +6,6 @@ from ifrsim import A320IFRSim
 from a320_systems import (
     PrimaryFlightDisplay,
     EngineDisplay,
-    FlightManagementSystem,
     PressurizationDisplay,
     WarningPanel,
     AutopilotPanel,
@@ -37,13 +36,95 @@ from a320_systems import (
 )
 from mcdu import MCDU
 from ecam import ECAM
+from step_frame import STEP_FIELDS, Subscriptions
+
+WARNING_FIELDS = (
+    "stall_warning",
+    "gpws_warning",
+    "overspeed_warning",
+    "engine_fire",
+    "tcas_alert",
+    "master_caution",
+)
+
+# Step outputs read by each section of the A320Cockpit.step() status.
+# "panels" is the aggregated CockpitSystems behind snapshot() and the ECAM
+# pages, which read every output.
+STATUS_FIELDS = {
+    "pfd": (
+        "altitude_ft",
+        "speed_kt",
+        "heading_deg",
+        "vs_fpm",
+        "pitch_deg",
+        "roll_deg",
+        "pitch_cmd",
+        "aileron_cmd",
+    ),
+    "ecam": STEP_FIELDS,
+    "ewd": ("n1", "egt", "oil_press", "oil_temp", "fuel_lbs") + WARNING_FIELDS,
+    "radio": (),
+    "transponder": (),
+    "autopilot": ("autobrake_active",),
+    "nav_display": (
+        "nav_dist_nm",
+        "ils_dist_nm",
+        "loc_dev_deg",
+        "gs_dev_ft",
+        "tcas_alert",
+    ),
+    "hydraulics": ("hyd_press",),
+    "hydraulic_panel": ("hyd_press",),
+    "electrical": ("elec_charge", "rat_deployed"),
+    "systems": ("hyd_press", "elec_charge", "bleed_press"),
+    "overhead": ("crossfeed",),
+    "bleed_air": ("bleed_press", "anti_ice_on", "wing_anti_ice_on"),
+    "environment": ("outside_temp_c", "precip_intensity"),
+    "weather_radar": ("weather_radar",),
+    "tcas_display": ("tcas_alert",),
+    "navigation": (),
+    "mcdu": (),
+    "fuel": ("fuel_left_lbs", "fuel_right_lbs", "fuel_lbs", "crossfeed"),
+    "cabin": ("cabin_altitude_ft", "cabin_diff_psi", "cabin_temp_c"),
+    "altimeter": (),
+    "oxygen": ("oxygen_level",),
+    "cabin_signs": (),
+    "lights": (),
+    "controls": ("flap", "gear", "parking_brake"),
+    "brakes": ("brake_temp", "autobrake_active"),
+    "clock": ("time_s",),
+    "warnings": WARNING_FIELDS,
+    "panels": STEP_FIELDS,
+}
+
+# Cockpit panels updated from the step outputs and the status sections
+# that show them.
+PANEL_SECTIONS = {
+    "pfd": ("pfd",),
+    "ecam_display": ("ecam", "ewd"),
+    "weather_radar": ("weather_radar",),
+    "nav_display": ("nav_display",),
+    "tcas_display": ("tcas_display",),
+    "system_status": ("systems",),
+    "overhead": ("overhead",),
+    "hydraulic_panel": ("hydraulic_panel",),
+    "bleed_air_panel": ("bleed_air",),
+    "environment_panel": ("environment",),
+    "fuel": ("fuel",),
+    "cabin_signs": ("cabin_signs",),
+    "parking_brake": ("controls",),
+    "brakes_display": ("brakes",),
+    "oxygen_display": ("oxygen",),
+    "pressurization": ("cabin",),
+    "clock": ("clock",),
+}
 
 
 class A320Cockpit:
     """High level interface exposing the main cockpit systems."""
 
-    def __init__(self, root_dir: str = "jsbsim-master"):
-        self.sim = A320IFRSim(root_dir=root_dir)
+    def __init__(self, root_dir: str = "jsbsim-master", **sim_options):
+        self.sim = A320IFRSim(root_dir=root_dir, **sim_options)
         self.radio = RadioPanel()
         self.transponder = Transponder()
         self.autopilot = AutopilotPanel(self.sim.autopilot)
@@ -72,10 +153,52 @@ class A320Cockpit:
         self.ecam_display = EngineDisplay()
         self.pressurization = PressurizationDisplay()
         self.warnings_panel = WarningPanel()
-        self.fms = FlightManagementSystem(self.sim.nav, self.sim.nav_db)
+        # Share the simulation's FMS so route edits bump one version counter
+        self.fms = self.sim.fms
         self.mcdu = MCDU(self.fms)
         self.cockpit_systems = CockpitSystems(overhead=self.overhead)
         self.ecam = ECAM(self.cockpit_systems)
+        self._cockpit_data: dict = {}
+        # Status sections requested by consumers, see subscribe()
+        self.outputs = Subscriptions(STATUS_FIELDS)
+        self._sim_token: int | None = None
+
+    def set_profiling(self, enabled: bool) -> None:
+        """Time the simulation subsystems and the cockpit panel updates.
+
+        Results are available from ``self.sim.profiler.report()``.
+        """
+        if not enabled:
+            self.sim.profiler.disable()
+            return
+        targets = self.sim.profile_targets()
+        targets["cockpit.step"] = (self, "step")
+        for name in (
+            "pfd",
+            "ecam_display",
+            "weather_radar",
+            "nav_display",
+            "tcas_display",
+            "system_status",
+            "overhead",
+            "hydraulic_panel",
+            "bleed_air_panel",
+            "environment_panel",
+            "fuel",
+            "cabin_signs",
+            "parking_brake",
+            "brakes_display",
+            "oxygen_display",
+            "pressurization",
+            "altimeter",
+            "clock",
+            "warnings_panel",
+            "cockpit_systems",
+        ):
+            targets[f"cockpit.{name}.update"] = (getattr(self, name), "update")
+        targets["cockpit.mcdu.all_pages"] = (self.mcdu, "all_pages")
+        targets["cockpit.ecam.all_pages"] = (self.ecam, "all_pages")
+        self.sim.profiler.enable(targets)
 
     def set_seatbelt_sign(self, on: bool) -> None:
         """Toggle the seatbelt sign."""
@@ -134,83 +257,115 @@ class A320Cockpit:
         """Toggle fuel crossfeed via the overhead panel."""
         self.overhead.toggle_crossfeed()
 
-    def step(self):
-        """Advance the underlying simulation and return a status snapshot."""
-        data = self.sim.step()
-        self.pfd.update(data)
-        self.ecam_display.update(data)
-        self.weather_radar.update(data)
-        self.nav_display.update(data)
-        self.tcas_display.update(data)
-        self.system_status.update(data)
-        self.overhead.update(data)
-        self.hydraulic_panel.update(data)
-        self.bleed_air_panel.update(data)
-        self.environment_panel.update(data)
-        self.fuel.update(data)
-        self.cabin_signs.update(data)
-        self.parking_brake.update(data)
-        self.brakes_display.update(data)
-        self.oxygen_display.update(data)
-        self.pressurization.update(data)
-        self.altimeter.update({"pressure_hpa": self.altimeter.pressure_hpa})
-        self.clock.update(data)
-        warnings = {
-            "stall": data["stall_warning"],
-            "gpws": data["gpws_warning"],
-            "overspeed": data["overspeed_warning"],
-            "fire": data["engine_fire"],
-            "tcas": data["tcas_alert"],
-            "master_caution": data["master_caution"],
-        }
-        self.warnings_panel.update({"warnings": warnings})
-        autopilot_info = {
-            "engaged": self.sim.autopilot.engaged,
-            "autothrottle": self.sim.autopilot.autothrottle.engaged,
-            "target_altitude_ft": self.sim.autopilot.altitude,
-            "target_heading_deg": self.sim.autopilot.heading,
-            "target_speed_kt": self.sim.autopilot.speed,
-            "target_vs_fpm": self.sim.autopilot.vs_target_fpm,
-            "autobrake_level": self.sim.autobrake.level,
-            "autobrake_active": data["autobrake_active"],
-            "automation": self.sim.autopilot.auto_manage_systems,
-            "vertical_mode": self.sim.autopilot.vertical_mode,
-            "lateral_mode": self.sim.autopilot.lateral_mode,
-        }
-        cockpit_data = {
-            **data,
-            "warnings": warnings,
-            "apu_running": self.sim.electrics.apu_running,
-            "generator_failed": self.sim.electrics.generator_failed,
-            "autopilot": autopilot_info,
-            "radio": {
+    def subscribe(self, sections) -> int:
+        """Limit :meth:`step` to the status *sections* and return a token.
+
+        Section names are the keys of :data:`STATUS_FIELDS`. Only the panels
+        feeding the subscribed sections are updated and the simulation is
+        subscribed to the step outputs they read. ``"panels"`` keeps the
+        aggregated :attr:`cockpit_systems` (used by ``snapshot()`` and the
+        ECAM pages) up to date.
+        """
+        token = self.outputs.subscribe(sections)
+        self._apply_outputs()
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        """Withdraw a subscription made with :meth:`subscribe`."""
+        self.outputs.unsubscribe(token)
+        self._apply_outputs()
+
+    def _apply_outputs(self) -> None:
+        if self._sim_token is not None:
+            self.sim.unsubscribe(self._sim_token)
+            self._sim_token = None
+        if self.outputs.projected:
+            fields: set[str] = set()
+            for section in self.outputs.active:
+                fields.update(STATUS_FIELDS[section])
+            self._sim_token = self.sim.subscribe(fields)
+
+    def step(self, real_time: bool = True):
+        """Advance the underlying simulation and return a status snapshot.
+
+        With *real_time* the call blocks on the simulation's real-time clock
+        after the panels are updated, so the whole cockpit frame is paced.
+        The status holds the sections selected with :meth:`subscribe`, all
+        of them by default.
+        """
+        data = self.sim.step(real_time=False)
+        sections = self.outputs.active
+        # The ECAM pages are rendered from the aggregated panels
+        panels = "panels" in sections or "ecam" in sections
+        for name, needed in PANEL_SECTIONS.items():
+            if panels or not sections.isdisjoint(needed):
+                getattr(self, name).update(data)
+        if panels or "altimeter" in sections:
+            self.altimeter.update({"pressure_hpa": self.altimeter.pressure_hpa})
+        warnings = None
+        if panels or not sections.isdisjoint(("warnings", "ewd")):
+            warnings = {
+                "stall": data["stall_warning"],
+                "gpws": data["gpws_warning"],
+                "overspeed": data["overspeed_warning"],
+                "fire": data["engine_fire"],
+                "tcas": data["tcas_alert"],
+                "master_caution": data["master_caution"],
+            }
+            self.warnings_panel.update({"warnings": warnings})
+        autopilot_info = None
+        if panels or "autopilot" in sections:
+            autopilot_info = {
+                "engaged": self.sim.autopilot.engaged,
+                "autothrottle": self.sim.autopilot.autothrottle.engaged,
+                "target_altitude_ft": self.sim.autopilot.altitude,
+                "target_heading_deg": self.sim.autopilot.heading,
+                "target_speed_kt": self.sim.autopilot.speed,
+                "target_vs_fpm": self.sim.autopilot.vs_target_fpm,
+                "autobrake_level": self.sim.autobrake.level,
+                "autobrake_active": data["autobrake_active"],
+                "automation": self.sim.autopilot.auto_manage_systems,
+                "vertical_mode": self.sim.autopilot.vertical_mode,
+                "lateral_mode": self.sim.autopilot.lateral_mode,
+            }
+        mcdu_pages = None
+        if panels or "mcdu" in sections:
+            mcdu_pages = self.mcdu.all_pages()
+        ecam_pages = None
+        if panels:
+            # Reuse one dict for the panel fan-out instead of merging per frame
+            cockpit_data = data.fill_dict(self._cockpit_data)
+            cockpit_data["warnings"] = warnings
+            cockpit_data["apu_running"] = self.sim.electrics.apu_running
+            cockpit_data["generator_failed"] = self.sim.electrics.generator_failed
+            cockpit_data["autopilot"] = autopilot_info
+            cockpit_data["radio"] = {
                 "com1_active": self.radio.com1_active,
                 "com1_standby": self.radio.com1_standby,
                 "com2_active": self.radio.com2_active,
                 "com2_standby": self.radio.com2_standby,
-            },
-            "parking_brake": self.sim.brakes.parking_brake,
-            "pressure_hpa": self.altimeter.pressure_hpa,
-            "mcdu": {
-                "flight_plan": [tuple(wp) for wp in self.fms.waypoints],
+            }
+            cockpit_data["pressure_hpa"] = self.altimeter.pressure_hpa
+            cockpit_data["mcdu"] = {
+                "flight_plan": self.mcdu.flight_plan(),
                 "active_index": self.fms.nav.index,
-            },
-        }
-        self.cockpit_systems.update(cockpit_data)
-        mcdu_pages = self.mcdu.all_pages()
-        ecam_pages = self.ecam.all_pages()
-        self.cockpit_systems.mcdu.update({"pages": mcdu_pages})
-        self.cockpit_systems.ecam_pages.update({"ecam_pages": ecam_pages})
-        return {
-            "pfd": {
+            }
+            self.cockpit_systems.update(cockpit_data)
+            ecam_pages = self.ecam.all_pages()
+            self.cockpit_systems.mcdu.update({"pages": mcdu_pages})
+            self.cockpit_systems.ecam_pages.update({"ecam_pages": ecam_pages})
+        status = {}
+        if "pfd" in sections:
+            status["pfd"] = {
                 "altitude_ft": self.pfd.altitude_ft,
                 "speed_kt": self.pfd.speed_kt,
                 "heading_deg": self.pfd.heading_deg,
                 "vs_fpm": self.pfd.vs_fpm,
                 "pitch_deg": self.pfd.pitch_deg,
                 "roll_deg": self.pfd.roll_deg,
-            },
-            "ecam": {
+            }
+        if "ecam" in sections:
+            status["ecam"] = {
                 "n1": self.ecam_display.n1,
                 "oil_press": self.ecam_display.oil_press,
                 "oil_temp": self.ecam_display.oil_temp,
@@ -219,111 +374,139 @@ class A320Cockpit:
                 "apu_flow_pph": self.ecam_display.apu_flow_pph,
                 "fire_bottles": self.ecam_display.fire_bottles,
                 "pages": ecam_pages,
-            },
-            "ewd": {
+            }
+        if "ewd" in sections:
+            status["ewd"] = {
                 "n1": self.ecam_display.n1,
                 "egt": self.ecam_display.egt,
                 "oil_press": self.ecam_display.oil_press,
                 "oil_temp": self.ecam_display.oil_temp,
                 "fuel_lbs": self.ecam_display.fuel_lbs,
                 "warnings": warnings,
-            },
-            "radio": {
+            }
+        if "radio" in sections:
+            status["radio"] = {
                 "com1_active": self.radio.com1_active,
                 "com1_standby": self.radio.com1_standby,
                 "com2_active": self.radio.com2_active,
                 "com2_standby": self.radio.com2_standby,
-            },
-            "transponder": {
+            }
+        if "transponder" in sections:
+            status["transponder"] = {
                 "code": self.transponder.code,
                 "mode": self.transponder.mode,
-            },
-            "autopilot": autopilot_info,
-            "nav_display": {
+            }
+        if "autopilot" in sections:
+            status["autopilot"] = autopilot_info
+        if "nav_display" in sections:
+            status["nav_display"] = {
                 "distance_nm": self.nav_display.distance_nm,
                 "ils_distance_nm": self.nav_display.ils_distance_nm,
                 "loc_dev_deg": self.nav_display.loc_dev_deg,
                 "gs_dev_ft": self.nav_display.gs_dev_ft,
                 "tcas": self.nav_display.tcas_alert,
-            },
-            "hydraulics": {"pressure": data["hyd_press"]},
-            "hydraulic_panel": {"pressure": self.hydraulic_panel.pressure},
-            "electrical": {
+            }
+        if "hydraulics" in sections:
+            status["hydraulics"] = {"pressure": data["hyd_press"]}
+        if "hydraulic_panel" in sections:
+            status["hydraulic_panel"] = {"pressure": self.hydraulic_panel.pressure}
+        if "electrical" in sections:
+            status["electrical"] = {
                 "charge": data["elec_charge"],
                 "apu_running": self.sim.electrics.apu_running,
                 "rat_deployed": data["rat_deployed"],
                 "generator_failed": self.sim.electrics.generator_failed,
-            },
-            "systems": {
+            }
+        if "systems" in sections:
+            status["systems"] = {
                 "hydraulic_pressure": self.system_status.hydraulic_pressure,
                 "electrical_charge": self.system_status.electrical_charge,
                 "bleed_pressure": self.system_status.bleed_pressure,
-            },
-            "overhead": {
+            }
+        if "overhead" in sections:
+            status["overhead"] = {
                 "apu_running": self.overhead.apu_running,
                 "crossfeed": self.overhead.crossfeed,
-            },
-            "bleed_air": {
+            }
+        if "bleed_air" in sections:
+            status["bleed_air"] = {
                 "pressure": self.bleed_air_panel.pressure,
                 "anti_ice_on": self.bleed_air_panel.anti_ice_on,
                 "wing_anti_ice_on": self.bleed_air_panel.wing_anti_ice_on,
-            },
-            "environment": {
+            }
+        if "environment" in sections:
+            status["environment"] = {
                 "temperature_c": data["outside_temp_c"],
                 "precip_intensity": data["precip_intensity"],
-            },
-            "weather_radar": self.weather_radar.detecting,
-            "tcas_display": {
+            }
+        if "weather_radar" in sections:
+            status["weather_radar"] = self.weather_radar.detecting
+        if "tcas_display" in sections:
+            status["tcas_display"] = {
                 "alert": self.tcas_display.alert,
                 "bearing_deg": self.tcas_display.bearing_deg,
                 "distance_nm": self.tcas_display.distance_nm,
                 "alt_diff_ft": self.tcas_display.alt_diff_ft,
-            },
-            "navigation": {
+            }
+        if "navigation" in sections:
+            status["navigation"] = {
                 "active_waypoint": self.fms.active_waypoint(),
-            },
-            "mcdu": {
-                "flight_plan": [tuple(wp) for wp in self.fms.waypoints],
+            }
+        if "mcdu" in sections:
+            status["mcdu"] = {
+                "flight_plan": self.mcdu.flight_plan(),
                 "active_index": self.fms.nav.index,
                 "pages": mcdu_pages,
-            },
-            "fuel": {
+            }
+        if "fuel" in sections:
+            status["fuel"] = {
                 "left_lbs": data["fuel_left_lbs"],
                 "right_lbs": data["fuel_right_lbs"],
                 "total_lbs": data["fuel_lbs"],
                 "crossfeed": data["crossfeed"],
-            },
-            "cabin": {
+            }
+        if "cabin" in sections:
+            status["cabin"] = {
                 "altitude_ft": data["cabin_altitude_ft"],
                 "diff_psi": data["cabin_diff_psi"],
                 "temperature_c": data["cabin_temp_c"],
-            },
-            "altimeter": {"pressure_hpa": self.altimeter.pressure_hpa},
-            "oxygen": {"level": data["oxygen_level"]},
-            "cabin_signs": {
+            }
+        if "altimeter" in sections:
+            status["altimeter"] = {"pressure_hpa": self.altimeter.pressure_hpa}
+        if "oxygen" in sections:
+            status["oxygen"] = {"level": data["oxygen_level"]}
+        if "cabin_signs" in sections:
+            status["cabin_signs"] = {
                 "seatbelt": self.cabin_signs.seatbelt_on,
                 "no_smoking": self.cabin_signs.no_smoking_on,
-            },
-            "lights": {
+            }
+        if "lights" in sections:
+            status["lights"] = {
                 "landing": self.lights.landing_on,
                 "taxi": self.lights.taxi_on,
                 "nav": self.lights.nav_on,
                 "strobe": self.lights.strobe_on,
                 "beacon": self.lights.beacon_on,
-            },
-            "controls": {
+            }
+        if "controls" in sections:
+            status["controls"] = {
                 "flap": data["flap"],
                 "gear": data["gear"],
                 "speedbrake": self.sim.systems.speedbrake,
                 "parking_brake": self.sim.brakes.parking_brake,
-            },
-            "brakes": {
+            }
+        if "brakes" in sections:
+            status["brakes"] = {
                 "temperature": self.brakes_display.temperature,
                 "autobrake_active": self.brakes_display.autobrake_active,
-            },
-            "clock": {"time": self.clock.time_hms},
-            "warnings": warnings,
-        }
+            }
+        if "clock" in sections:
+            status["clock"] = {"time": self.clock.time_hms}
+        if "warnings" in sections:
+            status["warnings"] = warnings
+        if real_time:
+            self.sim.realtime.wait()
+        return status
 
 
 if __name__ == "__main__":
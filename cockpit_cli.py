@@ -1,5 +1,10 @@
 """Simple CLI to interact with the A320 cockpit systems."""
 
+try:
+    import readline
+except ImportError:  # not available on every platform
+    readline = None
+
 from cockpit import A320Cockpit
 
 
@@ -34,6 +39,7 @@ HELP_TEXT = """Available commands:
   direct INDEX        - skip to flight plan waypoint
   delwp INDEX         - delete waypoint at INDEX
   wpalt INDEX ALT     - set altitude constraint for waypoint
+  navdb [reload]      - show or reload the navigation database
   mcdu pages          - list available MCDU pages
   mcdu PAGE           - show a textual MCDU page
   ecam pages          - list available ECAM pages
@@ -47,9 +53,33 @@ HELP_TEXT = """Available commands:
   swap2               - swap COM2 active and standby
   ils FREQ            - tune ILS standby frequency
   swapils             - swap ILS active and standby
+  timing              - show frame statistics and startup phase times
+  profile on|off      - time subsystem and panel updates
+  profile [reset]     - show or clear subsystem timings
   quit                - exit the program"""
 
 
+COMMANDS = sorted({line.split()[0] for line in HELP_TEXT.splitlines()[1:]} | {"help"})
+
+
+def make_completer(cp: A320Cockpit):
+    """Return a readline completer for commands and route fix idents."""
+    matches: list[str] = []
+
+    def complete(text: str, state: int):
+        if state == 0:
+            words = readline.get_line_buffer()[: readline.get_begidx()].split()
+            if not words:
+                matches[:] = [c for c in COMMANDS if c.startswith(text)]
+            elif words[0] == "route":
+                matches[:] = cp.mcdu.complete_ident(text, limit=50)
+            else:
+                matches[:] = []
+        return matches[state] if state < len(matches) else None
+
+    return complete
+
+
 def print_status(status: dict) -> None:
     pfd = status["pfd"]
     ecam = status["ecam"]
@@ -113,9 +143,42 @@ def print_radio(status: dict) -> None:
     print(line)
 
 
+def print_timing(stats: dict) -> None:
+    print(
+        f"{stats['frames']} frames at {stats['dt_ms']:.0f}ms ({stats['policy']}): "
+        f"mean {stats['mean_frame_ms']:.2f}ms max {stats['max_frame_ms']:.2f}ms "
+        f"overruns {stats['overruns']} skipped {stats['skipped']} "
+        f"restarts {stats['restarts']} "
+        f"max late {stats['max_lateness_ms']:.2f}ms"
+    )
+    for name in ("frame_ms", "lateness_ms"):
+        hist = " ".join(f"{k}:{v}" for k, v in stats[name].items() if v)
+        print(f"  {name} {hist}")
+
+
+def print_startup(rows: list[dict]) -> None:
+    print("startup " + " ".join(f"{row['name']} {row['ms']:.1f}ms" for row in rows))
+
+
+def print_profile(rows: list[dict]) -> None:
+    if not rows:
+        print("No profile data. Use 'profile on' and run some steps.")
+        return
+    print(f"{'COMPONENT':32} {'CALLS':>7} {'MEAN':>8} {'P50':>8} {'P95':>8} {'P99':>8} {'MAX':>8}")
+    for row in rows:
+        print(
+            f"{row['name']:32} {row['calls']:7d} {row['mean_ms']:8.3f} "
+            f"{row['p50_ms']:8.3f} {row['p95_ms']:8.3f} {row['p99_ms']:8.3f} "
+            f"{row['max_ms']:8.3f}"
+        )
+
+
 def main() -> None:
     cp = A320Cockpit()
     cp.sim.set_ils_frequency(cp.radio.ils_active)
+    if readline is not None:
+        readline.set_completer(make_completer(cp))
+        readline.parse_and_bind("tab: complete")
     print("A320 cockpit CLI. Type 'help' for commands.")
     while True:
         try:
@@ -124,6 +187,8 @@ def main() -> None:
             break
         if not line:
             continue
+        # Waiting at the prompt is not an overrun
+        cp.sim.realtime.restart()
         if line == "help":
             print(HELP_TEXT)
             continue
@@ -440,6 +505,33 @@ def main() -> None:
         if cmd == "engines" and args and args[0] == "start":
             cp.engine.start()
             continue
+        if cmd == "profile":
+            sub = args[0] if args else "show"
+            if sub == "on":
+                cp.set_profiling(True)
+            elif sub == "off":
+                cp.set_profiling(False)
+            elif sub == "reset":
+                cp.sim.profiler.reset()
+            elif sub == "show":
+                print_profile(cp.sim.profiler.report())
+            else:
+                print("Usage: profile on|off|reset|show")
+            continue
+        if cmd == "navdb":
+            if args == ["reload"]:
+                cp.sim.reload_nav_db()
+                print("Loading navigation database in the background")
+            else:
+                pending = " (update loading)" if cp.sim.nav_db_reloading else ""
+                print(f"Navigation database {cp.sim.nav_db_version}{pending}")
+                if cp.sim.nav_db_error:
+                    print(f"Last reload failed: {cp.sim.nav_db_error}")
+            continue
+        if cmd == "timing":
+            print_timing(cp.sim.realtime.stats())
+            print_startup(cp.sim.startup.report())
+            continue
         print("Unknown command. Type 'help' for a list of commands.")
 
 
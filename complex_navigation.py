@@ -1,4 +1,3 @@
-
 # -*- coding: utf-8 -*-
 """Advanced waypoint navigation model with cross-track guidance."""
 
@@ -6,9 +5,130 @@ from __future__ import annotations
 
 import math
 
+from fdm_interface import bind_property
+from geodesy import EARTH_RADIUS_NM, bearing_distance, unit_vector
+
+
+class _LegTable:
+    """Precomputed geometry of a route, kept in step with its waypoint list.
+
+    ``points`` holds the unit vector of every waypoint, ``legs`` one entry
+    ``(course, length, n, t)`` per leg with the normal ``n`` of the leg's
+    great circle and the direction of travel ``t`` at its start, both as
+    unit vectors. ``cumulative[k]`` is the route distance from the first
+    waypoint to waypoint *k*, so the distance left after any waypoint is a
+    single subtraction. The table is deliberately not plain data, so it is
+    left out of saved states and rebuilt from the restored route.
+    """
+
+    __slots__ = ("source", "points", "legs", "cumulative")
+
+    def __init__(self, waypoints: list[tuple]) -> None:
+        self.source = waypoints
+        self.points = [unit_vector(wp[0], wp[1]) for wp in waypoints]
+        self.legs = [
+            self._leg(waypoints[i], waypoints[i + 1], self.points[i], self.points[i + 1])
+            for i in range(len(waypoints) - 1)
+        ]
+        self.cumulative = [0.0] * len(waypoints)
+        self._accumulate(1)
+
+    @staticmethod
+    def _leg(wp1: tuple, wp2: tuple, p1: tuple, p2: tuple) -> tuple:
+        course, length = bearing_distance(wp1[0], wp1[1], wp2[0], wp2[1])
+        x1, y1, z1 = p1
+        x2, y2, z2 = p2
+        nx = y1 * z2 - z1 * y2
+        ny = z1 * x2 - x1 * z2
+        nz = x1 * y2 - y1 * x2
+        norm = math.sqrt(nx * nx + ny * ny + nz * nz)
+        if norm < 1e-12:
+            # Coincident or antipodal waypoints do not define a course
+            return course, length, (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)
+        nx /= norm
+        ny /= norm
+        nz /= norm
+        t = (ny * z1 - nz * y1, nz * x1 - nx * z1, nx * y1 - ny * x1)
+        return course, length, (nx, ny, nz), t
+
+    def _accumulate(self, start: int) -> None:
+        cumulative = self.cumulative
+        legs = self.legs
+        if start <= 0 and cumulative:
+            cumulative[0] = 0.0
+        for k in range(max(start, 1), len(cumulative)):
+            cumulative[k] = cumulative[k - 1] + legs[k - 1][1]
+
+    def _relink(self, index: int) -> None:
+        """Recompute the legs touching waypoint *index*."""
+        wps = self.source
+        points = self.points
+        for i in (index - 1, index):
+            if 0 <= i < len(self.legs):
+                self.legs[i] = self._leg(wps[i], wps[i + 1], points[i], points[i + 1])
+
+    def append(self, wp: tuple) -> None:
+        """Account for *wp* appended to the route."""
+        self.points.append(unit_vector(wp[0], wp[1]))
+        self.cumulative.append(0.0)
+        n = len(self.points)
+        if n > 1:
+            wps = self.source
+            self.legs.append(
+                self._leg(wps[n - 2], wps[n - 1], self.points[n - 2], self.points[n - 1])
+            )
+            self._accumulate(n - 1)
+
+    def remove(self, index: int) -> None:
+        """Account for the waypoint at *index* deleted from the route."""
+        del self.points[index]
+        del self.cumulative[index]
+        if self.legs:
+            del self.legs[min(index, len(self.legs) - 1)]
+        self._relink(index)
+        self._accumulate(index)
+
+    def replace(self, index: int, old: tuple) -> None:
+        """Account for the waypoint at *index* replacing *old*."""
+        wp = self.source[index]
+        if wp[0] == old[0] and wp[1] == old[1]:
+            # Altitude or identifier changes leave the geometry untouched
+            return
+        self.points[index] = unit_vector(wp[0], wp[1])
+        self._relink(index)
+        self._accumulate(index)
+
+    def cross_track(self, index: int, p: tuple) -> tuple[float, float]:
+        """Return cross-track (right positive) and along-track NM on leg *index*."""
+        _, _, (nx, ny, nz), (tx, ty, tz) = self.legs[index]
+        x1, y1, z1 = self.points[index]
+        px, py, pz = p
+        sin_xt = max(-1.0, min(1.0, px * nx + py * ny + pz * nz))
+        along = abs(math.atan2(px * tx + py * ty + pz * tz, px * x1 + py * y1 + pz * z1))
+        return -math.asin(sin_xt) * EARTH_RADIUS_NM, along * EARTH_RADIUS_NM
+
+    def distance_to(self, index: int, p: tuple) -> float:
+        """Return the great-circle distance in NM from *p* to waypoint *index*."""
+        qx, qy, qz = self.points[index]
+        px, py, pz = p
+        cx = py * qz - pz * qy
+        cy = pz * qx - px * qz
+        cz = px * qy - py * qx
+        return EARTH_RADIUS_NM * math.atan2(
+            math.sqrt(cx * cx + cy * cy + cz * cz), px * qx + py * qy + pz * qz
+        )
+
 
 class ComplexNavigationSystem:
-    """Manage a route of waypoints with lateral and vertical guidance."""
+    """Manage a route of waypoints with lateral and vertical guidance.
+
+    Leg courses, lengths, cumulative distances and great-circle vectors are
+    kept in a table, so the per-frame cost does not depend on the route
+    length. Edit the route through :meth:`add_waypoint`,
+    :meth:`remove_waypoint` and :meth:`set_waypoint` to update the table
+    incrementally; assigning a new ``waypoints`` list or changing its
+    length directly rebuilds it on the next use.
+    """
 
     def __init__(
         self,
@@ -20,6 +140,18 @@ class ComplexNavigationSystem:
         self.waypoints = waypoints or []
         self.index = 0
         self.xtrack_gain = xtrack_gain
+        self.lat_prop = bind_property(fdm, "position/lat-gc-deg")
+        self.lon_prop = bind_property(fdm, "position/long-gc-deg")
+        self._legs = _LegTable(self.waypoints)
+
+    def _leg_table(self) -> _LegTable:
+        table = self._legs
+        if table.source is not self.waypoints or len(table.points) != len(self.waypoints):
+            table = self._legs = _LegTable(self.waypoints)
+        return table
+
+    def _position(self) -> tuple[float, float, float]:
+        return unit_vector(self.lat_prop.get(), self.lon_prop.get())
 
     def add_waypoint(
         self,
@@ -29,80 +161,57 @@ class ComplexNavigationSystem:
         ident: str | None = None,
     ) -> None:
         """Append a waypoint with optional altitude and identifier."""
-        self.waypoints.append((lat_deg, lon_deg, alt_ft, ident))
+        table = self._leg_table()
+        wp = (lat_deg, lon_deg, alt_ft, ident)
+        self.waypoints.append(wp)
+        table.append(wp)
+
+    def remove_waypoint(self, index: int) -> None:
+        """Delete the waypoint at *index* from the route."""
+        table = self._leg_table()
+        del self.waypoints[index]
+        table.remove(index)
+
+    def set_waypoint(self, index: int, wp: tuple) -> None:
+        """Replace the waypoint at *index*, e.g. to change its altitude."""
+        table = self._leg_table()
+        old = self.waypoints[index]
+        self.waypoints[index] = wp
+        table.replace(index, old)
 
     def distance_to_waypoint(self) -> float | None:
         """Return distance in NM from the current position to the active waypoint."""
         if not self.waypoints or self.index >= len(self.waypoints):
             return None
-        lat = self.fdm.get_property_value("position/lat-gc-deg")
-        lon = self.fdm.get_property_value("position/long-gc-deg")
-        wp = self.waypoints[self.index]
-        _, dist = self._bearing_distance(lat, lon, wp[0], wp[1])
-        return dist
+        return self._leg_table().distance_to(self.index, self._position())
 
     def remaining_distance(self) -> float | None:
         """Return approximate remaining route distance in NM."""
         if not self.waypoints or self.index >= len(self.waypoints):
             return None
-        lat = self.fdm.get_property_value("position/lat-gc-deg")
-        lon = self.fdm.get_property_value("position/long-gc-deg")
-        dist = self._bearing_distance(lat, lon, self.waypoints[self.index][0], self.waypoints[self.index][1])[1]
-        for i in range(self.index, len(self.waypoints) - 1):
-            dist += self._bearing_distance(
-                self.waypoints[i][0],
-                self.waypoints[i][1],
-                self.waypoints[i + 1][0],
-                self.waypoints[i + 1][1],
-            )[1]
-        return dist
-
-    def _bearing_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> tuple[float, float]:
-        lat1 = math.radians(lat1)
-        lon1 = math.radians(lon1)
-        lat2 = math.radians(lat2)
-        lon2 = math.radians(lon2)
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        dist_nm = 3440.065 * c
-        y = math.sin(dlon) * math.cos(lat2)
-        x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlon)
-        bearing = (math.degrees(math.atan2(y, x)) + 360) % 360
-        return bearing, dist_nm
-
-    def _cross_track(self, lat: float, lon: float, lat1: float, lon1: float, lat2: float, lon2: float) -> tuple[float, float]:
-        course, dist12 = self._bearing_distance(lat1, lon1, lat2, lon2)
-        bearing13, dist13 = self._bearing_distance(lat1, lon1, lat, lon)
-        course_rad = math.radians(course)
-        bearing_rad = math.radians(bearing13)
-        dist13_rad = dist13 / 3440.065
-        xt_rad = math.asin(math.sin(dist13_rad) * math.sin(bearing_rad - course_rad))
-        at_rad = math.acos(min(max(math.cos(dist13_rad) / math.cos(xt_rad), -1.0), 1.0))
-        return xt_rad * 3440.065, at_rad * 3440.065
+        table = self._leg_table()
+        cumulative = table.cumulative
+        dist = table.distance_to(self.index, self._position())
+        return dist + cumulative[-1] - cumulative[self.index]
 
     def update(self) -> tuple[float | None, float | None, float | None]:
         if len(self.waypoints) < 2 or self.index >= len(self.waypoints) - 1:
             return None, None, None
 
-        lat = self.fdm.get_property_value("position/lat-gc-deg")
-        lon = self.fdm.get_property_value("position/long-gc-deg")
+        table = self._leg_table()
+        p = self._position()
 
-        wp1 = self.waypoints[self.index]
-        wp2 = self.waypoints[self.index + 1]
-
-        course, leg_dist = self._bearing_distance(wp1[0], wp1[1], wp2[0], wp2[1])
-        xtrack, along = self._cross_track(lat, lon, wp1[0], wp1[1], wp2[0], wp2[1])
+        course, leg_dist, _, _ = table.legs[self.index]
+        xtrack, along = table.cross_track(self.index, p)
 
         # Advance to next leg when past current one
         if along >= leg_dist and self.index < len(self.waypoints) - 2:
             self.index += 1
-            wp1 = self.waypoints[self.index]
-            wp2 = self.waypoints[self.index + 1]
-            course, leg_dist = self._bearing_distance(wp1[0], wp1[1], wp2[0], wp2[1])
-            xtrack, along = self._cross_track(lat, lon, wp1[0], wp1[1], wp2[0], wp2[1])
+            course, leg_dist, _, _ = table.legs[self.index]
+            xtrack, along = table.cross_track(self.index, p)
 
+        wp1 = self.waypoints[self.index]
+        wp2 = self.waypoints[self.index + 1]
         heading = (course - self.xtrack_gain * xtrack) % 360
         distance = max(leg_dist - along, 0.0)
 
@@ -0,0 +1,295 @@
+"""Run Monte Carlo ensembles of the A320 simulation in worker processes."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterable, Iterator
+
+# Warning outputs of A320IFRSim.step() tracked in the run summary.
+WARNING_FIELDS = (
+    "stall_warning",
+    "gpws_warning",
+    "overspeed_warning",
+    "engine_fire",
+    "tcas_alert",
+    "master_caution",
+)
+
+
+@dataclass
+class EnsembleCase:
+    """Parameters of a single ensemble member."""
+
+    run_id: int
+    seed: int
+    steps: int = 3000
+    weight_lbs: float = 130000.0
+    wind_north_fps: float = 0.0
+    wind_east_fps: float = 0.0
+    gust_strength: float = 5.0
+    failure_scale: float = 1.0
+    trace_every: int = 0
+    trace_fields: tuple = ("time_s", "altitude_ft", "speed_kt", "heading_deg")
+    root_dir: str = "jsbsim-master"
+    sim_options: dict = field(default_factory=dict)
+
+
+def run_case(case: EnsembleCase) -> dict:
+    """Fly one ensemble member without real-time pacing and summarise it."""
+    from ifrsim import A320IFRSim
+
+    sim = A320IFRSim(
+        root_dir=case.root_dir,
+        seed=case.seed,
+        weight_lbs=case.weight_lbs,
+        **case.sim_options,
+    )
+    sim.environment.wind_north_fps = case.wind_north_fps
+    sim.environment.wind_east_fps = case.wind_east_fps
+    sim.environment.gust_strength = case.gust_strength
+    if case.failure_scale != 1.0:
+        sim.failures.scale_rates(case.failure_scale)
+
+    max_alt_dev = 0.0
+    start_fuel = None
+    fuel = 0.0
+    engine_start_s = None
+    warnings: set[str] = set()
+    trace = []
+    sim.subscribe(
+        ("fuel_lbs", "altitude_ft", "time_s")
+        + WARNING_FIELDS
+        + (tuple(case.trace_fields) if case.trace_every else ())
+    )
+    for i in range(case.steps):
+        data = sim.step(real_time=False)
+        if start_fuel is None:
+            start_fuel = data["fuel_lbs"]
+        fuel = data["fuel_lbs"]
+        dev = abs(data["altitude_ft"] - sim.autopilot.altitude)
+        if dev > max_alt_dev:
+            max_alt_dev = dev
+        if engine_start_s is None and sim.starter.state == "running":
+            engine_start_s = data["time_s"]
+        for name in WARNING_FIELDS:
+            if data[name] and name not in warnings:
+                warnings.add(name)
+        if case.trace_every and i % case.trace_every == 0:
+            trace.append([data[name] for name in case.trace_fields])
+
+    result = {
+        "run_id": case.run_id,
+        "seed": case.seed,
+        "status": "ok",
+        "sim_time_s": sim.time_s,
+        "max_alt_dev_ft": max_alt_dev,
+        "fuel_used_lbs": (start_fuel or 0.0) - fuel,
+        "warnings": sorted(warnings),
+        "failures": [name for _, name in sim.failures.fired],
+        "engine_start_s": engine_start_s,
+    }
+    if case.trace_every:
+        result["trace_fields"] = list(case.trace_fields)
+        result["trace"] = trace
+    return result
+
+
+def make_cases(
+    runs: int,
+    seed: int = 0,
+    steps: int = 3000,
+    root_dir: str = "jsbsim-master",
+    trace_every: int = 0,
+) -> list[EnsembleCase]:
+    """Return *runs* cases with randomised weight, wind and failure rates."""
+    rng = random.Random(seed)
+    return [
+        EnsembleCase(
+            run_id=i,
+            seed=rng.getrandbits(32),
+            steps=steps,
+            weight_lbs=rng.uniform(110000.0, 160000.0),
+            wind_north_fps=rng.uniform(-30.0, 30.0),
+            wind_east_fps=rng.uniform(-30.0, 30.0),
+            gust_strength=rng.uniform(0.0, 10.0),
+            failure_scale=rng.choice((1.0, 10.0, 100.0)),
+            trace_every=trace_every,
+            root_dir=root_dir,
+        )
+        for i in range(runs)
+    ]
+
+
+# Queue on which pool workers report the run_id of each case they start.
+_STARTED = None
+
+
+def _init_worker(started) -> None:
+    global _STARTED
+    _STARTED = started
+
+
+def _run_reported(case: EnsembleCase) -> dict:
+    # SimpleQueue.put() writes synchronously, so the report survives a
+    # crash of the case right after it
+    _STARTED.put(case.run_id)
+    return run_case(case)
+
+
+class EnsembleRunner:
+    """Distribute ensemble cases over a pool of worker processes.
+
+    Results are yielded as soon as each run finishes. A case raising an
+    exception is reported with ``status="error"``. When a worker process
+    dies the pool fails every unfinished case, so none of them is charged.
+    Workers report each case they start: the cases that never started go
+    back to a full-size pool, while the few that were running rerun one at
+    a time in a single-worker pool, where a crash can only come from the
+    case itself. Such a case is retried up to *max_retries* times before
+    it is reported as ``"crashed"``.
+    """
+
+    def __init__(self, workers: int | None = None, max_retries: int = 1) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.max_retries = max_retries
+
+    def run(self, cases: Iterable[EnsembleCase]) -> Iterator[dict]:
+        queued = list(cases)
+        attempts = {case.run_id: 0 for case in queued}
+        # Cases running when a worker died, rerun in isolation
+        suspects: list[EnsembleCase] = []
+        ctx = multiprocessing.get_context()
+        while queued or suspects:
+            if suspects:
+                batch, suspects = suspects[:1], suspects[1:]
+            else:
+                batch, queued = queued, []
+            alone = len(batch) == 1
+            started_queue = ctx.SimpleQueue()
+            started: set[int] = set()
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(batch)),
+                mp_context=ctx,
+                initializer=_init_worker,
+                initargs=(started_queue,),
+            ) as pool:
+                futures = {pool.submit(_run_reported, case): case for case in batch}
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    while not started_queue.empty():
+                        started.add(started_queue.get())
+                    for fut in done:
+                        case = futures[fut]
+                        try:
+                            yield fut.result()
+                        except BrokenProcessPool:
+                            if not alone:
+                                if case.run_id in started:
+                                    suspects.append(case)
+                                else:
+                                    queued.append(case)
+                                continue
+                            attempts[case.run_id] += 1
+                            if attempts[case.run_id] > self.max_retries:
+                                yield self._failed(case, "crashed", "worker died")
+                            else:
+                                suspects.append(case)
+                        except Exception as exc:
+                            yield self._failed(case, "error", repr(exc))
+            started_queue.close()
+
+    @staticmethod
+    def _failed(case: EnsembleCase, status: str, error: str) -> dict:
+        return {
+            "run_id": case.run_id,
+            "seed": case.seed,
+            "status": status,
+            "error": error,
+        }
+
+
+# Warmed-up simulation and branch function inherited by forked workers.
+_BRANCH_SOURCE = None
+
+
+def _run_forked_branch(task: tuple[int, object]) -> tuple[int, object]:
+    index, seed = task
+    sim, fn = _BRANCH_SOURCE
+    sim.reseed(seed)
+    return index, fn(sim, index)
+
+
+def branch_seeds(count: int, seed=0) -> list[int]:
+    """Return *count* independent branch seeds derived from *seed*."""
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(count)]
+
+
+def run_branches(
+    sim,
+    fn: Callable,
+    seeds: Iterable,
+    workers: int | None = None,
+    processes: bool = True,
+) -> Iterator[tuple[int, object]]:
+    """Continue *sim* once per seed and yield ``(index, fn(branch, index))``.
+
+    Where ``fork`` is available every branch runs in a fresh child process
+    that inherits the warmed-up simulation copy-on-write, so neither the
+    JSBSim model nor the nav database is loaded again and each branch starts
+    from exactly the parent's state. Otherwise, or with ``processes=False``,
+    the branches are in-process :meth:`A320IFRSim.clone` copies run one after
+    another. *fn* receives the branch already reseeded with its seed; its
+    return value must be picklable. Do not step *sim* while iterating.
+    """
+    global _BRANCH_SOURCE
+    seeds = list(seeds)
+    if not processes or "fork" not in multiprocessing.get_all_start_methods():
+        for i, seed in enumerate(seeds):
+            yield i, fn(sim.clone(seed), i)
+        return
+    _BRANCH_SOURCE = (sim, fn)
+    ctx = multiprocessing.get_context("fork")
+    try:
+        # A new child per branch so every one forks from the parent state
+        with ctx.Pool(workers or os.cpu_count() or 1, maxtasksperchild=1) as pool:
+            yield from pool.imap_unordered(
+                _run_forked_branch, enumerate(seeds), chunksize=1
+            )
+    finally:
+        _BRANCH_SOURCE = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=8)
+    parser.add_argument("--steps", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--trace-every", type=int, default=0)
+    parser.add_argument("--root-dir", default="jsbsim-master")
+    parser.add_argument(
+        "--show-cases", action="store_true", help="print case parameters first"
+    )
+    args = parser.parse_args()
+    cases = make_cases(
+        args.runs, args.seed, args.steps, args.root_dir, args.trace_every
+    )
+    if args.show_cases:
+        for case in cases:
+            print(json.dumps(asdict(case)))
+    runner = EnsembleRunner(args.workers)
+    for result in runner.run(cases):
+        print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
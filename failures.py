@@ -0,0 +1,140 @@
+"""Event-driven scheduling of random system failures."""
+
+from __future__ import annotations
+
+import heapq
+import random
+from typing import Callable
+
+
+class FailureScheduler:
+    """Fire random failures at exponentially distributed simulation times.
+
+    Every failure mode has a constant rate in events per second (the
+    ``failure_chance`` of the subsystems). Instead of drawing a random
+    number each frame, the time of the next event is sampled from the
+    exponential distribution and kept in a heap; :meth:`advance` only
+    touches the heap when the simulation clock reaches the earliest event.
+    An optional *condition* callable models failures that can only happen
+    in a given state (e.g. a generator that is running): events arriving
+    while the condition is false are discarded and the next one is drawn.
+    """
+
+    def __init__(self, seed=None, rng: random.Random | None = None) -> None:
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.time = 0.0
+        # name -> [rate, callback, condition, generation]
+        self._modes: dict[str, list] = {}
+        self._heap: list[tuple[float, int, str, int]] = []
+        self._seq = 0
+        self.fired: list[tuple[float, str]] = []
+
+    def register(
+        self,
+        name: str,
+        rate_per_s: float,
+        callback: Callable[[], None],
+        condition: Callable[[], bool] | None = None,
+    ) -> None:
+        """Add a failure mode and schedule its first event."""
+        self._modes[name] = [rate_per_s, callback, condition, 0]
+        self._schedule(name)
+
+    def set_rate(self, name: str, rate_per_s: float) -> None:
+        """Change the rate of a failure mode and redraw its next event."""
+        mode = self._modes[name]
+        mode[0] = rate_per_s
+        mode[3] += 1
+        self._schedule(name)
+
+    def rate(self, name: str) -> float:
+        """Return the current rate of a failure mode in events per second."""
+        return self._modes[name][0]
+
+    def scale_rates(self, factor: float) -> None:
+        """Multiply the rate of every failure mode by *factor*."""
+        for name, mode in self._modes.items():
+            self.set_rate(name, mode[0] * factor)
+
+    def reseed(self, seed) -> None:
+        """Restart the random stream and redraw all pending events."""
+        self.rng.seed(seed)
+        self._heap.clear()
+        for name, mode in self._modes.items():
+            mode[3] += 1
+            self._schedule(name)
+
+    def get_state(self) -> dict:
+        """Return the clock, random stream and pending events as plain data."""
+        return {
+            "time": self.time,
+            "rng": self.rng.getstate(),
+            "seq": self._seq,
+            "heap": list(self._heap),
+            "fired": list(self.fired),
+            "modes": {name: (mode[0], mode[3]) for name, mode in self._modes.items()},
+        }
+
+    def set_state(self, state: dict) -> None:
+        """Restore a state from :meth:`get_state`.
+
+        Callbacks and conditions stay as registered. Saved modes unknown to
+        this scheduler are ignored and modes missing from the state get a
+        freshly drawn event.
+        """
+        self.time = state["time"]
+        self.rng.setstate(state["rng"])
+        self._seq = state["seq"]
+        for name, (rate, generation) in state["modes"].items():
+            mode = self._modes.get(name)
+            if mode is not None:
+                mode[0] = rate
+                mode[3] = generation
+        self._heap = [event for event in state["heap"] if event[2] in self._modes]
+        heapq.heapify(self._heap)
+        self.fired = list(state["fired"])
+        for name in self._modes.keys() - state["modes"].keys():
+            self._schedule(name)
+
+    def _schedule(self, name: str) -> None:
+        rate, _, _, generation = self._modes[name]
+        if rate <= 0.0:
+            return
+        when = self.time + self.rng.expovariate(rate)
+        self._seq += 1
+        heapq.heappush(self._heap, (when, self._seq, name, generation))
+
+    def advance(self, dt: float) -> None:
+        """Advance the clock by *dt* and fire every failure that is due."""
+        self.time += dt
+        heap = self._heap
+        while heap and heap[0][0] <= self.time:
+            when, _, name, generation = heapq.heappop(heap)
+            mode = self._modes[name]
+            if generation != mode[3]:
+                continue
+            condition = mode[2]
+            if condition is None or condition():
+                mode[1]()
+                self.fired.append((when, name))
+            self._schedule(name)
+
+    def pending(self) -> dict[str, float]:
+        """Return the next scheduled event time for each active mode."""
+        result = {}
+        for when, _, name, generation in self._heap:
+            if generation == self._modes[name][3] and name not in result:
+                result[name] = when
+        return result
+
+
+def register_failure(
+    failures: FailureScheduler | None,
+    name: str,
+    rate_per_s: float,
+    callback: Callable[[], None],
+    condition: Callable[[], bool] | None = None,
+) -> None:
+    """Register a failure mode when a scheduler is configured."""
+    if failures is not None:
+        failures.register(name, rate_per_s, callback, condition)
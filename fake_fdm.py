@@ -0,0 +1,271 @@
+"""Pure-Python stand-in for the JSBSim FDM used by the simulation."""
+
+from __future__ import annotations
+
+import math
+
+FT_PER_DEG_LAT = 364567.2
+KT_TO_FPS = 1.68781
+G_FPS2 = 32.174
+
+# Properties that exist before the first run_ic(), matching the A320 model.
+DEFAULT_PROPERTIES = {
+    "propulsion/tank/contents-lbs": 15000.0,
+    "propulsion/tank[1]/contents-lbs": 15000.0,
+    "ic/weight-lbs": 130000.0,
+}
+
+
+class _Node:
+    """Property node offering the ``FGPropertyNode`` accessors."""
+
+    __slots__ = ("_props", "_path")
+
+    def __init__(self, props: dict, path: str) -> None:
+        self._props = props
+        self._path = path
+
+    def get_double_value(self) -> float:
+        return self._props.get(self._path, 0.0)
+
+    def set_double_value(self, value: float) -> None:
+        self._props[self._path] = value
+
+
+class _PropertyManager:
+    __slots__ = ("_props",)
+
+    def __init__(self, props: dict) -> None:
+        self._props = props
+
+    def get_node(self, path: str, create: bool = False) -> _Node:
+        return _Node(self._props, path)
+
+
+class FakeFDM:
+    """Kinematic point-mass aircraft exposing the ``FGFDMExec`` surface.
+
+    Implements the calls made by the simulation (``get_property_value``,
+    item access, ``get_delta_t``, ``run_ic``, ``run``, the property manager
+    and the model loading no-ops) on a plain dictionary of properties. The
+    aircraft flies a flat earth with first-order attitude and engine lags,
+    so controls, autopilot, cockpit and navigation code see plausible values
+    without JSBSim or its model data. It is meant for benchmarks and
+    testing of the Python layer, not for flight dynamics.
+    """
+
+    def __init__(
+        self,
+        dt: float = 0.02,
+        engines: int = 2,
+        max_thrust_lbf: float = 27000.0,
+        wing_area_ft2: float = 1320.0,
+    ) -> None:
+        self.dt = dt
+        self.engines = engines
+        self.max_thrust_lbf = max_thrust_lbf
+        self.wing_area_ft2 = wing_area_ft2
+        self.sim_time = 0.0
+        self.props: dict[str, float] = dict(DEFAULT_PROPERTIES)
+        self._manager = _PropertyManager(self.props)
+
+    # Model loading is a no-op; the interface matches FGFDMExec
+    def disable_output(self) -> None:
+        pass
+
+    def set_root_dir(self, path) -> None:
+        pass
+
+    def load_model(self, model: str, add_model_to_path: bool = True) -> bool:
+        return True
+
+    def set_dt(self, dt: float) -> None:
+        self.dt = dt
+
+    def get_delta_t(self) -> float:
+        return self.dt
+
+    def get_sim_time(self) -> float:
+        return self.sim_time
+
+    def set_sim_time(self, time_s: float) -> None:
+        self.sim_time = time_s
+
+    def get_property_manager(self) -> _PropertyManager:
+        return self._manager
+
+    def get_property_value(self, path: str) -> float:
+        return self.props.get(path, 0.0)
+
+    def set_property_value(self, path: str, value: float) -> None:
+        self.props[path] = value
+
+    def __getitem__(self, path: str) -> float:
+        return self.props.get(path, 0.0)
+
+    def __setitem__(self, path: str, value: float) -> None:
+        self.props[path] = value
+
+    @staticmethod
+    def _engine(index: int, name: str) -> str:
+        if index == 0:
+            return f"propulsion/engine/{name}"
+        return f"propulsion/engine[{index}]/{name}"
+
+    @staticmethod
+    def _tank(index: int) -> str:
+        if index == 0:
+            return "propulsion/tank/contents-lbs"
+        return f"propulsion/tank[{index}]/contents-lbs"
+
+    @staticmethod
+    def _throttle(index: int) -> str:
+        if index == 0:
+            return "fcs/throttle-cmd-norm"
+        return f"fcs/throttle-cmd-norm[{index}]"
+
+    def run_ic(self) -> bool:
+        """Initialise position, attitude and speed from the ``ic/`` properties."""
+        p = self.props
+        vt = math.sqrt(
+            p.get("ic/u-fps", 0.0) ** 2
+            + p.get("ic/v-fps", 0.0) ** 2
+            + p.get("ic/w-fps", 0.0) ** 2
+        )
+        if not vt:
+            vt = p.get("ic/vt-fps") or p.get("ic/vc-kts", 0.0) * KT_TO_FPS
+        alt = p.get("ic/h-sl-ft", p.get("ic/altitude-ft", 0.0))
+        p["position/lat-gc-deg"] = p.get("ic/lat-gc-deg", 0.0)
+        p["position/long-gc-deg"] = p.get("ic/long-gc-deg", 0.0)
+        p["position/h-sl-ft"] = alt
+        p["attitude/psi-deg"] = p.get("ic/psi-true-deg", 0.0) % 360.0
+        p["attitude/theta-deg"] = p.get("ic/theta-deg", 0.0)
+        p["attitude/phi-deg"] = p.get("ic/phi-deg", 0.0)
+        p["velocities/vt-fps"] = vt
+        p["velocities/h-dot-fps"] = 0.0
+        for engine in range(self.engines):
+            p[self._engine(engine, "fuel-used-lbs")] = 0.0
+        self.sim_time = 0.0
+        self._outputs(0.0, 0.0, 0.0)
+        return True
+
+    def run(self) -> bool:
+        """Advance the point-mass model by one time step."""
+        p = self.props
+        dt = self.dt
+        self.sim_time += dt
+
+        # Surfaces and gear follow their commands at a fixed rate
+        for cmd, pos, rate in (
+            ("fcs/flap-cmd-norm", "fcs/flap-pos-norm", 0.1),
+            ("fcs/speedbrake-cmd-norm", "fcs/speedbrake-pos-norm", 0.5),
+            ("gear/gear-cmd-norm", "gear/gear-pos-norm", 0.2),
+        ):
+            target = p.get(cmd, 0.0)
+            current = p.get(pos, 0.0)
+            step = rate * dt
+            p[pos] = current + max(min(target - current, step), -step)
+
+        # Engines spool towards a throttle dependent N1 and burn fuel
+        thrust = 0.0
+        for engine in range(self.engines):
+            n1_path = self._engine(engine, "n1")
+            n1 = p.get(n1_path, 0.0)
+            throttle = p.get(self._throttle(engine), 0.0)
+            if p.get(self._engine(engine, "set-running"), 0.0) > 0.5:
+                target = 20.0 + 80.0 * throttle
+                flow_pph = 800.0 + 6000.0 * throttle
+            else:
+                target = 0.0
+                flow_pph = 0.0
+            n1 += (target - n1) * min(1.0, dt / 2.0)
+            p[n1_path] = n1
+            p[self._engine(engine, "n2")] = n1
+            burn = flow_pph * dt / 3600.0
+            tank = self._tank(engine)
+            fuel = p.get(tank, 0.0)
+            burn = min(burn, fuel)
+            p[tank] = fuel - burn
+            used = self._engine(engine, "fuel-used-lbs")
+            p[used] = p.get(used, 0.0) + burn
+            thrust += self.max_thrust_lbf * (n1 / 100.0) ** 2
+
+        # Attitude lags behind the control commands; a neutral elevator
+        # holds the angle of attack needed for level flight
+        alt = p["position/h-sl-ft"]
+        vt = max(p["velocities/vt-fps"], 1.0)
+        alpha = min(4.0 * (422.0 / vt) ** 2, 20.0)
+        lag = min(1.0, dt / 1.0)
+        theta = p["attitude/theta-deg"]
+        theta += (alpha - 20.0 * p.get("fcs/elevator-cmd-norm", 0.0) - theta) * lag
+        phi = p["attitude/phi-deg"]
+        phi += (30.0 * p.get("fcs/aileron-cmd-norm", 0.0) - phi) * lag
+        p["attitude/theta-deg"] = theta
+        p["attitude/phi-deg"] = phi
+        gamma = math.radians(theta - alpha)
+        weight = p.get("ic/weight-lbs", 130000.0) - sum(
+            p.get(self._engine(i, "fuel-used-lbs"), 0.0) for i in range(self.engines)
+        )
+        mass = weight / G_FPS2
+        rho = 0.002377 * math.exp(-alt / 30000.0)
+        cd = (
+            0.025
+            + 0.05 * p.get("fcs/flap-pos-norm", 0.0)
+            + 0.02 * p.get("gear/gear-pos-norm", 0.0)
+            + 0.03 * p.get("fcs/speedbrake-pos-norm", 0.0)
+        )
+        drag = 0.5 * rho * vt * vt * self.wing_area_ft2 * cd
+        vt += ((thrust - drag) / mass - G_FPS2 * math.sin(gamma)) * dt
+        vt = max(vt, 0.0)
+
+        # Coordinated turn and flat-earth position update including wind
+        psi = p["attitude/psi-deg"]
+        yaw_rate = G_FPS2 * math.tan(math.radians(phi)) / vt if vt > 1.0 else 0.0
+        p["velocities/r-rad_sec"] = yaw_rate
+        psi = (psi + math.degrees(yaw_rate) * dt) % 360.0
+        ground = vt * math.cos(gamma)
+        north = ground * math.cos(math.radians(psi)) + p.get(
+            "atmosphere/wind-north-fps", 0.0
+        )
+        east = ground * math.sin(math.radians(psi)) + p.get(
+            "atmosphere/wind-east-fps", 0.0
+        )
+        lat = p["position/lat-gc-deg"]
+        p["position/lat-gc-deg"] = lat + north * dt / FT_PER_DEG_LAT
+        coslat = max(math.cos(math.radians(lat)), 1e-6)
+        p["position/long-gc-deg"] += east * dt / (FT_PER_DEG_LAT * coslat)
+        h_dot = vt * math.sin(gamma) - p.get("atmosphere/wind-down-fps", 0.0)
+        alt += h_dot * dt
+        if alt <= 0.0:
+            alt = 0.0
+            h_dot = max(h_dot, 0.0)
+        p["position/h-sl-ft"] = alt
+        p["attitude/psi-deg"] = psi
+        p["velocities/vt-fps"] = vt
+        p["velocities/h-dot-fps"] = h_dot
+        self._outputs(alpha, p.get("fcs/rudder-cmd-norm", 0.0), dt)
+        return True
+
+    def _outputs(self, alpha_deg: float, rudder: float, dt: float) -> None:
+        """Derive the secondary properties from the integrated state."""
+        p = self.props
+        vt = p["velocities/vt-fps"]
+        alpha = math.radians(alpha_deg)
+        theta = p["attitude/theta-deg"]
+        phi = p["attitude/phi-deg"]
+        if dt:
+            p["velocities/q-rad_sec"] = math.radians(
+                theta - p.get("attitude/pitch-deg", theta)
+            ) / dt
+            p["velocities/p-rad_sec"] = math.radians(
+                phi - p.get("attitude/roll-deg", phi)
+            ) / dt
+        p["attitude/pitch-deg"] = theta
+        p["attitude/roll-deg"] = phi
+        p["aero/alpha-rad"] = alpha
+        p["aero/beta-rad"] = -0.05 * rudder
+        p["velocities/u-fps"] = vt * math.cos(alpha)
+        p["velocities/w-fps"] = vt * math.sin(alpha)
+        p["velocities/v-fps"] = 0.0
+        p["velocities/vc-kts"] = vt / KT_TO_FPS
+        p["position/h-agl-ft"] = p["position/h-sl-ft"]
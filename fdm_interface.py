@@ -0,0 +1,209 @@
+"""Resolved property access for the JSBSim flight dynamics model."""
+
+from __future__ import annotations
+
+import math
+
+
+class BoundProperty:
+    """Accessor for a single FDM property resolved once at bind time.
+
+    ``get()`` and ``set(value)`` call straight into the underlying property
+    node so no path string has to be hashed or parsed on each access. When
+    the binding belongs to an :class:`FDMInterface` reads are cached for the
+    current frame, so each property crosses into JSBSim at most once
+    between two ``run()`` calls, and writes are buffered until the next
+    flush. With *dedupe* enabled a write is dropped when it does not differ
+    from the last value seen in the FDM by more than the interface epsilon.
+    """
+
+    __slots__ = (
+        "path",
+        "dedupe",
+        "_owner",
+        "_read",
+        "_write",
+        "_value",
+        "_frame",
+        "_written",
+    )
+
+    def __init__(
+        self,
+        fdm,
+        path: str,
+        owner: "FDMInterface | None" = None,
+        dedupe: bool = True,
+    ) -> None:
+        self.path = path
+        self.dedupe = dedupe
+        self._owner = owner
+        self._value = 0.0
+        self._frame = -1
+        self._written = math.nan
+        node = None
+        manager = getattr(fdm, "get_property_manager", None)
+        if manager is not None:
+            node = manager().get_node(path, True)
+        if node is not None:
+            self._read = node.get_double_value
+            self._write = node.set_double_value
+        else:
+            # Backends without a property tree fall back to string lookups
+            self._read = lambda: fdm.get_property_value(path)
+            self._write = lambda value: fdm.set_property_value(path, value)
+
+    def get(self) -> float:
+        owner = self._owner
+        if owner is None:
+            return self._read()
+        if self._frame == owner.frame:
+            owner.cache_hits += 1
+            return self._value
+        owner.cache_misses += 1
+        self._value = value = self._read()
+        self._frame = owner.frame
+        self._written = value
+        return value
+
+    def set(self, value: float) -> None:
+        owner = self._owner
+        if owner is None:
+            self._write(value)
+            return
+        # Later reads in this frame see the commanded value
+        self._value = value
+        self._frame = owner.frame
+        pending = owner._pending
+        if self in pending:
+            owner.writes_suppressed += 1
+        elif self.dedupe and abs(value - self._written) <= owner.write_epsilon:
+            owner.writes_suppressed += 1
+            return
+        pending[self] = value
+
+    def __repr__(self) -> str:
+        return f"BoundProperty({self.path!r})"
+
+
+class FDMInterface:
+    """Wrap an ``FGFDMExec`` and hand out cached property bindings.
+
+    The wrapper behaves like the wrapped FDM: item access and
+    ``get_property_value``/``set_property_value`` go through the binding
+    cache and every other attribute is forwarded unchanged. Property reads
+    are memoised per frame; the frame advances on every ``run()`` and
+    ``run_ic()`` so values are refreshed lazily on first use afterwards.
+    Writes are collected during the frame and flushed once right before
+    the FDM runs.
+    """
+
+    def __init__(self, fdm, write_epsilon: float = 1e-6) -> None:
+        self.exec = fdm
+        self._bindings: dict[str, BoundProperty] = {}
+        self._pending: dict[BoundProperty, float] = {}
+        self.write_epsilon = write_epsilon
+        self.frame = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.writes_flushed = 0
+        self.writes_suppressed = 0
+
+    def bind(self, path: str, dedupe: bool = True) -> BoundProperty:
+        """Return the cached binding for *path*, resolving it on first use.
+
+        Pass ``dedupe=False`` for properties the FDM may change on its own
+        (such as engine running flags) so repeated commands are never dropped.
+        """
+        prop = self._bindings.get(path)
+        if prop is None:
+            prop = BoundProperty(self.exec, path, self, dedupe)
+            self._bindings[path] = prop
+        elif not dedupe:
+            prop.dedupe = False
+        return prop
+
+    def flush(self) -> None:
+        """Write all buffered property commands to the FDM."""
+        pending = self._pending
+        if not pending:
+            return
+        for prop, value in pending.items():
+            prop._write(value)
+            prop._written = value
+        self.writes_flushed += len(pending)
+        pending.clear()
+
+    def invalidate(self) -> None:
+        """Discard all cached reads, e.g. after changing the FDM externally."""
+        self.frame += 1
+
+    def resync(self) -> None:
+        """Forget buffered writes and cached values after a state restore.
+
+        Every binding is written again on its next ``set()`` because the
+        last value seen in the FDM is no longer known.
+        """
+        self._pending.clear()
+        for prop in self._bindings.values():
+            prop._written = math.nan
+        self.frame += 1
+
+    def run(self) -> bool:
+        self.flush()
+        result = self.exec.run()
+        self.frame += 1
+        return result
+
+    def run_ic(self) -> bool:
+        self.flush()
+        result = self.exec.run_ic()
+        self.frame += 1
+        return result
+
+    def cache_stats(self) -> dict:
+        """Return read cache hit and miss counters."""
+        total = self.cache_hits + self.cache_misses
+        return {
+            "frames": self.frame,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / total if total else 0.0,
+        }
+
+    def write_stats(self) -> dict:
+        """Return counters for flushed and suppressed property writes."""
+        return {
+            "flushed": self.writes_flushed,
+            "suppressed": self.writes_suppressed,
+            "pending": len(self._pending),
+        }
+
+    def reset_cache_stats(self) -> None:
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.writes_flushed = 0
+        self.writes_suppressed = 0
+
+    def get_property_value(self, path: str) -> float:
+        return self.bind(path).get()
+
+    def set_property_value(self, path: str, value: float) -> None:
+        self.bind(path).set(value)
+
+    def __getitem__(self, path: str) -> float:
+        return self.bind(path).get()
+
+    def __setitem__(self, path: str, value: float) -> None:
+        self.bind(path).set(value)
+
+    def __getattr__(self, name):
+        return getattr(self.exec, name)
+
+
+def bind_property(fdm, path: str, dedupe: bool = True) -> BoundProperty:
+    """Bind *path* on *fdm*, sharing the cache when *fdm* is an interface."""
+    bind = getattr(fdm, "bind", None)
+    if bind is not None:
+        return bind(path, dedupe)
+    return BoundProperty(fdm, path, dedupe=dedupe)
@@ -0,0 +1,146 @@
+"""Great-circle geometry shared by the navigation, ILS and TCAS models.
+
+All functions work on a spherical earth with positions in degrees and
+distances in nautical miles. The scalar functions use only :mod:`math`;
+the ``*_array`` variants take NumPy arrays (or anything broadcastable to
+them) for any argument and process many points per call, e.g. all TCAS
+targets or a recorded track. NumPy is only imported by the array variants.
+"""
+
+from __future__ import annotations
+
+import math
+
+EARTH_RADIUS_NM = 3440.065
+
+
+class GeoPoint:
+    """A position with the trigonometry needed as a reference point.
+
+    Use it for a point that is measured against many others, e.g. the own
+    aircraft in a TCAS scan, so its sine and cosine are computed once.
+    """
+
+    __slots__ = ("lat", "lon", "lat_rad", "lon_rad", "sin_lat", "cos_lat")
+
+    def __init__(self, lat_deg: float, lon_deg: float) -> None:
+        self.lat = lat_deg
+        self.lon = lon_deg
+        self.lat_rad = math.radians(lat_deg)
+        self.lon_rad = math.radians(lon_deg)
+        self.sin_lat = math.sin(self.lat_rad)
+        self.cos_lat = math.cos(self.lat_rad)
+
+
+def bearing_distance_from(origin: GeoPoint, lat2: float, lon2: float) -> tuple[float, float]:
+    """Return initial bearing in degrees and distance in NM from *origin*."""
+    lat2 = math.radians(lat2)
+    dlon = math.radians(lon2) - origin.lon_rad
+    cos_lat2 = math.cos(lat2)
+    sin_lat2 = math.sin(lat2)
+    a = (
+        math.sin((lat2 - origin.lat_rad) / 2) ** 2
+        + origin.cos_lat * cos_lat2 * math.sin(dlon / 2) ** 2
+    )
+    dist_nm = EARTH_RADIUS_NM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    y = math.sin(dlon) * cos_lat2
+    x = origin.cos_lat * sin_lat2 - origin.sin_lat * cos_lat2 * math.cos(dlon)
+    bearing = (math.degrees(math.atan2(y, x)) + 360) % 360
+    return bearing, dist_nm
+
+
+def bearing_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> tuple[float, float]:
+    """Return initial bearing in degrees and haversine distance in NM."""
+    return bearing_distance_from(GeoPoint(lat1, lon1), lat2, lon2)
+
+
+def distance_nm(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance in NM."""
+    lat1 = math.radians(lat1)
+    lat2 = math.radians(lat2)
+    dlon = math.radians(lon2) - math.radians(lon1)
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    )
+    return EARTH_RADIUS_NM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def bearing_deg(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the initial great-circle bearing in degrees."""
+    return bearing_distance(lat1, lon1, lat2, lon2)[0]
+
+
+def cross_track(
+    lat: float, lon: float, lat1: float, lon1: float, lat2: float, lon2: float
+) -> tuple[float, float]:
+    """Return cross-track and along-track distance in NM of a point.
+
+    The leg runs from (*lat1*, *lon1*) to (*lat2*, *lon2*); the cross-track
+    distance is positive right of the course and the along-track distance
+    is measured from the leg start.
+    """
+    start = GeoPoint(lat1, lon1)
+    course, _ = bearing_distance_from(start, lat2, lon2)
+    bearing13, dist13 = bearing_distance_from(start, lat, lon)
+    dist13_rad = dist13 / EARTH_RADIUS_NM
+    xt_rad = math.asin(
+        math.sin(dist13_rad) * math.sin(math.radians(bearing13 - course))
+    )
+    at_rad = math.acos(
+        min(max(math.cos(dist13_rad) / math.cos(xt_rad), -1.0), 1.0)
+    )
+    return xt_rad * EARTH_RADIUS_NM, at_rad * EARTH_RADIUS_NM
+
+
+def unit_vector(lat_deg: float, lon_deg: float) -> tuple[float, float, float]:
+    """Return the earth-centred unit vector of a position."""
+    lat = math.radians(lat_deg)
+    lon = math.radians(lon_deg)
+    cos_lat = math.cos(lat)
+    return cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat)
+
+
+def bearing_distance_array(lat1, lon1, lat2, lon2):
+    """Vectorized :func:`bearing_distance`; returns arrays of bearings and NM."""
+    import numpy as np
+
+    lat1 = np.radians(lat1)
+    lat2 = np.radians(lat2)
+    dlon = np.radians(lon2) - np.radians(lon1)
+    cos_lat1 = np.cos(lat1)
+    cos_lat2 = np.cos(lat2)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * cos_lat2 * np.sin(dlon / 2) ** 2
+    dist = EARTH_RADIUS_NM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    y = np.sin(dlon) * cos_lat2
+    x = cos_lat1 * np.sin(lat2) - np.sin(lat1) * cos_lat2 * np.cos(dlon)
+    bearing = (np.degrees(np.arctan2(y, x)) + 360) % 360
+    return bearing, dist
+
+
+def distance_array(lat1, lon1, lat2, lon2):
+    """Vectorized :func:`distance_nm`."""
+    import numpy as np
+
+    lat1 = np.radians(lat1)
+    lat2 = np.radians(lat2)
+    dlon = np.radians(lon2) - np.radians(lon1)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return EARTH_RADIUS_NM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def bearing_array(lat1, lon1, lat2, lon2):
+    """Vectorized :func:`bearing_deg`."""
+    return bearing_distance_array(lat1, lon1, lat2, lon2)[0]
+
+
+def cross_track_array(lat, lon, lat1, lon1, lat2, lon2):
+    """Vectorized :func:`cross_track`, e.g. a whole track against one leg."""
+    import numpy as np
+
+    course, _ = bearing_distance_array(lat1, lon1, lat2, lon2)
+    bearing13, dist13 = bearing_distance_array(lat1, lon1, lat, lon)
+    dist13_rad = dist13 / EARTH_RADIUS_NM
+    xt_rad = np.arcsin(np.sin(dist13_rad) * np.sin(np.radians(bearing13 - course)))
+    at_rad = np.arccos(np.clip(np.cos(dist13_rad) / np.cos(xt_rad), -1.0, 1.0))
+    return xt_rad * EARTH_RADIUS_NM, at_rad * EARTH_RADIUS_NM
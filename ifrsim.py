@@ -1,11 +1,133 @@
-import jsbsim
-import time
+import logging
 import math
+import pickle
 import random
+import zlib
 from tcas import TCASSystem
 from complex_navigation import ComplexNavigationSystem
 from navdb import NavDatabase
 from a320_systems import FlightManagementSystem
+from fdm_interface import FDMInterface, bind_property
+from geodesy import GeoPoint, bearing_distance, bearing_distance_from
+from fake_fdm import FakeFDM
+from scheduler import SubsystemScheduler
+from failures import FailureScheduler, register_failure
+from realtime import RealTimeClock
+from profiler import PhaseTimer, StepProfiler
+from step_frame import OUTPUT_GROUPS, STEP_FIELDS, StepFrame, Subscriptions, output_groups
+
+# Default outputs recorded by :meth:`A320IFRSim.run_batch`.
+BATCH_FIELDS = (
+    "time_s",
+    "altitude_ft",
+    "speed_kt",
+    "heading_deg",
+    "vs_fpm",
+    "pitch_deg",
+    "roll_deg",
+    "throttle_cmd",
+    "n1",
+    "fuel_lbs",
+)
+
+logger = logging.getLogger(__name__)
+
+# Route loaded into the FMS once the nav database is available.
+DEFAULT_ROUTE = ("KJFK", "WPT1", "KLAX")
+
+# Step outputs printed by :meth:`A320IFRSim.run`.
+RUN_FIELDS = (
+    "altitude_ft",
+    "speed_kt",
+    "heading_deg",
+    "vs_fpm",
+    "flap",
+    "gear",
+    "throttle_cmd",
+    "n1",
+    "egt",
+    "hyd_press",
+    "elec_charge",
+    "fuel_lbs",
+    "cabin_altitude_ft",
+    "bleed_press",
+    "fuel_flow_lbs_hr_eng1",
+    "fuel_flow_lbs_hr_eng2",
+    "apu_flow_lbs_hr",
+    "crossfeed",
+    "oxygen_level",
+    "ice_accum",
+    "anti_ice_on",
+    "wing_ice_accum",
+    "wing_anti_ice_on",
+    "stall_warning",
+    "gpws_warning",
+    "overspeed_warning",
+    "nav_dist_nm",
+    "ils_dist_nm",
+    "loc_dev_deg",
+    "gs_dev_ft",
+    "brake_temp",
+    "autobrake_active",
+    "oil_press",
+    "oil_temp",
+    "engine_fire",
+    "fire_bottles",
+    "rat_deployed",
+    "master_caution",
+    "tcas_alert",
+)
+
+# Step outputs holding one value per engine.
+ENGINE_FIELDS = ("n1", "egt")
+
+# Format version of the blobs written by :meth:`A320IFRSim.save_state`.
+STATE_VERSION = 1
+
+# FDM state vector captured by save_state(): initial condition -> source.
+# It is restored through run_ic(), so the FDM resumes from the same
+# position, attitude and body rates.
+FDM_STATE_IC = {
+    "ic/lat-gc-deg": "position/lat-gc-deg",
+    "ic/long-gc-deg": "position/long-gc-deg",
+    "ic/h-sl-ft": "position/h-sl-ft",
+    "ic/phi-deg": "attitude/phi-deg",
+    "ic/theta-deg": "attitude/theta-deg",
+    "ic/psi-true-deg": "attitude/psi-deg",
+    "ic/u-fps": "velocities/u-fps",
+    "ic/v-fps": "velocities/v-fps",
+    "ic/w-fps": "velocities/w-fps",
+    "ic/p-rad_sec": "velocities/p-rad_sec",
+    "ic/q-rad_sec": "velocities/q-rad_sec",
+    "ic/r-rad_sec": "velocities/r-rad_sec",
+}
+
+# FDM properties written back directly after run_ic().
+FDM_STATE_DIRECT = (
+    "propulsion/tank/contents-lbs",
+    "propulsion/tank[1]/contents-lbs",
+    "fcs/flap-pos-norm",
+    "fcs/speedbrake-pos-norm",
+    "gear/gear-pos-norm",
+)
+
+_PLAIN_TYPES = (bool, int, float, str, type(None))
+
+
+def _is_plain(value) -> bool:
+    """Return True for values made only of builtin scalars and containers."""
+    if isinstance(value, _PLAIN_TYPES):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(v) for v in value)
+    if isinstance(value, dict):
+        return all(_is_plain(k) and _is_plain(v) for k, v in value.items())
+    return False
+
+
+def _plain_attrs(obj) -> dict:
+    """Return the attributes of *obj* that hold plain data."""
+    return {name: value for name, value in vars(obj).items() if _is_plain(value)}
 
 
 class PIDController:
@@ -36,17 +158,21 @@ class Engine:
         failure_chance=0.0,
         oil=None,
         fire_chance=0.0,
+        failures: FailureScheduler | None = None,
     ):
         self.fdm = fdm
         self.index = index
         self.spool_rate = spool_rate
         self.failure_chance = failure_chance
+        self.failures = failures
         self.throttle = 0.0
         self.target = 0.0
         self.efficiency = 1.0
         self.extra_fuel_factor = 0.0
         self.failed = False
-        self.oil = oil or OilSystem()
+        self.oil = oil or OilSystem(
+            failures=failures, name=f"engine{index + 1}_oil_pump"
+        )
         self.oil_timer = 0.0
         self.fire = False
         self.fire_timer = 0.0
@@ -55,6 +181,25 @@ class Engine:
         self.egt_timer = 0.0
         self.egt_rise_rate = 0.5
         self.egt_cool_rate = 0.2
+        self.n1_prop = bind_property(fdm, self._prop("n1"))
+        self.running_prop = bind_property(
+            fdm, self._prop("set-running"), dedupe=False
+        )
+        self.throttle_prop = bind_property(fdm, self._fcs("throttle-cmd-norm"))
+        register_failure(
+            failures,
+            f"engine{index + 1}_failure",
+            failure_chance,
+            self.fail,
+            lambda: not self.failed,
+        )
+        register_failure(
+            failures,
+            f"engine{index + 1}_fire",
+            fire_chance,
+            self.start_fire,
+            lambda: not self.fire,
+        )
 
     def _prop(self, name: str) -> str:
         if self.index == 0:
@@ -69,7 +214,7 @@ class Engine:
     def fail(self) -> None:
         """Fail this engine."""
         self.failed = True
-        self.fdm[self._prop("set-running")] = 0
+        self.running_prop.set(0)
 
     def restart(self) -> None:
         """Clear failure flag once the engine is running again."""
@@ -87,13 +232,13 @@ class Engine:
             max_delta = rate * dt
             diff = max(min(diff, max_delta), -max_delta)
             self.throttle += diff
-            if random.random() < self.failure_chance * dt:
+            if self.failures is None and random.random() < self.failure_chance * dt:
                 self.fail()
         else:
             self.throttle = 0.0
 
         cmd = self.throttle * self.efficiency
-        self.fdm[self._fcs("throttle-cmd-norm")] = cmd
+        self.throttle_prop.set(cmd)
 
         # Simple exhaust temperature model with overheat failure
         self.egt += (self.throttle * self.egt_rise_rate - self.egt_cool_rate) * dt
@@ -113,7 +258,11 @@ class Engine:
         if self.oil_timer > 5.0:
             self.fail()
 
-        if not self.fire and random.random() < self.fire_chance * dt:
+        if (
+            self.failures is None
+            and not self.fire
+            and random.random() < self.fire_chance * dt
+        ):
             self.fire = True
         if self.fire:
             self.fire_timer += dt
@@ -123,7 +272,7 @@ class Engine:
             self.fire_timer = 0.0
 
     def n1(self) -> float:
-        return self.fdm.get_property_value(self._prop("n1"))
+        return self.n1_prop.get()
 
     def oil_pressure(self) -> float:
         return self.oil.pressure
@@ -134,6 +283,9 @@ class Engine:
     def exhaust_temperature(self) -> float:
         return self.egt
 
+    def start_fire(self) -> None:
+        self.fire = True
+
     def extinguish_fire(self) -> None:
         self.fire = False
         self.fire_timer = 0.0
@@ -236,6 +388,7 @@ class Autothrottle:
         self.target_speed = 0.0
         self.pitot = pitot
         self.engaged = True
+        self.vt_prop = bind_property(fdm, "velocities/vt-fps")
 
     def engage(self) -> None:
         """Activate autothrottle control."""
@@ -260,7 +413,7 @@ class Autothrottle:
         if self.pitot is not None:
             speed = self.pitot.indicated_speed(self.fdm)
         else:
-            speed = self.fdm.get_property_value("velocities/vt-fps") / 1.68781
+            speed = self.vt_prop.get() / 1.68781
         throttle_cmd = self.pid.update(self.target_speed - speed, dt)
         throttle_cmd = max(0.0, min(throttle_cmd, 1.0))
         self.engine.set_target(throttle_cmd)
@@ -272,18 +425,36 @@ class HydraulicSystem:
     """Very small hydraulic system model with basic failures."""
 
     def __init__(
-        self, pump_rate=0.3, usage_factor=0.5, leak_rate=0.01, failure_chance=0.0
+        self,
+        pump_rate=0.3,
+        usage_factor=0.5,
+        leak_rate=0.01,
+        failure_chance=0.0,
+        failures: FailureScheduler | None = None,
     ):
         self.pressure = 1.0
         self.pump_rate = pump_rate
         self.usage_factor = usage_factor
         self.leak_rate = leak_rate
         self.failure_chance = failure_chance
+        self.failures = failures
         self.pump_on = True
+        self.pump_power = True
+        register_failure(
+            failures,
+            "hydraulic_pump",
+            failure_chance,
+            self.fail_pump,
+            lambda: self.pump_on and self.pump_power,
+        )
+
+    def fail_pump(self) -> None:
+        self.pump_on = False
 
     def update(self, demand: float, dt: float, pump_power: bool = True) -> float:
+        self.pump_power = pump_power
         if self.pump_on and pump_power:
-            if random.random() < self.failure_chance * dt:
+            if self.failures is None and random.random() < self.failure_chance * dt:
                 self.pump_on = False
             else:
                 self.pressure += self.pump_rate * dt
@@ -382,6 +553,8 @@ class OilSystem:
         heat_rate=0.3,
         cool_rate=0.1,
         failure_chance=0.0,
+        failures: FailureScheduler | None = None,
+        name: str = "oil_pump",
     ):
         self.pressure = 1.0
         self.temperature = 0.2
@@ -390,11 +563,18 @@ class OilSystem:
         self.heat_rate = heat_rate
         self.cool_rate = cool_rate
         self.failure_chance = failure_chance
+        self.failures = failures
         self.pump_on = True
+        register_failure(
+            failures, name, failure_chance, self.fail_pump, lambda: self.pump_on
+        )
+
+    def fail_pump(self) -> None:
+        self.pump_on = False
 
     def update(self, throttle: float, dt: float) -> tuple[float, float]:
         if self.pump_on:
-            if random.random() < self.failure_chance * dt:
+            if self.failures is None and random.random() < self.failure_chance * dt:
                 self.pump_on = False
             else:
                 self.pressure += self.pump_rate * throttle * dt
@@ -423,6 +603,7 @@ class SystemManager:
         failure_chance=0.0,
         flap_overspeed_kt=220.0,
         gear_overspeed_kt=250.0,
+        failures: FailureScheduler | None = None,
     ):
         self.fdm = fdm
         self.flap_rate = flap_rate
@@ -434,11 +615,16 @@ class SystemManager:
         self.target_flap = 0.0
         self.target_gear = 0.0
         self.target_speedbrake = 0.0
-        self.hydraulics = HydraulicSystem(failure_chance=failure_chance)
+        self.hydraulics = HydraulicSystem(
+            failure_chance=failure_chance, failures=failures
+        )
         self.flap_overspeed_kt = flap_overspeed_kt
         self.gear_overspeed_kt = gear_overspeed_kt
         self.flap_operable = True
         self.gear_operable = True
+        self.flap_prop = bind_property(fdm, "fcs/flap-cmd-norm")
+        self.gear_prop = bind_property(fdm, "gear/gear-cmd-norm")
+        self.speedbrake_prop = bind_property(fdm, "fcs/speedbrake-cmd-norm")
 
     def set_targets(self, gear=None, flap=None, speedbrake=None):
         if gear is not None:
@@ -462,7 +648,7 @@ class SystemManager:
                 max_df = self.flap_rate * dt * pressure
                 d_flap = max(min(d_flap, max_df), -max_df)
                 self.flap += d_flap
-        self.fdm["fcs/flap-cmd-norm"] = self.flap
+        self.flap_prop.set(self.flap)
 
         if self.gear_operable:
             if speed_kt > self.gear_overspeed_kt and abs(d_gear) > 0.0:
@@ -471,12 +657,12 @@ class SystemManager:
                 max_dg = self.gear_rate * dt * pressure
                 d_gear = max(min(d_gear, max_dg), -max_dg)
                 self.gear += d_gear
-        self.fdm["gear/gear-cmd-norm"] = self.gear
+        self.gear_prop.set(self.gear)
 
         max_ds = self.speedbrake_rate * dt * pressure
         d_speedbrake = max(min(d_speedbrake, max_ds), -max_ds)
         self.speedbrake += d_speedbrake
-        self.fdm["fcs/speedbrake-cmd-norm"] = self.speedbrake
+        self.speedbrake_prop.set(self.speedbrake)
 
         return pressure, demand
 
@@ -505,13 +691,20 @@ class FuelSystem:
         self.crossfeed_rate_pph = crossfeed_rate_pph
         self.balance_threshold_lbs = balance_threshold_lbs
         self.crossfeed_on = False
-        self.prev_used_0 = fdm.get_property_value("propulsion/engine/fuel-used-lbs")
-        self.prev_used_1 = fdm.get_property_value("propulsion/engine[1]/fuel-used-lbs")
-
-    def update(self):
-        dt = self.fdm.get_delta_t()
-        used_0 = self.fdm.get_property_value("propulsion/engine/fuel-used-lbs")
-        used_1 = self.fdm.get_property_value("propulsion/engine[1]/fuel-used-lbs")
+        self.used_0_prop = bind_property(fdm, "propulsion/engine/fuel-used-lbs")
+        self.used_1_prop = bind_property(fdm, "propulsion/engine[1]/fuel-used-lbs")
+        self.left_prop = bind_property(fdm, "propulsion/tank/contents-lbs")
+        self.right_prop = bind_property(fdm, "propulsion/tank[1]/contents-lbs")
+        self.prev_used_0 = self.used_0_prop.get()
+        self.prev_used_1 = self.used_1_prop.get()
+        self.last: dict | None = None
+
+    def update(self, dt: float | None = None):
+        """Update fuel state over *dt* seconds (defaults to the FDM step)."""
+        if dt is None:
+            dt = self.fdm.get_delta_t()
+        used_0 = self.used_0_prop.get()
+        used_1 = self.used_1_prop.get()
         flow_0 = (used_0 - self.prev_used_0) / dt * 3600.0
         flow_1 = (used_1 - self.prev_used_1) / dt * 3600.0
         if self.engine is not None:
@@ -520,8 +713,8 @@ class FuelSystem:
         self.prev_used_0 = used_0
         self.prev_used_1 = used_1
 
-        left = self.fdm.get_property_value("propulsion/tank/contents-lbs")
-        right = self.fdm.get_property_value("propulsion/tank[1]/contents-lbs")
+        left = self.left_prop.get()
+        right = self.right_prop.get()
 
         # Automatic crossfeed to keep tanks balanced
         diff = left - right
@@ -540,18 +733,18 @@ class FuelSystem:
                 right -= xfeed_amt
             if abs(left - right) < self.balance_threshold_lbs * 0.2:
                 self.crossfeed_on = False
-            self.fdm["propulsion/tank/contents-lbs"] = left
-            self.fdm["propulsion/tank[1]/contents-lbs"] = right
+            self.left_prop.set(left)
+            self.right_prop.set(right)
 
         apu_flow = 0.0
         if self.electrics and self.electrics.apu_running:
             apu_flow = self.apu_flow_pph
             burn = apu_flow / 3600.0 * dt
             left = max(left - burn, 0.0)
-            self.fdm["propulsion/tank/contents-lbs"] = left
+            self.left_prop.set(left)
 
         total = left + right
-        return {
+        self.last = {
             "left_lbs": left,
             "right_lbs": right,
             "total_lbs": total,
@@ -560,6 +753,7 @@ class FuelSystem:
             "apu_flow_pph": apu_flow,
             "crossfeed": self.crossfeed_on,
         }
+        return self.last
 
 
 class RamAirTurbine:
@@ -603,6 +797,7 @@ class ElectricSystem:
         apu_start_time=5.0,
         generator_failure_chance=0.0,
         rat=None,
+        failures: FailureScheduler | None = None,
     ):
         self.charge = 1.0
         self.charge_rate = charge_rate
@@ -613,7 +808,19 @@ class ElectricSystem:
         self.apu_timer = 0.0
         self.generator_failure_chance = generator_failure_chance
         self.generator_failed = False
+        self.generator_on = False
         self.rat = rat
+        self.failures = failures
+        register_failure(
+            failures,
+            "generator",
+            generator_failure_chance,
+            self.fail_generator,
+            lambda: self.generator_on and not self.generator_failed,
+        )
+
+    def fail_generator(self) -> None:
+        self.generator_failed = True
 
     def start_apu(self) -> None:
         if not self.apu_running:
@@ -624,8 +831,12 @@ class ElectricSystem:
         self.apu_running = False
 
     def update(self, generator_on: bool, demand: float, dt: float) -> float:
+        self.generator_on = generator_on
         if generator_on and not self.generator_failed:
-            if random.random() < self.generator_failure_chance * dt:
+            if (
+                self.failures is None
+                and random.random() < self.generator_failure_chance * dt
+            ):
                 self.generator_failed = True
             else:
                 self.charge += self.charge_rate * dt
@@ -696,13 +907,8 @@ class EngineStartSystem:
             self.state = "starting"
             self.timer = 0.0
             if self.engines is not None:
-                for i, _ in enumerate(self.engines.engines):
-                    key = (
-                        "propulsion/engine/set-running"
-                        if i == 0
-                        else f"propulsion/engine[{i}]/set-running"
-                    )
-                    self.fdm[key] = 0
+                for eng in self.engines.engines:
+                    eng.running_prop.set(0)
 
     def update(self, dt: float) -> bool:
         if self.state == "starting":
@@ -710,13 +916,8 @@ class EngineStartSystem:
                 self.timer += dt
             if self.timer >= self.start_time:
                 if self.engines is not None:
-                    for i, eng in enumerate(self.engines.engines):
-                        key = (
-                            "propulsion/engine/set-running"
-                            if i == 0
-                            else f"propulsion/engine[{i}]/set-running"
-                        )
-                        self.fdm[key] = 1
+                    for eng in self.engines.engines:
+                        eng.running_prop.set(1)
                         eng.restart()
                 self.state = "running"
         return self.state == "running"
@@ -725,34 +926,50 @@ class EngineStartSystem:
 class Environment:
     """Wind model with simple lateral and vertical gusts."""
 
-    def __init__(self, fdm, gust_strength=5.0, vertical_strength=2.0, base_temp=15.0):
+    def __init__(
+        self,
+        fdm,
+        gust_strength=5.0,
+        vertical_strength=2.0,
+        base_temp=15.0,
+        rng: random.Random | None = None,
+        wind_north_fps=0.0,
+        wind_east_fps=0.0,
+    ):
         self.fdm = fdm
+        self.rng = rng if rng is not None else random
+        self.wind_north_fps = wind_north_fps
+        self.wind_east_fps = wind_east_fps
         self.gust_strength = gust_strength
         self.vertical_strength = vertical_strength
         self.base_temp = base_temp
         self.temperature_c = base_temp
         self.precip = 0.0
         self.t = 0.0
+        self.wind_north_prop = bind_property(fdm, "atmosphere/wind-north-fps")
+        self.wind_east_prop = bind_property(fdm, "atmosphere/wind-east-fps")
+        self.wind_down_prop = bind_property(fdm, "atmosphere/wind-down-fps")
+        self.alt_prop = bind_property(fdm, "position/h-sl-ft")
 
     def update(self, dt):
         self.t += dt
         base = 10.0 * math.sin(self.t / 30.0)
         gust = self.gust_strength * math.sin(self.t * 10.0)
-        gust += random.uniform(-self.gust_strength, self.gust_strength) * 0.1
-        self.fdm["atmosphere/wind-north-fps"] = 0.0
-        self.fdm["atmosphere/wind-east-fps"] = base + gust
+        gust += self.rng.uniform(-self.gust_strength, self.gust_strength) * 0.1
+        self.wind_north_prop.set(self.wind_north_fps)
+        self.wind_east_prop.set(self.wind_east_fps + base + gust)
 
         vert_base = 2.0 * math.sin(self.t / 40.0)
         vert_gust = self.vertical_strength * math.sin(self.t * 12.0)
         vert_gust += (
-            random.uniform(-self.vertical_strength, self.vertical_strength) * 0.1
+            self.rng.uniform(-self.vertical_strength, self.vertical_strength) * 0.1
         )
-        self.fdm["atmosphere/wind-down-fps"] = vert_base + vert_gust
+        self.wind_down_prop.set(vert_base + vert_gust)
 
-        alt = self.fdm.get_property_value("position/h-sl-ft")
+        alt = self.alt_prop.get()
         self.temperature_c = self.base_temp - 0.002 * alt
-        if random.random() < 0.01:
-            self.precip = random.uniform(0.2, 1.0)
+        if self.rng.random() < 0.01:
+            self.precip = self.rng.uniform(0.2, 1.0)
         self.precip *= 0.99
 
     def is_icing(self):
@@ -770,6 +987,7 @@ class AntiIceSystem:
         melt_rate=0.05,
         acc_rate=0.1,
         failure_chance=0.0,
+        failures: FailureScheduler | None = None,
     ):
         self.environment = environment
         self.engine = engine
@@ -777,8 +995,16 @@ class AntiIceSystem:
         self.melt_rate = melt_rate
         self.acc_rate = acc_rate
         self.failure_chance = failure_chance
+        self.failures = failures
         self.active = False
         self.ice = 0.0
+        register_failure(
+            failures,
+            "icing_flameout",
+            failure_chance,
+            self.engine.fail,
+            lambda: self.ice > 0.9,
+        )
 
     def set_active(self, state: bool) -> None:
         self.active = state
@@ -794,7 +1020,11 @@ class AntiIceSystem:
         self.ice = max(0.0, min(1.0, self.ice))
         self.engine.efficiency = 1.0 - 0.3 * self.ice
         self.engine.extra_fuel_factor = 0.05 if self.active else 0.0
-        if self.ice > 0.9 and random.random() < self.failure_chance * dt:
+        if (
+            self.failures is None
+            and self.ice > 0.9
+            and random.random() < self.failure_chance * dt
+        ):
             self.engine.fail()
         return self.active, self.ice
 
@@ -840,6 +1070,8 @@ class PitotSystem:
         self.clog_rate = clog_rate
         self.clear_rate = clear_rate
         self.clog = 0.0
+        self._vt_fdm = None
+        self._vt_prop = None
 
     def set_heat(self, state: bool) -> None:
         self.heat_on = state
@@ -853,7 +1085,10 @@ class PitotSystem:
         return self.clog
 
     def indicated_speed(self, fdm) -> float:
-        speed = fdm.get_property_value("velocities/vt-fps") / 1.68781
+        if fdm is not self._vt_fdm:
+            self._vt_prop = bind_property(fdm, "velocities/vt-fps")
+            self._vt_fdm = fdm
+        speed = self._vt_prop.get() / 1.68781
         return speed * (1.0 - 0.5 * self.clog)
 
 
@@ -865,16 +1100,19 @@ class PressurizationSystem:
         self.bleed = bleed
         self.target_diff = target_diff
         self.leak_rate = leak_rate
-        self.cabin_alt = fdm.get_property_value("position/h-sl-ft")
+        self.alt_prop = bind_property(fdm, "position/h-sl-ft")
+        self.cabin_alt = self.alt_prop.get()
+        self.diff = 0.0
 
     def _pressure_at_alt(self, alt):
         return 14.7 * math.exp(-alt / 20000.0)
 
     def update(self, dt):
-        alt = self.fdm.get_property_value("position/h-sl-ft")
+        alt = self.alt_prop.get()
         amb = self._pressure_at_alt(alt)
         cab = self._pressure_at_alt(self.cabin_alt)
         diff = cab - amb
+        self.diff = diff
         bleed = 1.0
         if self.bleed is not None:
             bleed = self.bleed.update()
@@ -938,14 +1176,18 @@ class StallWarningSystem:
         self.alpha_thresh = math.radians(alpha_deg)
         self.speed_thresh = speed_kt
         self.wing_ice = wing_ice
+        self.active = False
+        self.alpha_prop = bind_property(fdm, "aero/alpha-rad")
+        self.vt_prop = bind_property(fdm, "velocities/vt-fps")
 
     def update(self):
-        alpha = self.fdm.get_property_value("aero/alpha-rad")
-        speed = self.fdm.get_property_value("velocities/vt-fps") / 1.68781
+        alpha = self.alpha_prop.get()
+        speed = self.vt_prop.get() / 1.68781
         speed_thresh = self.speed_thresh
         if self.wing_ice is not None:
             speed_thresh += 40.0 * self.wing_ice.ice
-        return alpha > self.alpha_thresh or speed < speed_thresh
+        self.active = alpha > self.alpha_thresh or speed < speed_thresh
+        return self.active
 
 
 class GroundProximityWarningSystem:
@@ -955,11 +1197,15 @@ class GroundProximityWarningSystem:
         self.fdm = fdm
         self.alt_thresh = alt_ft
         self.sink_thresh = -abs(sink_rate_fpm)
+        self.active = False
+        self.agl_prop = bind_property(fdm, "position/h-agl-ft")
+        self.vs_prop = bind_property(fdm, "velocities/h-dot-fps")
 
     def update(self):
-        agl = self.fdm.get_property_value("position/h-agl-ft")
-        vs_fpm = self.fdm.get_property_value("velocities/h-dot-fps") * 60.0
-        return agl < self.alt_thresh and vs_fpm < self.sink_thresh
+        agl = self.agl_prop.get()
+        vs_fpm = self.vs_prop.get() * 60.0
+        self.active = agl < self.alt_thresh and vs_fpm < self.sink_thresh
+        return self.active
 
 
 class OverspeedWarningSystem:
@@ -968,10 +1214,13 @@ class OverspeedWarningSystem:
     def __init__(self, fdm, limit_kt=320.0):
         self.fdm = fdm
         self.limit = limit_kt
+        self.active = False
+        self.vt_prop = bind_property(fdm, "velocities/vt-fps")
 
     def update(self):
-        speed = self.fdm.get_property_value("velocities/vt-fps") / 1.68781
-        return speed > self.limit
+        speed = self.vt_prop.get() / 1.68781
+        self.active = speed > self.limit
+        return self.active
 
 
 class WeatherRadarSystem:
@@ -980,10 +1229,12 @@ class WeatherRadarSystem:
     def __init__(self, environment, threshold=0.5):
         self.environment = environment
         self.threshold = threshold
+        self.active = False
 
     def update(self) -> bool:
         """Return True when precipitation intensity exceeds the threshold."""
-        return self.environment.precip >= self.threshold
+        self.active = self.environment.precip >= self.threshold
+        return self.active
 
 
 class FireSuppressionSystem:
@@ -1041,42 +1292,25 @@ class NavigationSystem:
         self.fdm = fdm
         self.waypoints = waypoints or []
         self.index = 0
+        self.lat_prop = bind_property(fdm, "position/lat-gc-deg")
+        self.lon_prop = bind_property(fdm, "position/long-gc-deg")
 
     def add_waypoint(self, lat_deg, lon_deg, alt_ft=None):
         """Append a new waypoint to the route."""
         self.waypoints.append((lat_deg, lon_deg, alt_ft))
 
-    def _bearing_distance(self, lat1, lon1, lat2, lon2):
-        lat1 = math.radians(lat1)
-        lon1 = math.radians(lon1)
-        lat2 = math.radians(lat2)
-        lon2 = math.radians(lon2)
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        a = (
-            math.sin(dlat / 2) ** 2
-            + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-        )
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        dist_nm = 3440.065 * c
-        y = math.sin(dlon) * math.cos(lat2)
-        x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(
-            lat2
-        ) * math.cos(dlon)
-        bearing = (math.degrees(math.atan2(y, x)) + 360) % 360
-        return bearing, dist_nm
-
     def update(self):
         if not self.waypoints or self.index >= len(self.waypoints):
             return None, None, None
-        lat = self.fdm.get_property_value("position/lat-gc-deg")
-        lon = self.fdm.get_property_value("position/long-gc-deg")
+        lat = self.lat_prop.get()
+        lon = self.lon_prop.get()
+        own = GeoPoint(lat, lon)
         tgt_lat, tgt_lon, tgt_alt = self.waypoints[self.index]
-        bearing, dist = self._bearing_distance(lat, lon, tgt_lat, tgt_lon)
+        bearing, dist = bearing_distance_from(own, tgt_lat, tgt_lon)
         if dist < 0.3 and self.index < len(self.waypoints) - 1:
             self.index += 1
             tgt_lat, tgt_lon, tgt_alt = self.waypoints[self.index]
-        bearing, dist = self._bearing_distance(lat, lon, tgt_lat, tgt_lon)
+            bearing, dist = bearing_distance_from(own, tgt_lat, tgt_lon)
         return bearing, dist, tgt_alt
 
 
@@ -1100,32 +1334,15 @@ class ILSSystem:
         self.alt = runway_alt_ft
         self.gs = gs_deg
         self.range = range_nm
-
-    def _bearing_distance(self, lat1, lon1, lat2, lon2):
-        lat1 = math.radians(lat1)
-        lon1 = math.radians(lon1)
-        lat2 = math.radians(lat2)
-        lon2 = math.radians(lon2)
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        a = (
-            math.sin(dlat / 2) ** 2
-            + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-        )
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        dist_nm = 3440.065 * c
-        y = math.sin(dlon) * math.cos(lat2)
-        x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(
-            lat2
-        ) * math.cos(dlon)
-        bearing = (math.degrees(math.atan2(y, x)) + 360) % 360
-        return bearing, dist_nm
+        self.lat_prop = bind_property(fdm, "position/lat-gc-deg")
+        self.lon_prop = bind_property(fdm, "position/long-gc-deg")
+        self.alt_prop = bind_property(fdm, "position/h-sl-ft")
 
     def update(self):
-        lat = self.fdm.get_property_value("position/lat-gc-deg")
-        lon = self.fdm.get_property_value("position/long-gc-deg")
-        alt = self.fdm.get_property_value("position/h-sl-ft")
-        bearing, dist = self._bearing_distance(lat, lon, self.lat, self.lon)
+        lat = self.lat_prop.get()
+        lon = self.lon_prop.get()
+        alt = self.alt_prop.get()
+        bearing, dist = bearing_distance(lat, lon, self.lat, self.lon)
         dev = (bearing - self.hdg + 180) % 360 - 180
         target_alt = self.alt + math.tan(math.radians(self.gs)) * dist * 6076.12
         gs_dev = alt - target_alt
@@ -1176,6 +1393,11 @@ class Autopilot:
         self.ils = ils
         self.pitot = pitot
         self.last_autobrake_active = False
+        self.hyd_demand = 0.0
+        # Output record filled by update(), shared with the simulation
+        self.frame = StepFrame(len(engine.engines))
+        # Optional output groups packed into the frame, see step_frame.py
+        self.output_groups = frozenset(OUTPUT_GROUPS)
         self.autothrottle = Autothrottle(fdm, engine, pitot=pitot)
         self.engaged = True
         self.altitude = 0.0
@@ -1194,6 +1416,15 @@ class Autopilot:
         self.auto_manage_systems = auto_manage_systems
         self.vertical_mode = "VS"
         self.lateral_mode = "HDG"
+        self.alt_prop = bind_property(fdm, "position/h-sl-ft")
+        self.psi_prop = bind_property(fdm, "attitude/psi-deg")
+        self.vt_prop = bind_property(fdm, "velocities/vt-fps")
+        self.vs_prop = bind_property(fdm, "velocities/h-dot-fps")
+        self.agl_prop = bind_property(fdm, "position/h-agl-ft")
+        self.beta_prop = bind_property(fdm, "aero/beta-rad")
+        self.elevator_prop = bind_property(fdm, "fcs/elevator-cmd-norm")
+        self.aileron_prop = bind_property(fdm, "fcs/aileron-cmd-norm")
+        self.rudder_prop = bind_property(fdm, "fcs/rudder-cmd-norm")
 
     def engage(self) -> None:
         """Activate the autopilot."""
@@ -1273,17 +1504,19 @@ class Autopilot:
         if self.pitot is not None:
             self.pitot.set_heat(icing)
 
-    def update(self):
+    def update(self) -> StepFrame:
+        """Run the control loops and fill the flight fields of :attr:`frame`."""
         f = self.fdm
+        frame = self.frame
         if self.pitot is not None:
             self.pitot.update(self.dt)
-        alt = f.get_property_value("position/h-sl-ft")
-        psi = f.get_property_value("attitude/psi-deg")
+        alt = self.alt_prop.get()
+        psi = self.psi_prop.get()
         if self.pitot is not None:
             speed = self.pitot.indicated_speed(f)
         else:
-            speed = f.get_property_value("velocities/vt-fps") / 1.68781
-        vs = f.get_property_value("velocities/h-dot-fps")  # ft/s
+            speed = self.vt_prop.get() / 1.68781
+        vs = self.vs_prop.get()  # ft/s
         vertical_mode = "VS"
         lateral_mode = "HDG"
 
@@ -1322,7 +1555,7 @@ class Autopilot:
                 )
                 vertical_mode = "VNAV"
 
-        agl = f.get_property_value("position/h-agl-ft")
+        agl = self.agl_prop.get()
         on_ground = agl < 5.0
         self._manage_systems(alt, speed, on_ground)
         pump_power = self.engine.n1() > 0.2 or self.electrics.apu_running
@@ -1349,30 +1582,30 @@ class Autopilot:
         if self.engaged:
             pitch_cmd = max(min(self.vs_pid.update(vs_error, self.dt), 0.5), -0.5)
             if powered:
-                f["fcs/elevator-cmd-norm"] = pitch_cmd * pressure
+                self.elevator_prop.set(pitch_cmd * pressure)
             else:
-                f["fcs/elevator-cmd-norm"] = 0.0
+                self.elevator_prop.set(0.0)
 
             heading_error = (self.heading - psi + 180) % 360 - 180
             aileron_cmd = max(
                 min(self.hdg_pid.update(heading_error, self.dt), 0.3), -0.3
             )
             if powered:
-                f["fcs/aileron-cmd-norm"] = aileron_cmd * pressure
+                self.aileron_prop.set(aileron_cmd * pressure)
             else:
-                f["fcs/aileron-cmd-norm"] = 0.0
+                self.aileron_prop.set(0.0)
 
-            slip = f.get_property_value("aero/beta-rad")
+            slip = self.beta_prop.get()
             rudder_cmd = max(min(self.yaw_pid.update(-slip, self.dt), 0.3), -0.3)
             if powered:
-                f["fcs/rudder-cmd-norm"] = rudder_cmd * pressure
+                self.rudder_prop.set(rudder_cmd * pressure)
             else:
-                f["fcs/rudder-cmd-norm"] = 0.0
+                self.rudder_prop.set(0.0)
         else:
             if powered:
-                f["fcs/elevator-cmd-norm"] = 0.0
-                f["fcs/aileron-cmd-norm"] = 0.0
-                f["fcs/rudder-cmd-norm"] = 0.0
+                self.elevator_prop.set(0.0)
+                self.aileron_prop.set(0.0)
+                self.rudder_prop.set(0.0)
 
         throttle_cmd = self.autothrottle.update(self.dt, powered)
         active, ice = self.anti_ice.update(self.dt)
@@ -1381,76 +1614,142 @@ class Autopilot:
         if self.wing_ice is not None:
             wing_active, wing_ice = self.wing_ice.update(self.dt)
 
-        n1_list = self.engine.n1_list()
-        egt_list = self.engine.egt_list()
-        oil_p = self.engine.oil_pressure()
-        oil_t = self.engine.oil_temperature()
+        groups = self.output_groups
+        n1 = frame.n1
+        for i, eng in enumerate(self.engine.engines):
+            n1[i] = eng.n1()
         self.vertical_mode = vertical_mode
         self.lateral_mode = lateral_mode
-        return (
-            alt,
-            speed,
-            psi,
-            pitch_cmd,
-            aileron_cmd,
-            self.engine.throttle,
-            n1_list,
-            pressure,
-            demand,
-            active,
-            ice,
-            wing_active,
-            wing_ice,
-            nav_dist,
-            brake_temp,
-            self.last_autobrake_active,
-            oil_p,
-            oil_t,
-            egt_list,
-            loc_dev,
-            gs_dev,
-            ils_dist,
-            self.systems.flap_operable,
-            self.systems.gear_operable,
-            lateral_mode,
-        )
+        self.hyd_demand = demand
+        frame.altitude_ft = alt
+        frame.speed_kt = speed
+        frame.heading_deg = psi
+        frame.pitch_cmd = pitch_cmd
+        frame.aileron_cmd = aileron_cmd
+        frame.throttle_cmd = self.engine.throttle
+        if "systems" in groups:
+            frame.hyd_press = pressure
+            frame.anti_ice_on = active
+            frame.ice_accum = ice
+            frame.wing_anti_ice_on = wing_active
+            frame.wing_ice_accum = wing_ice
+        if "engines" in groups:
+            egt = frame.egt
+            for i, eng in enumerate(self.engine.engines):
+                egt[i] = eng.egt
+            frame.oil_press = self.engine.oil_pressure()
+            frame.oil_temp = self.engine.oil_temperature()
+        if "brakes" in groups:
+            frame.brake_temp = brake_temp
+            frame.autobrake_active = self.last_autobrake_active
+        if "navigation" in groups:
+            frame.nav_dist_nm = nav_dist
+            frame.loc_dev_deg = loc_dev
+            frame.gs_dev_ft = gs_dev
+            frame.ils_dist_nm = ils_dist
+        if "controls" in groups:
+            frame.flap_operable = self.systems.flap_operable
+            frame.gear_operable = self.systems.gear_operable
+        return frame
+
+
+def _fmt(value, spec: str) -> str:
+    """Format an optional step output for the console, ``--`` if missing."""
+    return "--" if value is None else format(value, spec)
 
 
 class A320IFRSim:
-    def __init__(self, root_dir="jsbsim-master", dt=0.02):
-        self.fdm = jsbsim.FGFDMExec(None, None)
+    def __init__(
+        self,
+        root_dir="jsbsim-master",
+        dt=0.02,
+        update_periods=None,
+        seed=None,
+        weight_lbs=130000.0,
+        nav_db: NavDatabase | None = None,
+        realtime_policy="catch_up",
+        fdm=None,
+    ):
+        """Build the aircraft on *fdm*, a ``jsbsim.FGFDMExec`` by default.
+
+        Any object with the same surface can be passed instead, e.g. a
+        :class:`fake_fdm.FakeFDM` to run the Python layer without JSBSim.
+
+        Without *nav_db* the default database loads on a background thread
+        while the flight model and the systems are built, and the default
+        route is loaded by the first :meth:`step` after it is ready. The
+        durations of the construction phases are kept in :attr:`startup`.
+        """
+        self.startup = PhaseTimer()
+        if nav_db is None:
+            nav_db = NavDatabase(
+                "data/navdb/airports.csv",
+                "data/navdb/waypoints.csv",
+                "data/navdb/ils.csv",
+                background=True,
+            )
+        self.nav_db = nav_db
+        # Replacement database loading in the background, see reload_nav_db()
+        self._pending_nav_db: NavDatabase | None = None
+        self.nav_db_error: str | None = None
+        if fdm is None:
+            import jsbsim
+
+            fdm = jsbsim.FGFDMExec(None, None)
+        self.root_dir = root_dir
+        self.fdm = FDMInterface(fdm)
         self.fdm.disable_output()
         self.fdm.set_root_dir(root_dir)
         self.fdm.load_model("A320")
         self.fdm.set_dt(dt)
+        self.startup.mark("fdm_load")
         self.target_altitude = 4000  # feet
         self.target_psi = 0  # heading degrees
         self.target_speed = 250  # knots
+        self.weight_lbs = weight_lbs
         self.time_s = 0.0
-        self.nav_db = NavDatabase(
-            "data/navdb/airports.csv",
-            "data/navdb/waypoints.csv",
-            "data/navdb/ils.csv",
-        )
+        # Slow subsystems are updated at their own rate, see scheduler.py
+        self.scheduler = SubsystemScheduler(update_periods)
+        # Paces step(real_time=True) and run() against absolute deadlines
+        self.realtime = RealTimeClock(dt, realtime_policy)
+        # Disabled until set_profiling(True); costs nothing while off
+        self.profiler = StepProfiler()
+        # Per-instance random streams keep Monte Carlo runs reproducible
+        self.rng = random.Random(seed)
+        self.failures = FailureScheduler(rng=random.Random(self.rng.getrandbits(64)))
         self.engines = EngineSystem(
             [
-                Engine(self.fdm, 0, failure_chance=5e-5, fire_chance=1e-5),
-                Engine(self.fdm, 1, failure_chance=5e-5, fire_chance=1e-5),
+                Engine(
+                    self.fdm,
+                    i,
+                    failure_chance=5e-5,
+                    fire_chance=1e-5,
+                    failures=self.failures,
+                )
+                for i in range(2)
             ]
         )
-        self.systems = SystemManager(self.fdm, failure_chance=1e-4)
+        self.systems = SystemManager(
+            self.fdm, failure_chance=1e-4, failures=self.failures
+        )
         self.rat = RamAirTurbine()
-        self.electrics = ElectricSystem(generator_failure_chance=5e-5, rat=self.rat)
+        self.electrics = ElectricSystem(
+            generator_failure_chance=5e-5, rat=self.rat, failures=self.failures
+        )
         self.fuel = FuelSystem(self.fdm, self.engines, self.electrics)
         self.bleed = BleedAirSystem(self.engines, self.electrics)
         self.starter = EngineStartSystem(self.fdm, self.bleed, self.engines)
-        self.environment = Environment(self.fdm)
+        self.environment = Environment(self.fdm, rng=self.rng)
         self.pitot = PitotSystem(self.environment)
         self.brakes = BrakeSystem()
         self.autobrake = AutobrakeSystem(self.brakes)
         self.tcas = TCASSystem(self.fdm)
         self.anti_ice = AntiIceSystem(
-            self.environment, self.engines, self.bleed, failure_chance=1e-4
+            self.environment,
+            self.engines,
+            self.bleed,
+            failure_chance=1e-4,
+            failures=self.failures,
         )
         self.wing_ice = WingIceSystem(self.environment, self.bleed)
         self.pressurization = PressurizationSystem(self.fdm, self.bleed)
@@ -1464,10 +1763,6 @@ class A320IFRSim:
         self.master_caution = MasterCautionSystem()
         self.nav = ComplexNavigationSystem(self.fdm)
         self.fms = FlightManagementSystem(self.nav, self.nav_db)
-        try:
-            self.fms.load_route_by_idents(["KJFK", "WPT1", "KLAX"])
-        except Exception:
-            pass
         self.ils = ILSSystem(self.fdm, 37.60, -122.05, 270.0, 10.0)
         self.autopilot = Autopilot(
             self.fdm,
@@ -1484,10 +1779,27 @@ class A320IFRSim:
             self.ils,
             self.pitot,
         )
+        self.frame = self.autopilot.frame
+        # Step fields requested by consumers; everything until someone subscribes
+        self.outputs = Subscriptions(STEP_FIELDS)
         self.init_conditions()
         self.autopilot.set_targets(
             self.target_altitude, self.target_psi, self.target_speed
         )
+        self.pitch_prop = self.fdm.bind("attitude/pitch-deg")
+        self.roll_prop = self.fdm.bind("attitude/roll-deg")
+        self.flap_pos_prop = self.fdm.bind("fcs/flap-pos-norm")
+        self.gear_pos_prop = self.fdm.bind("gear/gear-pos-norm")
+        self.vs_prop = self.fdm.bind("velocities/h-dot-fps")
+        self.startup.mark("systems")
+        # The only step that needs the nav database. A database still
+        # loading is not waited for: the first step() after it finishes
+        # loads the route, unless the route was edited in the meantime.
+        self._default_route: tuple | None = DEFAULT_ROUTE
+        self._default_route_version = self.fms.version
+        if self.nav_db.loaded:
+            self._load_default_route()
+            self.startup.mark("navdb_route")
 
     def init_conditions(self):
         f = self.fdm
@@ -1499,7 +1811,7 @@ class A320IFRSim:
         f["ic/h-sl-ft"] = self.target_altitude
         f["ic/long-gc-deg"] = -122.0
         f["ic/lat-gc-deg"] = 37.615
-        f["ic/weight-lbs"] = 130000
+        f["ic/weight-lbs"] = self.weight_lbs
         f["propulsion/engine/set-running"] = 0
         f["propulsion/engine[1]/set-running"] = 0
         f.run_ic()
@@ -1510,6 +1822,59 @@ class A320IFRSim:
         """Engage or release the parking brake."""
         self.brakes.set_parking_brake(on)
 
+    @property
+    def nav_db_version(self) -> str:
+        """Version of the navigation database in use."""
+        return self.nav_db.version
+
+    @property
+    def nav_db_reloading(self) -> bool:
+        """True while a database passed to :meth:`reload_nav_db` is pending."""
+        return self._pending_nav_db is not None
+
+    def reload_nav_db(self, nav_db: NavDatabase | None = None) -> None:
+        """Replace the navigation database without interrupting the flight.
+
+        Without *nav_db* the current database files are loaded again on a
+        background thread. The first :meth:`step` after loading finishes
+        swaps the new database into the simulation and the FMS; until then
+        the old one stays in use. Route waypoints and the tuned ILS keep
+        the coordinates they were resolved with. A failed load leaves the
+        old database active and its message in :attr:`nav_db_error`.
+        """
+        if nav_db is None:
+            nav_db = self.nav_db.reopen()
+        self._pending_nav_db = nav_db
+
+    def _load_default_route(self) -> None:
+        idents = self._default_route
+        self._default_route = None
+        fms = self.fms
+        if fms.version != self._default_route_version or fms.waypoints:
+            return
+        try:
+            self.nav_db.wait()
+        except Exception as exc:
+            self.nav_db_error = str(exc)
+            logger.error("Navigation database failed to load: %s", exc)
+            return
+        try:
+            fms.load_route_by_idents(list(idents))
+        except ValueError as exc:
+            logger.warning("Default route not loaded: %s", exc)
+
+    def _swap_nav_db(self) -> None:
+        nav_db = self._pending_nav_db
+        self._pending_nav_db = None
+        try:
+            nav_db.wait()
+        except Exception as exc:
+            self.nav_db_error = str(exc)
+            return
+        self.nav_db_error = None
+        self.nav_db = nav_db
+        self.fms.nav_db = nav_db
+
     def set_ils_frequency(self, freq_mhz: float) -> None:
         """Tune the ILS system to a new frequency if available."""
         data = self.nav_db.lookup_ils(freq_mhz)
@@ -1518,15 +1883,240 @@ class A320IFRSim:
         lat, lon, hdg, alt = data
         self.ils = ILSSystem(self.fdm, lat, lon, hdg, alt)
         self.autopilot.ils = self.ils
+        self.profiler.retarget("ils.update", self.ils, "update")
+
+    def profile_targets(self) -> dict:
+        """Return the subsystem methods timed by :attr:`profiler`."""
+        ap = self.autopilot
+        targets = {
+            "sim.step": (self, "step"),
+            "fdm.run": (self.fdm, "run"),
+            "failures.advance": (self.failures, "advance"),
+            "autopilot.update": (ap, "update"),
+            "autopilot.manage_systems": (ap, "_manage_systems"),
+            "autothrottle.update": (ap.autothrottle, "update"),
+            "engines.update": (self.engines, "update"),
+        }
+        for name in (
+            "environment",
+            "starter",
+            "pitot",
+            "ils",
+            "nav",
+            "systems",
+            "brakes",
+            "anti_ice",
+            "wing_ice",
+            "electrics",
+            "bleed",
+            "pressurization",
+            "cabin_temp",
+            "fuel",
+            "oxygen",
+            "fire_suppr",
+            "stall_warning",
+            "gpws",
+            "overspeed",
+            "weather_radar",
+            "tcas",
+        ):
+            targets[f"{name}.update"] = (getattr(self, name), "update")
+        return targets
+
+    def set_profiling(self, enabled: bool) -> None:
+        """Turn per-subsystem timing on or off, see :meth:`profile_targets`."""
+        if enabled:
+            self.profiler.enable(self.profile_targets())
+        else:
+            self.profiler.disable()
+
+    def subscribe(self, fields) -> int:
+        """Limit the optional work of :meth:`step` to *fields* and return a token.
+
+        Subscriptions of several consumers are combined. Only the output
+        groups of ``step_frame.OUTPUT_GROUPS`` touched by a subscribed field
+        are read and packed; the fields of the other groups stay None. Every
+        simulated system keeps updating at its scheduled rate, so its state
+        is current whenever a consumer subscribes to it again.
+        """
+        token = self.outputs.subscribe(fields)
+        self._apply_outputs()
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        """Withdraw a subscription made with :meth:`subscribe`."""
+        self.outputs.unsubscribe(token)
+        self._apply_outputs()
+
+    def _apply_outputs(self) -> None:
+        groups = output_groups(self.outputs.active)
+        frame = self.frame
+        for name, fields in OUTPUT_GROUPS.items():
+            if name not in groups:
+                frame.clear(fields)
+        if "engines" in groups and frame.egt is None:
+            frame.egt = [0.0] * len(frame.n1)
+        self.autopilot.output_groups = groups
+
+    def reseed(self, seed) -> None:
+        """Switch to a new random stream, e.g. for one branch of a scenario."""
+        self.rng.seed(seed)
+        self.failures.reseed(self.rng.getrandbits(64))
+
+    def clone(self, seed=None) -> "A320IFRSim":
+        """Return an independent copy of the simulation at its current point.
+
+        The copy loads its own JSBSim model but shares the nav database and
+        starts from :meth:`save_state`, so the engine start and any other
+        warm-up are not repeated. With *seed* the copy continues on its own
+        random stream, otherwise it replays the random draws of the original.
+        """
+        dt = self.fdm.get_delta_t()
+        other = A320IFRSim(
+            self.root_dir,
+            dt,
+            weight_lbs=self.weight_lbs,
+            nav_db=self.nav_db,
+            realtime_policy=self.realtime.policy,
+            fdm=FakeFDM(dt) if isinstance(self.fdm.exec, FakeFDM) else None,
+        )
+        other.restore_state(self.save_state())
+        if seed is not None:
+            other.reseed(seed)
+        return other
+
+    def _stateful(self) -> dict:
+        """Return the named components whose plain attributes form the state."""
+        parts = {
+            "sim": self,
+            "systems": self.systems,
+            "hydraulics": self.systems.hydraulics,
+            "rat": self.rat,
+            "electrics": self.electrics,
+            "fuel": self.fuel,
+            "bleed": self.bleed,
+            "starter": self.starter,
+            "environment": self.environment,
+            "pitot": self.pitot,
+            "brakes": self.brakes,
+            "autobrake": self.autobrake,
+            "tcas": self.tcas,
+            "anti_ice": self.anti_ice,
+            "wing_ice": self.wing_ice,
+            "pressurization": self.pressurization,
+            "cabin_temp": self.cabin_temp,
+            "oxygen": self.oxygen,
+            "stall_warning": self.stall_warning,
+            "gpws": self.gpws,
+            "overspeed": self.overspeed,
+            "weather_radar": self.weather_radar,
+            "fire_suppr": self.fire_suppr,
+            "master_caution": self.master_caution,
+            "nav": self.nav,
+            "ils": self.ils,
+            "scheduler": self.scheduler,
+            "autopilot": self.autopilot,
+            "autothrottle": self.autopilot.autothrottle,
+            "autothrottle_pid": self.autopilot.autothrottle.pid,
+            "alt_pid": self.autopilot.alt_pid,
+            "vs_pid": self.autopilot.vs_pid,
+            "hdg_pid": self.autopilot.hdg_pid,
+            "yaw_pid": self.autopilot.yaw_pid,
+        }
+        for i, eng in enumerate(self.engines.engines):
+            parts[f"engine{i}"] = eng
+            parts[f"engine{i}_oil"] = eng.oil
+        return parts
+
+    def _fdm_direct_props(self) -> list[str]:
+        props = list(FDM_STATE_DIRECT)
+        for eng in self.engines.engines:
+            props.append(eng._prop("n1"))
+            props.append(eng._prop("n2"))
+        return props
+
+    def save_state(self) -> bytes:
+        """Return a compact snapshot of the complete simulation state.
+
+        The blob holds the FDM state vector, fuel and surface positions, the
+        state of every subsystem, the random streams and the pending failure
+        events. Restoring it with :meth:`restore_state` on a simulation built
+        with the same aircraft and options continues the run from this point.
+        Blobs are pickled, so only restore data from trusted sources.
+        """
+        fdm = self.fdm
+        state = {
+            "version": STATE_VERSION,
+            "sim_time": fdm.get_sim_time(),
+            "fdm_ic": {ic: fdm[src] for ic, src in FDM_STATE_IC.items()},
+            "fdm": {path: fdm[path] for path in self._fdm_direct_props()},
+            "fuel_used": [
+                self.fuel.used_0_prop.get(),
+                self.fuel.used_1_prop.get(),
+            ],
+            "components": {
+                name: _plain_attrs(obj) for name, obj in self._stateful().items()
+            },
+            "rng": self.rng.getstate(),
+            "failures": self.failures.get_state(),
+        }
+        return zlib.compress(pickle.dumps(state, pickle.HIGHEST_PROTOCOL))
+
+    def restore_state(self, blob: bytes) -> None:
+        """Resume the simulation from a blob returned by :meth:`save_state`.
+
+        The FDM is re-initialised from the saved state vector, so the
+        restored trajectory matches the original to the precision of
+        ``run_ic()`` rather than bit for bit.
+        """
+        state = pickle.loads(zlib.decompress(blob))
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported state version: {state.get('version')}")
+        fdm = self.fdm
+        for ic, value in state["fdm_ic"].items():
+            fdm[ic] = value
+        fdm.run_ic()
+        fdm.set_sim_time(state["sim_time"])
+        for path, value in state["fdm"].items():
+            if value is not None:
+                fdm.exec.set_property_value(path, value)
+
+        parts = self._stateful()
+        for name, attrs in state["components"].items():
+            obj = parts.get(name)
+            if obj is None:
+                continue
+            for attr, value in attrs.items():
+                setattr(obj, attr, value)
+        # JSBSim restarts its fuel-used counters at run_ic(); keep the
+        # per-frame fuel flow continuous across the restore.
+        fuel = self.fuel
+        saved_0, saved_1 = state["fuel_used"]
+        fuel.prev_used_0 += fuel.used_0_prop.get() - saved_0
+        fuel.prev_used_1 += fuel.used_1_prop.get() - saved_1
+
+        self.rng.setstate(state["rng"])
+        self.failures.set_state(state["failures"])
+        # The route was replaced, invalidate pages cached against it
+        self.fms.version += 1
+        fdm.resync()
 
     def step(self, real_time: bool = True):
         """Advance the simulation by one time step.
 
-        When *real_time* is True (the default) the function will block so
-        that the simulated time matches real elapsed time."""
+        When *real_time* is True (the default) the function will block on
+        :attr:`realtime` so that the simulated time matches real elapsed
+        time. The outputs are returned in :attr:`frame`, the same
+        :class:`StepFrame` every call; use ``frame.as_dict()`` to keep a
+        copy beyond the next step. See :meth:`subscribe` to skip outputs
+        that are not needed."""
+        if self._pending_nav_db is not None and self._pending_nav_db.loaded:
+            self._swap_nav_db()
+        if self._default_route is not None and self.nav_db.loaded:
+            self._load_default_route()
         dt = self.fdm.get_delta_t()
-        start = time.perf_counter()
         self.time_s += dt
+        self.failures.advance(dt)
         self.environment.update(dt)
         self.starter.update(dt)
         if (
@@ -1534,176 +2124,180 @@ class A320IFRSim:
             and self.starter.state == "running"
         ):
             self.starter.request_start()
-        (
-            alt,
-            speed,
-            psi,
-            pitch_cmd,
-            aileron_cmd,
-            throttle_cmd,
-            n1_list,
-            pressure,
-            hyd_demand,
-            anti_ice_on,
-            ice_accum,
-            wing_anti_ice_on,
-            wing_ice_accum,
-            nav_dist,
-            brake_temp,
-            autobrake_active,
-            oil_press,
-            oil_temp,
-            egt_list,
-            loc_dev,
-            gs_dev,
-            ils_dist,
-            flap_ok,
-            gear_ok,
-            _lat_mode,
-        ) = self.autopilot.update()
-        pitch_deg = self.fdm.get_property_value("attitude/pitch-deg")
-        roll_deg = self.fdm.get_property_value("attitude/roll-deg")
+        frame = self.autopilot.update()
+        groups = self.autopilot.output_groups
+        n1_list = frame.n1
         n1_avg = sum(n1_list) / len(n1_list)
-        elec = self.electrics.update(n1_avg > 0.5, hyd_demand + 0.1, dt)
-        cabin_alt, cabin_diff, bleed_press = self.pressurization.update(dt)
-        cabin_temp = self.cabin_temp.update(dt)
-        fuel_data = self.fuel.update()
-        left_fuel = fuel_data["left_lbs"]
-        right_fuel = fuel_data["right_lbs"]
-        oxygen = self.oxygen.update(cabin_alt, dt)
-        self.fire_suppr.update(dt)
-        fire = self.engines.fire
-        bottles = self.fire_suppr.bottles_left()
-        stall = self.stall_warning.update()
-        gpws = self.gpws.update()
-        overspeed = self.overspeed.update()
-        radar_alert = self.weather_radar.update()
-        tcas_alert = self.tcas.update()
-        fuel = fuel_data["total_lbs"]
-        flap = self.fdm.get_property_value("fcs/flap-pos-norm")
-        gear = self.fdm.get_property_value("gear/gear-pos-norm")
-        vs_fpm = self.fdm.get_property_value("velocities/h-dot-fps") * 60.0
-        outside_temp = self.environment.temperature_c
-        precip_intensity = self.environment.precip
+        charge = self.electrics.update(
+            n1_avg > 0.5, self.autopilot.hyd_demand + 0.1, dt
+        )
+        # Bleed air feeds the engine starter so it is kept at full rate
+        bleed_press = self.bleed.update()
+        tick = self.scheduler.tick
+        slow_dt = tick("pressurization", dt)
+        if slow_dt:
+            self.pressurization.update(slow_dt)
+        cabin_alt = self.pressurization.cabin_alt
+        slow_dt = tick("cabin_temp", dt)
+        if slow_dt:
+            self.cabin_temp.update(slow_dt)
+        slow_dt = tick("fuel", dt)
+        if slow_dt:
+            self.fuel.update(slow_dt)
+        slow_dt = tick("oxygen", dt)
+        if slow_dt:
+            self.oxygen.update(cabin_alt, slow_dt)
+        slow_dt = tick("fire_suppression", dt)
+        if slow_dt:
+            self.fire_suppr.update(slow_dt)
+        frame.engine_fire = fire = self.engines.fire
+        if tick("warnings", dt):
+            self.stall_warning.update()
+            self.gpws.update()
+            self.overspeed.update()
+        frame.stall_warning = stall = self.stall_warning.active
+        frame.gpws_warning = gpws = self.gpws.active
+        frame.overspeed_warning = overspeed = self.overspeed.active
+        frame.tcas_alert = self.tcas.update()
+        frame.time_s = self.time_s
+        if tick("weather_radar", dt):
+            self.weather_radar.update()
+        if "environment" in groups:
+            frame.weather_radar = self.weather_radar.active
+            frame.outside_temp_c = self.environment.temperature_c
+            frame.precip_intensity = self.environment.precip
+        if "systems" in groups:
+            frame.elec_charge = charge
+            frame.bleed_press = bleed_press
+            frame.rat_deployed = self.electrics.rat_deployed()
+        if "cabin" in groups:
+            frame.cabin_altitude_ft = cabin_alt
+            frame.cabin_diff_psi = self.pressurization.diff
+            frame.cabin_temp_c = self.cabin_temp.cabin_temp
+            frame.oxygen_level = self.oxygen.level
+        if "fuel" in groups:
+            fuel_data = self.fuel.last
+            frame.fuel_lbs = fuel_data["total_lbs"]
+            frame.fuel_left_lbs = fuel_data["left_lbs"]
+            frame.fuel_right_lbs = fuel_data["right_lbs"]
+            frame.fuel_flow_lbs_hr_eng1 = fuel_data["flow0_pph"]
+            frame.fuel_flow_lbs_hr_eng2 = fuel_data["flow1_pph"]
+            frame.apu_flow_lbs_hr = fuel_data["apu_flow_pph"]
+            frame.crossfeed = fuel_data["crossfeed"]
+        if "engines" in groups:
+            frame.fire_bottles = self.fire_suppr.bottles_left()
+        if "attitude" in groups:
+            frame.pitch_deg = self.pitch_prop.get()
+            frame.roll_deg = self.roll_prop.get()
+            frame.vs_fpm = self.vs_prop.get() * 60.0
+        if "controls" in groups:
+            frame.flap = self.flap_pos_prop.get()
+            frame.gear = self.gear_pos_prop.get()
+            frame.speedbrake = self.systems.speedbrake
+            frame.parking_brake = self.brakes.parking_brake
 
         # Update master caution status
         self.master_caution.set_warning("stall", stall)
         self.master_caution.set_warning("gpws", gpws)
         self.master_caution.set_warning("overspeed", overspeed)
         self.master_caution.set_warning("fire", fire)
-        caution = self.master_caution.is_active()
+        frame.master_caution = self.master_caution.is_active()
         self.fdm.run()
-        elapsed = time.perf_counter() - start
         if real_time:
-            delay = dt - elapsed
-            if delay > 0:
-                time.sleep(delay)
-        return {
-            "altitude_ft": alt,
-            "speed_kt": speed,
-            "heading_deg": psi,
-            "vs_fpm": vs_fpm,
-            "pitch_cmd": pitch_cmd,
-            "aileron_cmd": aileron_cmd,
-            "pitch_deg": pitch_deg,
-            "roll_deg": roll_deg,
-            "throttle_cmd": throttle_cmd,
-            "n1": n1_list,
-            "flap": flap,
-            "gear": gear,
-            "speedbrake": self.systems.speedbrake,
-            "hyd_press": pressure,
-            "elec_charge": elec,
-            "anti_ice_on": anti_ice_on,
-            "ice_accum": ice_accum,
-            "wing_anti_ice_on": wing_anti_ice_on,
-            "wing_ice_accum": wing_ice_accum,
-            "cabin_altitude_ft": cabin_alt,
-            "cabin_diff_psi": cabin_diff,
-            "cabin_temp_c": cabin_temp,
-            "bleed_press": bleed_press,
-            "fuel_lbs": fuel,
-            "fuel_left_lbs": left_fuel,
-            "fuel_right_lbs": right_fuel,
-            "fuel_flow_lbs_hr_eng1": fuel_data["flow0_pph"],
-            "fuel_flow_lbs_hr_eng2": fuel_data["flow1_pph"],
-            "apu_flow_lbs_hr": fuel_data["apu_flow_pph"],
-            "crossfeed": fuel_data["crossfeed"],
-            "oxygen_level": oxygen,
-            "stall_warning": stall,
-            "gpws_warning": gpws,
-            "overspeed_warning": overspeed,
-            "weather_radar": radar_alert,
-            "nav_dist_nm": nav_dist,
-            "ils_dist_nm": ils_dist,
-            "loc_dev_deg": loc_dev,
-            "gs_dev_ft": gs_dev,
-            "brake_temp": brake_temp,
-            "autobrake_active": autobrake_active,
-            "oil_press": oil_press,
-            "oil_temp": oil_temp,
-            "egt": egt_list,
-            "engine_fire": fire,
-            "fire_bottles": bottles,
-            "rat_deployed": self.electrics.rat_deployed(),
-            "flap_operable": self.systems.flap_operable,
-            "gear_operable": self.systems.gear_operable,
-            "tcas_alert": tcas_alert,
-            "master_caution": caution,
-            "parking_brake": self.brakes.parking_brake,
-            "outside_temp_c": outside_temp,
-            "precip_intensity": precip_intensity,
-            "time_s": self.time_s,
-        }
+            self.realtime.wait()
+        return frame
 
     def run(self, steps=600, real_time: bool = True):
-        """Run the simulation for a number of steps."""
-        for i in range(steps):
-            loop_start = time.perf_counter()
-            data = self.step(real_time=False)
-            if i % 50 == 0:
-                tcas_str = "NONE"
-                if data["tcas_alert"] is not None:
-                    t = data["tcas_alert"]
-                    tcas_str = f"{t['bearing_deg']:.0f}deg {t['distance_nm']:.1f}nm"
-                print(
-                    f"t={i*self.fdm.get_delta_t():.1f}s alt={data['altitude_ft']:.1f}ft "
-                    f"spd={data['speed_kt']:.1f}kt hdg={data['heading_deg']:.1f} "
-                    f"vs={data['vs_fpm']:.0f}fpm flap={data['flap']:.2f} "
-                    f"gear={data['gear']:.0f} thr={data['throttle_cmd']:.2f} "
-                    f"n1={'/'.join(f'{n*100:.0f}' if n<=2 else f'{n:.0f}' for n in data['n1'])}% "
-                    f"egt={'/'.join(f'{t*100:.0f}' for t in data['egt'])}% "
-                    f"hyd={data['hyd_press']:.2f} elec={data['elec_charge']:.2f} "
-                    f"fuel={data['fuel_lbs']:.0f}lb "
-                    f"cabin={data['cabin_altitude_ft']:.0f}ft "
-                    f"bleed={data['bleed_press']:.2f} "
-                    f"ff={data['fuel_flow_lbs_hr_eng1']:.0f}/{data['fuel_flow_lbs_hr_eng2']:.0f} pph "
-                    f"apu={data['apu_flow_lbs_hr']:.0f}pph "
-                    f"xfeed={'ON' if data['crossfeed'] else 'OFF'} "
-                    f"oxy={data['oxygen_level']:.2f} "
-                    f"ice={data['ice_accum']:.2f} {'ON' if data['anti_ice_on'] else 'OFF'} "
-                    f"wingice={data['wing_ice_accum']:.2f} {'ON' if data['wing_anti_ice_on'] else 'OFF'} "
-                    f"stall={'YES' if data['stall_warning'] else 'NO'} "
-                    f"gpws={'YES' if data['gpws_warning'] else 'NO'} "
-                    f"os={'YES' if data['overspeed_warning'] else 'NO'} "
-                    f"d2wp={data['nav_dist_nm']:.1f}nm "
-                    f"d2ils={data['ils_dist_nm']:.1f}nm "
-                    f"loc={data['loc_dev_deg']:.1f} "
-                    f"gs={data['gs_dev_ft']:.0f} "
-                    f"brk={data['brake_temp']:.2f} "
-                    f"autobrk={'ON' if data['autobrake_active'] else 'OFF'} "
-                    f"oil={data['oil_press']:.2f}/{data['oil_temp']:.2f} "
-                    f"fire={'YES' if data['engine_fire'] else 'NO'} "
-                    f"btl={data['fire_bottles']} "
-                    f"rat={'DEP' if data['rat_deployed'] else 'STOW'} "
-                    f"mc={'ON' if data['master_caution'] else 'OFF'} "
-                    f"tcas={tcas_str}"
-                )
-            if real_time:
-                elapsed = time.perf_counter() - loop_start
-                delay = self.fdm.get_delta_t() - elapsed
-                if delay > 0:
-                    time.sleep(delay)
+        """Run the simulation for a number of steps.
+
+        The printed fields are subscribed for the duration of the run, so
+        they are filled even if another consumer subscribed to a subset.
+        Values that are missing, e.g. the waypoint distance without a
+        route, print as ``--``.
+        """
+        self.realtime.restart()
+        token = self.subscribe(RUN_FIELDS)
+        try:
+            for i in range(steps):
+                data = self.step(real_time=False)
+                if i % 50 == 0:
+                    tcas_str = "NONE"
+                    if data["tcas_alert"] is not None:
+                        t = data["tcas_alert"]
+                        tcas_str = f"{t['bearing_deg']:.0f}deg {t['distance_nm']:.1f}nm"
+                    print(
+                        f"t={i*self.fdm.get_delta_t():.1f}s alt={data['altitude_ft']:.1f}ft "
+                        f"spd={data['speed_kt']:.1f}kt hdg={data['heading_deg']:.1f} "
+                        f"vs={data['vs_fpm']:.0f}fpm flap={data['flap']:.2f} "
+                        f"gear={data['gear']:.0f} thr={data['throttle_cmd']:.2f} "
+                        f"n1={'/'.join(f'{n*100:.0f}' if n<=2 else f'{n:.0f}' for n in data['n1'])}% "
+                        f"egt={'/'.join(f'{t*100:.0f}' for t in data['egt'])}% "
+                        f"hyd={data['hyd_press']:.2f} elec={data['elec_charge']:.2f} "
+                        f"fuel={data['fuel_lbs']:.0f}lb "
+                        f"cabin={data['cabin_altitude_ft']:.0f}ft "
+                        f"bleed={data['bleed_press']:.2f} "
+                        f"ff={data['fuel_flow_lbs_hr_eng1']:.0f}/{data['fuel_flow_lbs_hr_eng2']:.0f} pph "
+                        f"apu={data['apu_flow_lbs_hr']:.0f}pph "
+                        f"xfeed={'ON' if data['crossfeed'] else 'OFF'} "
+                        f"oxy={data['oxygen_level']:.2f} "
+                        f"ice={data['ice_accum']:.2f} {'ON' if data['anti_ice_on'] else 'OFF'} "
+                        f"wingice={data['wing_ice_accum']:.2f} {'ON' if data['wing_anti_ice_on'] else 'OFF'} "
+                        f"stall={'YES' if data['stall_warning'] else 'NO'} "
+                        f"gpws={'YES' if data['gpws_warning'] else 'NO'} "
+                        f"os={'YES' if data['overspeed_warning'] else 'NO'} "
+                        f"d2wp={_fmt(data['nav_dist_nm'], '.1f')}nm "
+                        f"d2ils={_fmt(data['ils_dist_nm'], '.1f')}nm "
+                        f"loc={_fmt(data['loc_dev_deg'], '.1f')} "
+                        f"gs={_fmt(data['gs_dev_ft'], '.0f')} "
+                        f"brk={data['brake_temp']:.2f} "
+                        f"autobrk={'ON' if data['autobrake_active'] else 'OFF'} "
+                        f"oil={data['oil_press']:.2f}/{data['oil_temp']:.2f} "
+                        f"fire={'YES' if data['engine_fire'] else 'NO'} "
+                        f"btl={data['fire_bottles']} "
+                        f"rat={'DEP' if data['rat_deployed'] else 'STOW'} "
+                        f"mc={'ON' if data['master_caution'] else 'OFF'} "
+                        f"tcas={tcas_str}"
+                    )
+                if real_time:
+                    self.realtime.wait()
+        finally:
+            self.unsubscribe(token)
+
+    def run_batch(self, steps: int, fields=BATCH_FIELDS) -> dict:
+        """Run *steps* frames as fast as possible and return columnar outputs.
+
+        No real-time pacing or console output takes place. Each requested
+        step field is written into a preallocated NumPy array with one row
+        per frame; per-engine fields such as ``n1`` get one column per
+        engine. Missing values (e.g. ``nav_dist_nm`` without a route) are
+        stored as NaN, flags as 0.0/1.0 and ``tcas_alert`` as an alert flag.
+        The requested fields are subscribed for the duration of the batch.
+        """
+        import numpy as np
+
+        n_engines = len(self.engines.engines)
+        columns = {}
+        for name in fields:
+            if name in ENGINE_FIELDS:
+                columns[name] = np.empty((steps, n_engines), dtype=np.float64)
+            else:
+                columns[name] = np.empty(steps, dtype=np.float64)
+        nan = math.nan
+        items = list(columns.items())
+        token = self.subscribe(columns)
+        try:
+            for i in range(steps):
+                data = self.step(real_time=False)
+                for name, col in items:
+                    value = data[name]
+                    if name == "tcas_alert":
+                        value = value is not None
+                    elif value is None:
+                        value = nan
+                    col[i] = value
+        finally:
+            self.unsubscribe(token)
+        return columns
 
 
 if __name__ == "__main__":
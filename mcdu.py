@@ -2,17 +2,27 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from a320_systems import FlightManagementSystem
 
 
 class MCDU:
-    """Lightweight wrapper around the :class:`FlightManagementSystem`."""
+    """Lightweight wrapper around the :class:`FlightManagementSystem`.
+
+    Pages are rendered on request and cached. A cached page is reused until
+    the route changes (``fms.version``), the active waypoint changes or the
+    distance it shows changes in its displayed tenth of a NM, so polling all pages
+    every frame does not reformat a long route. Returned pages and flight
+    plans are shared snapshots and must not be modified.
+    """
 
     def __init__(self, fms: FlightManagementSystem) -> None:
         self.fms = fms
         self.pages = ["idx", "f-plan", "prog", "init"]
+        # page name -> (cache key, lines)
+        self._cache: dict[str, tuple] = {}
+        self._plan: tuple | None = None
 
     def load_route(self, idents: List[str]) -> None:
         """Load a new flight plan by waypoint identifiers."""
@@ -22,18 +32,30 @@ class MCDU:
         """Append a waypoint to the current flight plan."""
         if not self.fms.nav_db:
             raise ValueError("Navigation database not configured")
-        coords = self.fms.nav_db.lookup(ident)
-        if not coords:
-            raise ValueError(f"Unknown fix identifier: {ident}")
+        coords = self.fms.resolve(ident, self.fms.last_position())
         self.fms.add_waypoint(coords[0], coords[1], ident=ident)
 
+    def complete_ident(self, prefix: str, limit: int = 20) -> List[str]:
+        """Return fix identifiers starting with *prefix* for scratchpad entry."""
+        if not self.fms.nav_db:
+            return []
+        return self.fms.nav_db.complete(prefix, limit)
+
     def clear_route(self) -> None:
         """Remove all waypoints from the flight plan."""
         self.fms.load_route([])
 
-    def flight_plan(self) -> List[tuple]:
+    def flight_plan(self) -> Tuple[tuple, ...]:
         """Return the current flight plan waypoints."""
-        return list(self.fms.waypoints)
+        key = self._route_key()
+        if self._plan is None or self._plan[0] != key:
+            self._plan = (key, tuple(tuple(wp) for wp in self.fms.waypoints))
+        return self._plan[1]
+
+    def _route_key(self) -> tuple:
+        # The list identity and length also catch edits that bypass the FMS
+        waypoints = self.fms.waypoints
+        return (self.fms.version, id(waypoints), len(waypoints))
 
     def active_waypoint(self) -> Optional[tuple]:
         """Return the active waypoint if any."""
@@ -66,6 +88,28 @@ class MCDU:
         lname = name.lower()
         if lname not in self.pages:
             raise ValueError(f"Unknown page: {name}")
+        key = self._page_key(lname)
+        cached = self._cache.get(lname)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        lines = self._render(lname)
+        self._cache[lname] = (key, lines)
+        return lines
+
+    def _page_key(self, lname: str) -> tuple:
+        """Return the inputs a page depends on, distances as they are displayed."""
+        if lname == "idx":
+            return (tuple(self.pages),)
+        key = (self._route_key(), self.fms.nav.index)
+        if lname == "prog":
+            dist = self.fms.nav.distance_to_waypoint()
+            key += (round(dist, 1) if dist is not None else None,)
+        elif lname == "init":
+            rem = self.fms.nav.remaining_distance()
+            key += (round(rem, 1) if rem is not None else None,)
+        return key
+
+    def _render(self, lname: str) -> List[str]:
         if lname == "idx":
             lines = ["INDEX"]
             for p in self.pages:
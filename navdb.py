@@ -1,95 +1,703 @@
-"""Simple navigation database loader."""
+"""Simple navigation database loader.
+
+The CSV files are compiled once into a binary cache (``navdb.navbin`` next
+to the waypoint file by default). Airports and waypoints share one table
+of fixes, ILS entries have their own. Each table is stored columnar: the
+distinct idents sorted in one byte string, the row range of each ident, a
+type code per row and packed float64 columns. Later loads memory-map the
+cache instead of parsing the CSVs, so startup no longer depends on the
+size of the database and every simulator process on a host shares the
+same page-cache pages. The cache records the modification time and size
+of each source file and is rebuilt automatically when a CSV changes.
+"""
 
 from __future__ import annotations
 
 import csv
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import NamedTuple, Tuple
+
+from geodesy import GeoPoint, bearing_distance_from
+from spatial_index import SpatialIndex
+
+CACHE_NAME = "navdb.navbin"
+CACHE_VERSION = 3
+
+_MAGIC = b"NAVDBBIN"
+_BYTE_ORDER = 0x01020304
+_HEADER = struct.Struct("<8sIII")  # magic, version, byte-order marker, tables
+_STAMP = struct.Struct("<qq")  # source mtime in ns and size, -1 when absent
+# name, rows, distinct idents, columns, hash slots and the offsets of the
+# ident offsets, ident bytes, ident row starts, type codes, values and
+# ident hash table
+_TABLE = struct.Struct("<8sIIIIQQQQQQ")
+
+# Table names in file order.
+_TABLES = ("fixes", "ils")
+
+# Kinds of entries returned by the spatial queries.
+AIRPORT = "airport"
+WAYPOINT = "waypoint"
+ILS = "ils"
+
+# Type codes of the rows in the fixes table; airports sort first.
+_FIX_CODES = {AIRPORT: 0, WAYPOINT: 1}
+
+# NavDatabase attributes assigned once the tables are loaded.
+_LOADED_ATTRS = frozenset(
+    ("_buf", "_fixes", "_ils", "_kinds", "airports", "waypoints", "ils")
+)
+
+
+class NavFix(NamedTuple):
+    """An entry found by a spatial query; ILS idents are the frequency."""
+
+    kind: str
+    ident: str
+    lat: float
+    lon: float
+    distance_nm: float
+
+
+def _ils_ident(freq_mhz: float) -> str:
+    return f"{round(freq_mhz, 2):.2f}"
+
+
+def _read_fixes(path: str | Path, code: int) -> list:
+    """Return ``(ident, code, (lat, lon))`` rows of an airport or waypoint CSV."""
+    rows = []
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            try:
+                lat = float(
+                    row.get("lat_deg")
+                    or row.get("latitude_deg")
+                    or row.get("LAT_DEG")
+                )
+                lon = float(
+                    row.get("lon_deg")
+                    or row.get("longitude_deg")
+                    or row.get("LON_DEG")
+                )
+            except (TypeError, ValueError):
+                continue
+            ident = row.get("ident", "").strip().upper()
+            if ident:
+                rows.append((ident, code, (lat, lon)))
+    return rows
+
+
+def _read_ils(path: str | Path) -> list:
+    """Return ``(frequency ident, 0, (lat, lon, hdg, alt))`` rows of an ILS CSV."""
+    rows = []
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            try:
+                freq = float(row.get("freq_mhz"))
+                lat = float(row.get("lat_deg"))
+                lon = float(row.get("lon_deg"))
+                hdg = float(row.get("heading_deg"))
+                alt = float(row.get("alt_ft", 0.0))
+            except (TypeError, ValueError):
+                continue
+            rows.append((_ils_ident(freq), 0, (lat, lon, hdg, alt)))
+    return rows
+
+
+def _stamp(path: str | Path | None) -> tuple[int, int]:
+    if path is None:
+        return (-1, -1)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return (-1, -1)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _pad(n: int) -> int:
+    return -n % 8
+
+
+def _compile(tables, stamps) -> bytes:
+    """Serialize ``(name, ncols, rows)`` tables into the cache format."""
+    header = _HEADER.pack(_MAGIC, CACHE_VERSION, _BYTE_ORDER, len(tables))
+    header += b"".join(_STAMP.pack(*s) for s in stamps)
+    pos = len(header) + _TABLE.size * len(tables)
+    pos += _pad(pos)
+    directory = []
+    chunks = []
+    for name, ncols, rows in tables:
+        # A stable sort keeps duplicate idents of one type in file order
+        rows = sorted(rows, key=lambda r: (r[0], r[1]))
+        # Each distinct ident is stored once with the first row using it
+        idents = []
+        runs = array("I")
+        previous = None
+        for i, (ident, _, _) in enumerate(rows):
+            if ident != previous:
+                idents.append(ident.encode())
+                runs.append(i)
+                previous = ident
+        runs.append(len(rows))
+        offsets = array("I", [0])
+        total = 0
+        for raw in idents:
+            total += len(raw)
+            offsets.append(total)
+        codes = bytes(r[1] for r in rows)
+        values = array("d")
+        for col in range(ncols):
+            values.extend(r[2][col] for r in rows)
+        # Open-addressing table of ident numbers plus one, half full at most
+        slots = 8
+        while slots < 2 * len(idents):
+            slots *= 2
+        hashes = array("I", [0]) * slots
+        for j, raw in enumerate(idents):
+            h = zlib.crc32(raw) & (slots - 1)
+            while hashes[h]:
+                h = (h + 1) & (slots - 1)
+            hashes[h] = j + 1
+        blobs = (
+            offsets.tobytes(),
+            b"".join(idents),
+            runs.tobytes(),
+            codes,
+            values.tobytes(),
+            hashes.tobytes(),
+        )
+        starts = []
+        for blob in blobs:
+            starts.append(pos)
+            chunks.append(blob + bytes(_pad(len(blob))))
+            pos += len(chunks[-1])
+        directory.append(
+            _TABLE.pack(name.encode(), len(rows), len(idents), ncols, slots, *starts)
+        )
+    head = header + b"".join(directory)
+    return head + bytes(_pad(len(head))) + b"".join(chunks)
+
+
+def _write_cache(path: Path, data: bytes) -> None:
+    # Concurrent builders, also threads of one process, each write a
+    # private file and the last rename wins, so readers never see a
+    # partially written cache.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _map_cache(path: Path, stamps):
+    """Return the memory-mapped cache, or None when missing, stale or damaged."""
+    try:
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    size = _HEADER.size + _STAMP.size * len(stamps)
+    if len(buf) < size:
+        buf.close()
+        return None
+    magic, version, order, _ = _HEADER.unpack_from(buf)
+    cached = [
+        _STAMP.unpack_from(buf, _HEADER.size + i * _STAMP.size)
+        for i in range(len(stamps))
+    ]
+    if (
+        (magic, version, order) != (_MAGIC, CACHE_VERSION, _BYTE_ORDER)
+        or cached != list(stamps)
+        or not _layout_ok(buf, size)
+    ):
+        buf.close()
+        return None
+    return buf
+
+
+def _layout_ok(buf, base: int) -> bool:
+    """Check that the tables fill the file exactly as :func:`_compile` lays them out.
+
+    A truncated or partially overwritten cache then fails here and is
+    rebuilt instead of reading past its end or returning garbage rows.
+    """
+    ntables = _HEADER.unpack_from(buf)[3]
+    pos = base + _TABLE.size * ntables
+    if ntables != len(_TABLES) or len(buf) < pos:
+        return False
+    pos += _pad(pos)
+    for i, name in enumerate(_TABLES):
+        (
+            table,
+            count,
+            distinct,
+            ncols,
+            slots,
+            offsets_pos,
+            idents_pos,
+            runs_pos,
+            codes_pos,
+            values_pos,
+            hashes_pos,
+        ) = _TABLE.unpack_from(buf, base + i * _TABLE.size)
+        if table.rstrip(b"\0") != name.encode() or offsets_pos != pos:
+            return False
+        # The ident bytes end where the last ident offset points
+        end = offsets_pos + 4 * distinct
+        if end + 4 > len(buf):
+            return False
+        (ident_bytes,) = struct.unpack_from("<I", buf, end)
+        chunks = (
+            (offsets_pos, 4 * (distinct + 1)),
+            (idents_pos, ident_bytes),
+            (runs_pos, 4 * (distinct + 1)),
+            (codes_pos, count),
+            (values_pos, 8 * count * ncols),
+            (hashes_pos, 4 * slots),
+        )
+        for start, length in chunks:
+            if start != pos:
+                return False
+            pos += length + _pad(length)
+    return pos == len(buf)
+
+
+def _edits(word: str, alphabet: str):
+    """Yield the strings one insertion, deletion, substitution or swap away."""
+    for i in range(len(word) + 1):
+        head, tail = word[:i], word[i:]
+        for c in alphabet:
+            yield head + c + tail
+        if tail:
+            yield head + tail[1:]
+            for c in alphabet:
+                yield head + c + tail[1:]
+        if len(tail) > 1:
+            yield head + tail[1] + tail[0] + tail[2:]
+
+
+class _Table:
+    """Columnar rows grouped by ident, read from a shared buffer.
+
+    Row *i* has the float columns ``values[c * count + i]`` and the type
+    code ``codes[i]``. The rows of distinct ident *j* are
+    ``runs[j]:runs[j + 1]``, so each ident is stored once however many
+    fixes reuse it. Exact idents are found through a hash table, prefixes
+    by binary search over the sorted idents.
+    """
+
+    __slots__ = (
+        "count",
+        "distinct",
+        "ncols",
+        "codes",
+        "_buf",
+        "_base",
+        "_offsets",
+        "_runs",
+        "_values",
+        "_hashes",
+        "_alphabet",
+    )
+
+    def __init__(self, buf, view: memoryview, entry: tuple) -> None:
+        (
+            _,
+            count,
+            distinct,
+            ncols,
+            slots,
+            offsets_pos,
+            idents_pos,
+            runs_pos,
+            codes_pos,
+            values_pos,
+            hashes_pos,
+        ) = entry
+        self.count = count
+        self.distinct = distinct
+        self.ncols = ncols
+        self._buf = buf
+        self._base = idents_pos
+        self._offsets = view[offsets_pos : offsets_pos + 4 * (distinct + 1)].cast("I")
+        self._runs = view[runs_pos : runs_pos + 4 * (distinct + 1)].cast("I")
+        self.codes = view[codes_pos : codes_pos + count]
+        self._values = view[values_pos : values_pos + 8 * count * ncols].cast("d")
+        self._hashes = view[hashes_pos : hashes_pos + 4 * slots].cast("I")
+        self._alphabet: str | None = None
+
+    def _key(self, j: int) -> bytes:
+        base = self._base
+        return self._buf[base + self._offsets[j] : base + self._offsets[j + 1]]
+
+    def ident(self, i: int) -> str:
+        """Return the ident of row *i*."""
+        return self._key(bisect_right(self._runs, i) - 1).decode()
+
+    def _lower(self, key: bytes) -> int:
+        """Return the first distinct ident not sorting before *key*."""
+        lo, hi = 0, self.distinct
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def index(self, ident: str) -> int:
+        """Return the number of the distinct *ident*, or -1 when unknown."""
+        key = ident.encode()
+        hashes = self._hashes
+        mask = len(hashes) - 1
+        h = zlib.crc32(key) & mask
+        while True:
+            j = hashes[h] - 1
+            if j < 0 or self._key(j) == key:
+                return j
+            h = (h + 1) & mask
+
+    def find(self, ident: str) -> range:
+        """Return the row range holding *ident*, empty when unknown."""
+        j = self.index(ident)
+        if j < 0:
+            return range(0)
+        return range(self._runs[j], self._runs[j + 1])
+
+    def alphabet(self) -> str:
+        """Return the ASCII characters used by the idents."""
+        if self._alphabet is None:
+            blob = self._buf[self._base : self._base + self._offsets[self.distinct]]
+            self._alphabet = "".join(chr(b) for b in sorted(set(blob)) if b < 128)
+        return self._alphabet
+
+    def with_prefix(self, prefix: str, limit: int | None = None) -> list[str]:
+        """Return up to *limit* distinct idents starting with *prefix*, sorted."""
+        key = prefix.encode()
+        start = self._lower(key)
+        # No UTF-8 encoded ident contains the byte 0xff
+        stop = self._lower(key + b"\xff")
+        if limit is not None:
+            stop = min(stop, start + limit)
+        return [self._key(j).decode() for j in range(start, stop)]
+
+    def column(self, c: int) -> memoryview:
+        return self._values[c * self.count : (c + 1) * self.count]
+
+    def row(self, i: int) -> tuple:
+        values = self._values
+        count = self.count
+        return tuple(values[c * count + i] for c in range(self.ncols))
+
+    def get(self, ident: str, code: int | None = None):
+        """Return the last row stored for *ident* with *code*, or None."""
+        for i in reversed(self.find(ident)):
+            if code is None or self.codes[i] == code:
+                return self.row(i)
+        return None
+
+    def idents(self, code: int | None = None):
+        """Yield each distinct ident with a row of *code* once, in sorted order."""
+        runs = self._runs
+        codes = self.codes
+        for j in range(self.distinct):
+            if code is None or code in codes[runs[j] : runs[j + 1]].tobytes():
+                yield self._key(j).decode()
+
+
+class _TableView(Mapping):
+    """Read-only mapping over the rows of one type code, as the former dicts."""
+
+    def __init__(self, table: _Table, code=None, to_ident=str, from_ident=str) -> None:
+        self._table = table
+        self._code = code
+        self._to_ident = to_ident
+        self._from_ident = from_ident
+
+    def __getitem__(self, key):
+        try:
+            ident = self._to_ident(key)
+        except (TypeError, ValueError):
+            raise KeyError(key) from None
+        value = self._table.get(ident, self._code)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        return map(self._from_ident, self._table.idents(self._code))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._table.idents(self._code))
 
 
 class NavDatabase:
-    """Load airport, waypoint and ILS data from CSV files."""
+    """Load airport, waypoint and ILS data from CSV files.
+
+    ``cache_file`` overrides where the compiled cache is kept; with
+    ``use_cache=False`` the CSVs are parsed and held in memory without
+    touching the disk. The ``airports``, ``waypoints`` and ``ils``
+    attributes are read-only mappings like the dicts they replace.
+
+    With ``background=True`` the constructor returns at once and the
+    tables are loaded on a daemon thread, e.g. while the flight model
+    loads. Any query made before loading finishes waits for it, and
+    :meth:`wait` re-raises an error hit by the loader.
+
+    An instance never changes once loaded. :attr:`version` identifies the
+    source files it was built from, and :meth:`reopen` loads them again,
+    e.g. after ``scripts/update_navdb.py`` replaced them.
+    """
 
     def __init__(
         self,
         airports_file: str | Path,
         waypoints_file: str | Path,
         ils_file: str | Path | None = None,
+        cache_file: str | Path | None = None,
+        use_cache: bool = True,
+        background: bool = False,
     ) -> None:
-        self.airports: Dict[str, Tuple[float, float]] = {}
-        self.waypoints: Dict[str, Tuple[float, float]] = {}
-        self.ils: Dict[float, Tuple[float, float, float, float]] = {}
-        self._load_airports(airports_file)
-        self._load_waypoints(waypoints_file)
-        if ils_file is not None and Path(ils_file).exists():
-            self._load_ils(ils_file)
-
-    def _load_airports(self, path: str | Path) -> None:
-        with open(path, newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    lat = float(
-                        row.get("lat_deg")
-                        or row.get("latitude_deg")
-                        or row.get("LAT_DEG")
-                    )
-                    lon = float(
-                        row.get("lon_deg")
-                        or row.get("longitude_deg")
-                        or row.get("LON_DEG")
-                    )
-                except (TypeError, ValueError):
-                    continue
-                ident = row.get("ident", "").strip().upper()
-                if ident:
-                    self.airports[ident] = (lat, lon)
-
-    def _load_waypoints(self, path: str | Path) -> None:
-        with open(path, newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    lat = float(
-                        row.get("lat_deg")
-                        or row.get("latitude_deg")
-                        or row.get("LAT_DEG")
-                    )
-                    lon = float(
-                        row.get("lon_deg")
-                        or row.get("longitude_deg")
-                        or row.get("LON_DEG")
-                    )
-                except (TypeError, ValueError):
-                    continue
-                ident = row.get("ident", "").strip().upper()
-                if ident:
-                    self.waypoints[ident] = (lat, lon)
-
-    def _load_ils(self, path: str | Path) -> None:
-        """Load ILS frequency information."""
-        with open(path, newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    freq = float(row.get("freq_mhz"))
-                    lat = float(row.get("lat_deg"))
-                    lon = float(row.get("lon_deg"))
-                    hdg = float(row.get("heading_deg"))
-                    alt = float(row.get("alt_ft", 0.0))
-                except (TypeError, ValueError):
-                    continue
-                self.ils[freq] = (lat, lon, hdg, alt)
-
-    def lookup(self, ident: str) -> Tuple[float, float] | None:
-        """Return (lat, lon) for airport or waypoint identifier."""
+        os.stat(airports_file)
+        os.stat(waypoints_file)
+        if ils_file is not None and not Path(ils_file).exists():
+            ils_file = None
+        sources = (airports_file, waypoints_file, ils_file)
+        self.sources = sources
+        # Same files, same version, in every process
+        stamps = repr([_stamp(p) for p in sources]).encode()
+        self.version = f"{zlib.crc32(stamps):08x}"
+        if cache_file is None:
+            cache_file = Path(waypoints_file).with_name(CACHE_NAME)
+        self.cache_file = Path(cache_file) if use_cache else None
+        self._spatial: dict[str, SpatialIndex] = {}
+        self._loaded = threading.Event()
+        self._error: BaseException | None = None
+        # Seconds spent loading the tables, set when loading finishes
+        self.load_seconds: float | None = None
+        if background:
+            threading.Thread(
+                target=self._load_background, args=(sources,), name="navdb-load", daemon=True
+            ).start()
+        else:
+            self._load(sources)
+            self._loaded.set()
+
+    def _load_background(self, sources) -> None:
+        try:
+            self._load(sources)
+        except BaseException as exc:  # re-raised by wait() in the caller's thread
+            self._error = exc
+        finally:
+            self._loaded.set()
+
+    def _load(self, sources) -> None:
+        start = time.perf_counter()
+        buf = self._open(sources)
+        view = memoryview(buf)
+        base = _HEADER.size + _STAMP.size * len(sources)
+        tables = {}
+        for i, name in enumerate(_TABLES):
+            entry = _TABLE.unpack_from(buf, base + i * _TABLE.size)
+            tables[name] = _Table(buf, view, entry)
+        self._buf = buf
+        self._fixes = tables["fixes"]
+        self._ils = tables["ils"]
+        self.airports = _TableView(self._fixes, _FIX_CODES[AIRPORT])
+        self.waypoints = _TableView(self._fixes, _FIX_CODES[WAYPOINT])
+        self.ils = _TableView(self._ils, None, _ils_ident, float)
+        # Table and type code of each kind of entry
+        self._kinds = {
+            AIRPORT: (self._fixes, _FIX_CODES[AIRPORT]),
+            WAYPOINT: (self._fixes, _FIX_CODES[WAYPOINT]),
+            ILS: (self._ils, None),
+        }
+        self.load_seconds = time.perf_counter() - start
+
+    def __getattr__(self, name: str):
+        # Only called for missing attributes: the tables are still loading
+        if name in _LOADED_ATTRS:
+            self.wait()
+            return object.__getattribute__(self, name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def reopen(self, background: bool = True) -> "NavDatabase":
+        """Return a new database loaded from the current source files."""
+        return NavDatabase(
+            *self.sources,
+            cache_file=self.cache_file,
+            use_cache=self.cache_file is not None,
+            background=background,
+        )
+
+    @property
+    def loaded(self) -> bool:
+        """True once the tables are available without waiting."""
+        return self._loaded.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the tables are loaded; return False on timeout."""
+        if not self._loaded.wait(timeout):
+            return False
+        if self._error is not None:
+            raise self._error
+        return True
+
+    def _open(self, sources):
+        """Return the compiled tables, rebuilding the cache when stale."""
+        stamps = [_stamp(p) for p in sources]
+        if self.cache_file is not None:
+            buf = _map_cache(self.cache_file, stamps)
+            if buf is not None:
+                return buf
+        airports, waypoints, ils = sources
+        fixes = _read_fixes(airports, _FIX_CODES[AIRPORT])
+        fixes += _read_fixes(waypoints, _FIX_CODES[WAYPOINT])
+        data = _compile(
+            [("fixes", 2, fixes), ("ils", 4, _read_ils(ils) if ils is not None else [])],
+            stamps,
+        )
+        if self.cache_file is not None:
+            try:
+                _write_cache(self.cache_file, data)
+            except OSError:
+                # Read-only data directory: keep the compiled tables in memory
+                return data
+            buf = _map_cache(self.cache_file, stamps)
+            if buf is not None:
+                return buf
+        return data
+
+    def candidates(self, ident: str) -> list[Tuple[float, float]]:
+        """Return every (lat, lon) stored for an airport or waypoint ident.
+
+        Navaid idents are reused around the world, so one ident may map to
+        several fixes; airports come first, then waypoints in file order.
+        """
         ident = ident.strip().upper()
-        if ident in self.airports:
-            return self.airports[ident]
-        if ident in self.waypoints:
-            return self.waypoints[ident]
-        return None
+        return [self._fixes.row(i) for i in self._fixes.find(ident)]
+
+    def lookup(
+        self, ident: str, near: Tuple[float, float] | None = None
+    ) -> Tuple[float, float] | None:
+        """Return (lat, lon) for airport or waypoint identifier.
+
+        An ident shared by several fixes resolves to the candidate closest
+        to *near*, e.g. the previous fix of a route. Without *near* an
+        airport wins over a waypoint and the last entry of a file wins.
+        """
+        ident = ident.strip().upper()
+        if near is None:
+            return self._fixes.get(ident, _FIX_CODES[AIRPORT]) or self._fixes.get(ident)
+        candidates = self.candidates(ident)
+        if len(candidates) <= 1:
+            return candidates[0] if candidates else None
+        origin = GeoPoint(*near)
+        return min(candidates, key=lambda c: bearing_distance_from(origin, *c)[1])
+
+    def complete(self, prefix: str, limit: int | None = None) -> list[str]:
+        """Return airport and waypoint idents starting with *prefix*, sorted."""
+        return self._fixes.with_prefix(prefix.strip().upper(), limit)
+
+    def suggest(
+        self, ident: str, near: Tuple[float, float] | None = None, limit: int = 5
+    ) -> list[str]:
+        """Return known idents one edit away from *ident*, e.g. for a typo.
+
+        An edit inserts, deletes or replaces one character or swaps two
+        adjacent ones. With *near* the suggestions are ranked by the
+        distance of their closest fix from it, otherwise alphabetically.
+        """
+        ident = ident.strip().upper()
+        fixes = self._fixes
+        found = {v for v in _edits(ident, fixes.alphabet()) if fixes.index(v) >= 0}
+        found.discard(ident)
+        if near is None:
+            return sorted(found)[:limit]
+        origin = GeoPoint(*near)
+
+        def distance(candidate: str) -> float:
+            return min(
+                bearing_distance_from(origin, *coords)[1]
+                for coords in self.candidates(candidate)
+            )
+
+        return sorted(found, key=lambda c: (distance(c), c))[:limit]
 
     def lookup_ils(self, freq_mhz: float) -> Tuple[float, float, float, float] | None:
         """Return (lat, lon, heading, alt) for an ILS frequency."""
-        return self.ils.get(round(freq_mhz, 2))
+        return self._ils.get(_ils_ident(freq_mhz))
+
+    def _spatial_index(self, kind: str) -> SpatialIndex:
+        """Return the spatial index of one kind, building it on first use."""
+        index = self._spatial.get(kind)
+        if index is None:
+            table, code = self._kinds[kind]
+            rows = None
+            if code is not None:
+                rows = [i for i, c in enumerate(table.codes) if c == code]
+            index = SpatialIndex(table.column(0), table.column(1), rows)
+            self._spatial[kind] = index
+        return index
+
+    def _query(self, kinds, search) -> list[NavFix]:
+        if kinds is None:
+            kinds = self._kinds
+        elif isinstance(kinds, str):
+            kinds = (kinds,)
+        unknown = set(kinds) - self._kinds.keys()
+        if unknown:
+            raise ValueError(f"Unknown entry kind: {', '.join(sorted(unknown))}")
+        fixes = []
+        for kind in kinds:
+            table = self._kinds[kind][0]
+            for dist, row in search(self._spatial_index(kind)):
+                lat, lon = table.row(row)[:2]
+                fixes.append(NavFix(kind, table.ident(row), lat, lon, dist))
+        fixes.sort(key=lambda fix: fix.distance_nm)
+        return fixes
+
+    def nearest(self, lat: float, lon: float, k: int = 1, kinds=None) -> list[NavFix]:
+        """Return the *k* entries closest to (*lat*, *lon*), nearest first.
+
+        *kinds* limits the search to ``"airport"``, ``"waypoint"`` and/or
+        ``"ils"`` entries.
+        """
+        return self._query(kinds, lambda index: index.nearest(lat, lon, k))[:k]
+
+    def within(self, lat: float, lon: float, radius_nm: float, kinds=None) -> list[NavFix]:
+        """Return the entries within *radius_nm* of (*lat*, *lon*), nearest first."""
+        return self._query(kinds, lambda index: index.within(lat, lon, radius_nm))
+
+    def memory_usage(self) -> dict:
+        """Return the memory held by the database in bytes.
+
+        ``tables`` is the size of the compiled tables and ``shared`` tells
+        whether they are memory-mapped from the cache, in which case all
+        processes using the cache share one copy. ``indexes`` counts the
+        spatial indexes built so far. ``private`` is what this process
+        holds on its own.
+        """
+        tables = len(self._buf)
+        shared = isinstance(self._buf, mmap.mmap)
+        indexes = sum(index.nbytes for index in self._spatial.values())
+        return {
+            "tables": tables,
+            "shared": shared,
+            "indexes": indexes,
+            "private": indexes + (0 if shared else tables),
+        }
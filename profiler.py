@@ -0,0 +1,143 @@
+"""Opt-in timing of subsystem updates in the simulation loop."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+
+
+class StepProfiler:
+    """Time named method calls and keep rolling percentiles per component.
+
+    :meth:`enable` replaces each target method with a timing wrapper stored
+    as an instance attribute; :meth:`disable` removes the wrappers again so
+    the class methods are called directly. A disabled profiler therefore
+    adds no overhead at all to the instrumented code. Timings are inclusive,
+    e.g. ``autopilot.update`` contains the subsystems it calls.
+    """
+
+    def __init__(self, window: int = 1000) -> None:
+        self.window = window
+        self._samples: dict[str, deque] = {}
+        # name -> [calls, total seconds]
+        self._totals: dict[str, list] = {}
+        # name -> (object, attribute, previous instance value or None)
+        self._installed: dict[str, tuple[object, str, object]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._installed)
+
+    def enable(self, targets: dict[str, tuple[object, str]]) -> None:
+        """Start timing ``getattr(obj, attr)`` for every ``name: (obj, attr)``."""
+        self.disable()
+        for name, (obj, attr) in targets.items():
+            self._install(name, obj, attr)
+
+    def retarget(self, name: str, obj, attr: str) -> None:
+        """Move the timing of *name* to another object, e.g. a replaced subsystem."""
+        if not self.enabled:
+            return
+        self._uninstall(name)
+        self._install(name, obj, attr)
+
+    def disable(self) -> None:
+        """Restore the original methods; collected samples are kept."""
+        for name in reversed(list(self._installed)):
+            self._uninstall(name)
+
+    def _uninstall(self, name: str) -> None:
+        entry = self._installed.pop(name, None)
+        if entry is None:
+            return
+        obj, attr, previous = entry
+        if previous is None:
+            delattr(obj, attr)
+        else:
+            setattr(obj, attr, previous)
+
+    def reset(self) -> None:
+        """Discard all collected samples."""
+        for samples in self._samples.values():
+            samples.clear()
+        for totals in self._totals.values():
+            totals[0] = 0
+            totals[1] = 0.0
+
+    def _install(self, name: str, obj, attr: str) -> None:
+        method = getattr(obj, attr)
+        samples = self._samples.setdefault(name, deque(maxlen=self.window))
+        totals = self._totals.setdefault(name, [0, 0.0])
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                samples.append(elapsed)
+                totals[0] += 1
+                totals[1] += elapsed
+
+        self._installed[name] = (obj, attr, vars(obj).get(attr))
+        setattr(obj, attr, timed)
+
+    @staticmethod
+    def _percentile(ordered: list[float], pct: float) -> float:
+        index = min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))
+        return ordered[index]
+
+    def report(self) -> list[dict]:
+        """Return per-component statistics in milliseconds, slowest first.
+
+        Percentiles and the maximum cover the last *window* calls; ``calls``
+        and ``total_ms`` accumulate since the last :meth:`reset`.
+        """
+        rows = []
+        for name, samples in self._samples.items():
+            calls, total = self._totals[name]
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            rows.append(
+                {
+                    "name": name,
+                    "calls": calls,
+                    "total_ms": total * 1000.0,
+                    "mean_ms": sum(ordered) / len(ordered) * 1000.0,
+                    "p50_ms": self._percentile(ordered, 50) * 1000.0,
+                    "p95_ms": self._percentile(ordered, 95) * 1000.0,
+                    "p99_ms": self._percentile(ordered, 99) * 1000.0,
+                    "max_ms": ordered[-1] * 1000.0,
+                }
+            )
+        rows.sort(key=lambda row: row["mean_ms"], reverse=True)
+        return rows
+
+
+class PhaseTimer:
+    """Wall-clock durations of consecutive named phases, e.g. of a constructor.
+
+    Each :meth:`mark` closes the phase that started at the previous mark
+    (or at construction) under the given name.
+    """
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def mark(self, name: str) -> None:
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + now - self._last
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    def report(self) -> list[dict]:
+        """Return ``{"name", "ms"}`` rows in phase order followed by the total."""
+        rows = [{"name": name, "ms": seconds * 1000.0} for name, seconds in self.phases.items()]
+        rows.append({"name": "total", "ms": self.total * 1000.0})
+        return rows
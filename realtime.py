@@ -0,0 +1,149 @@
+"""Deadline based real-time pacing for the simulation loop."""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_right
+
+# Histogram bucket edges in milliseconds.
+DEFAULT_BUCKETS_MS = (1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 50.0, 100.0)
+
+POLICIES = ("catch_up", "skip")
+
+
+class RealTimeClock:
+    """Release fixed-step frames at absolute ``perf_counter`` deadlines.
+
+    Call :meth:`wait` once at the end of every frame. Frame *n* is due at
+    ``epoch + n * dt``, so sleep overshoot and uneven frame times do not
+    accumulate into drift. When a frame overruns its deadline the policy
+    decides what happens next:
+
+    ``"catch_up"``
+        Keep the schedule and run the following frames without sleeping
+        until the loop is back on time. Falling more than *max_catch_up*
+        frames behind restarts the schedule from the current time.
+    ``"skip"``
+        Drop the missed deadlines and wait for the next one in the future,
+        so the simulation runs slower than real time but never bursts.
+
+    The clock starts on the first :meth:`wait`; call :meth:`restart` after
+    the loop was paused on purpose, e.g. while waiting for user input.
+    Sleeping stops *spin_s* before the deadline and the remainder is spent
+    polling the clock, which keeps release jitter well below the sleep
+    granularity of the operating system.
+    """
+
+    def __init__(
+        self,
+        dt: float,
+        policy: str = "catch_up",
+        max_catch_up: int = 5,
+        spin_s: float = 0.0005,
+        buckets_ms=DEFAULT_BUCKETS_MS,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown real-time policy: {policy}")
+        self.dt = dt
+        self.policy = policy
+        self.max_catch_up = max_catch_up
+        self.spin_s = spin_s
+        self.buckets_ms = tuple(buckets_ms)
+        self._deadline: float | None = None
+        self._released = 0.0
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Clear all timing statistics."""
+        self.frames = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.restarts = 0
+        self.max_lateness_s = 0.0
+        self.max_frame_s = 0.0
+        self.total_frame_s = 0.0
+        self.frame_hist = [0] * (len(self.buckets_ms) + 1)
+        self.lateness_hist = [0] * (len(self.buckets_ms) + 1)
+
+    def restart(self) -> None:
+        """Start a new schedule with the next frame due one step from now."""
+        self._deadline = None
+
+    def wait(self) -> float:
+        """Block until the next frame is due and return the lateness in seconds.
+
+        The lateness is how far the finished frame ran past its deadline;
+        zero when it completed in time.
+        """
+        now = time.perf_counter()
+        dt = self.dt
+        if self._deadline is None:
+            # First frame of a schedule: its start time is unknown
+            self._deadline = now + dt
+            self._released = now
+            return 0.0
+
+        frame_s = now - self._released
+        self.frames += 1
+        self.total_frame_s += frame_s
+        if frame_s > self.max_frame_s:
+            self.max_frame_s = frame_s
+        self.frame_hist[bisect_right(self.buckets_ms, frame_s * 1000.0)] += 1
+
+        lateness = now - self._deadline
+        if lateness > 0.0:
+            self.overruns += 1
+            if lateness > self.max_lateness_s:
+                self.max_lateness_s = lateness
+            self.lateness_hist[bisect_right(self.buckets_ms, lateness * 1000.0)] += 1
+            if self.policy == "skip":
+                missed = int(lateness // dt) + 1
+                self.skipped += missed
+                self._deadline += (missed + 1) * dt
+            elif lateness > self.max_catch_up * dt:
+                self.restarts += 1
+                self._deadline = now + dt
+                self._released = now
+                return lateness
+            else:
+                self._deadline += dt
+                self._released = now
+                return lateness
+        else:
+            self.lateness_hist[0] += 1
+            self._deadline += dt
+
+        # Release the next frame at the previous deadline
+        release = self._deadline - dt
+        remaining = release - self.spin_s - time.perf_counter()
+        if remaining > 0.0:
+            time.sleep(remaining)
+        while time.perf_counter() < release:
+            pass
+        self._released = time.perf_counter()
+        return max(lateness, 0.0)
+
+    def _histogram(self, counts: list[int]) -> dict[str, int]:
+        edges = self.buckets_ms
+        labels = [f"<{edges[0]:g}ms"]
+        labels += [f"{lo:g}-{hi:g}ms" for lo, hi in zip(edges, edges[1:])]
+        labels.append(f">={edges[-1]:g}ms")
+        return dict(zip(labels, counts))
+
+    def stats(self) -> dict:
+        """Return frame counts, overruns, lateness and frame-time histograms."""
+        return {
+            "policy": self.policy,
+            "dt_ms": self.dt * 1000.0,
+            "frames": self.frames,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "restarts": self.restarts,
+            "max_lateness_ms": self.max_lateness_s * 1000.0,
+            "mean_frame_ms": (
+                self.total_frame_s / self.frames * 1000.0 if self.frames else 0.0
+            ),
+            "max_frame_ms": self.max_frame_s * 1000.0,
+            "frame_ms": self._histogram(self.frame_hist),
+            "lateness_ms": self._histogram(self.lateness_hist),
+        }
@@ -0,0 +1,66 @@
+"""Multi-rate update scheduling for slow aircraft subsystems."""
+
+from __future__ import annotations
+
+# Update periods in seconds for subsystems that change on a seconds
+# timescale. Anything not listed runs at the full FDM rate.
+DEFAULT_PERIODS = {
+    "pressurization": 1.0,
+    "cabin_temp": 1.0,
+    "oxygen": 1.0,
+    "fuel": 1.0,
+    "weather_radar": 1.0,
+    "fire_suppression": 0.1,
+    "warnings": 0.1,
+}
+
+
+class SubsystemScheduler:
+    """Decide which subsystems are due for an update in the current frame.
+
+    Each subsystem declares an update period. :meth:`tick` accumulates the
+    frame time and returns the elapsed time since the last update once the
+    period has passed, or ``0.0`` when the subsystem should be skipped.
+    Every subsystem runs on its first tick so outputs are available from
+    the first frame onwards.
+    """
+
+    def __init__(self, periods: dict[str, float] | None = None) -> None:
+        self._tasks: dict[str, list] = {}
+        for name, period in (DEFAULT_PERIODS if periods is None else periods).items():
+            self.set_period(name, period)
+
+    def set_period(self, name: str, period_s: float) -> None:
+        """Register *name* or change its update period (0 = every frame)."""
+        task = self._tasks.get(name)
+        if task is None:
+            # [period, accumulated dt, update count]
+            self._tasks[name] = [max(0.0, period_s), 0.0, 0]
+        else:
+            task[0] = max(0.0, period_s)
+
+    def tick(self, name: str, dt: float) -> float:
+        """Advance *name* by *dt* and return its update dt when it is due."""
+        task = self._tasks.get(name)
+        if task is None:
+            return dt
+        elapsed = task[1] + dt
+        if task[2] and elapsed < task[0] - 1e-9:
+            task[1] = elapsed
+            return 0.0
+        task[1] = 0.0
+        task[2] += 1
+        return elapsed
+
+    def schedule(self) -> list[dict]:
+        """Return the configured periods and update counts for inspection."""
+        return [
+            {
+                "name": name,
+                "period_s": period,
+                "rate_hz": 1.0 / period if period > 0 else None,
+                "pending_s": elapsed,
+                "updates": count,
+            }
+            for name, (period, elapsed, count) in self._tasks.items()
+        ]
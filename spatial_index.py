@@ -0,0 +1,126 @@
+"""Grid index for nearest-neighbour and radius queries on positions."""
+
+from __future__ import annotations
+
+import math
+from array import array
+
+from geodesy import EARTH_RADIUS_NM
+
+# One-degree cells; a 40 NM query touches a handful of them anywhere
+# outside the polar caps.
+_LAT_CELLS = 180
+_LON_CELLS = 360
+
+# Below this many points a query checks all of them instead of the cells.
+_SCAN_ALL = 512
+
+
+class SpatialIndex:
+    """Positions bucketed into a latitude/longitude grid.
+
+    :attr:`order` lists the point indices sorted by cell and :attr:`starts`
+    holds where each cell begins in it, so a query scans only the cells
+    that can intersect the search circle. The coordinate sequences are
+    referenced, not copied, which keeps memory-mapped columns shared.
+    Queries return ``(distance_nm, index)`` pairs sorted by distance, where
+    *index* is the position of the point in *lats* and *lons*. *rows*
+    optionally restricts the index to some of these positions.
+    """
+
+    def __init__(self, lats, lons, rows=None) -> None:
+        self.lats = lats
+        self.lons = lons
+        if rows is None:
+            rows = range(len(lats))
+        # Truncation is floor for the shifted, non-negative coordinates
+        cells = [
+            min(int(lats[i] + 90.0), _LAT_CELLS - 1) * _LON_CELLS
+            + int(lons[i] + 180.0) % _LON_CELLS
+            for i in rows
+        ]
+        order = sorted(range(len(cells)), key=cells.__getitem__)
+        self.order = array("I", map(rows.__getitem__, order))
+        counts = [0] * (_LAT_CELLS * _LON_CELLS + 1)
+        for cell in cells:
+            counts[cell + 1] += 1
+        for i in range(1, len(counts)):
+            counts[i] += counts[i - 1]
+        self.starts = array("I", counts)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the index arrays."""
+        return len(self.order) * self.order.itemsize + len(self.starts) * self.starts.itemsize
+
+    def _candidates(self, lat: float, lon: float, radius_nm: float):
+        """Yield runs of point indices that may lie inside the circle."""
+        if len(self.order) <= _SCAN_ALL:
+            yield self.order
+            return
+        starts = self.starts
+        radius = radius_nm / EARTH_RADIUS_NM
+        dlat = math.degrees(radius)
+        row_lo = max(int(math.floor(lat - dlat)) + 90, 0)
+        row_hi = min(int(math.floor(lat + dlat)) + 90, _LAT_CELLS - 1)
+        cos_lat = math.cos(math.radians(lat))
+        if lat - dlat <= -90 or lat + dlat >= 90 or math.sin(radius) >= cos_lat:
+            cols = range(_LON_CELLS)
+        else:
+            dlon = math.degrees(math.asin(math.sin(radius) / cos_lat))
+            col_lo = int(math.floor(lon - dlon)) + 180
+            col_hi = int(math.floor(lon + dlon)) + 180
+            if col_hi - col_lo + 1 >= _LON_CELLS:
+                cols = range(_LON_CELLS)
+            else:
+                cols = [c % _LON_CELLS for c in range(col_lo, col_hi + 1)]
+        for row in range(row_lo, row_hi + 1):
+            base = row * _LON_CELLS
+            for col in cols:
+                cell = base + col
+                yield self.order[starts[cell] : starts[cell + 1]]
+
+    def within(self, lat: float, lon: float, radius_nm: float) -> list:
+        """Return ``(distance_nm, index)`` of the points within *radius_nm*."""
+        lat1 = math.radians(lat)
+        lon1 = math.radians(lon)
+        cos_lat1 = math.cos(lat1)
+        # Compare haversine terms to avoid an atan2 per rejected point
+        limit = math.sin(min(radius_nm / EARTH_RADIUS_NM, math.pi) / 2) ** 2
+        lats = self.lats
+        lons = self.lons
+        radians = math.radians
+        sin = math.sin
+        cos = math.cos
+        found = []
+        for run in self._candidates(lat, lon, radius_nm):
+            for i in run:
+                lat2 = radians(lats[i])
+                a = (
+                    sin((lat2 - lat1) / 2) ** 2
+                    + cos_lat1 * cos(lat2) * sin((radians(lons[i]) - lon1) / 2) ** 2
+                )
+                if a <= limit:
+                    dist = EARTH_RADIUS_NM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+                    found.append((dist, i))
+        found.sort()
+        return found
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> list:
+        """Return the *k* closest ``(distance_nm, index)`` pairs.
+
+        The search radius doubles until enough points are inside it, so
+        dense areas finish after one small scan.
+        """
+        if k <= 0 or not len(self):
+            return []
+        limit = math.pi * EARTH_RADIUS_NM
+        radius = 30.0 if k < len(self) else limit
+        while True:
+            found = self.within(lat, lon, radius)
+            if len(found) >= k or radius >= limit:
+                return found[:k]
+            radius *= 2
@@ -0,0 +1,213 @@
+"""Reusable record holding the outputs of one simulation step."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+# Output fields of A320IFRSim.step() in their documented order.
+STEP_FIELDS = (
+    "altitude_ft",
+    "speed_kt",
+    "heading_deg",
+    "vs_fpm",
+    "pitch_cmd",
+    "aileron_cmd",
+    "pitch_deg",
+    "roll_deg",
+    "throttle_cmd",
+    "n1",
+    "flap",
+    "gear",
+    "speedbrake",
+    "hyd_press",
+    "elec_charge",
+    "anti_ice_on",
+    "ice_accum",
+    "wing_anti_ice_on",
+    "wing_ice_accum",
+    "cabin_altitude_ft",
+    "cabin_diff_psi",
+    "cabin_temp_c",
+    "bleed_press",
+    "fuel_lbs",
+    "fuel_left_lbs",
+    "fuel_right_lbs",
+    "fuel_flow_lbs_hr_eng1",
+    "fuel_flow_lbs_hr_eng2",
+    "apu_flow_lbs_hr",
+    "crossfeed",
+    "oxygen_level",
+    "stall_warning",
+    "gpws_warning",
+    "overspeed_warning",
+    "weather_radar",
+    "nav_dist_nm",
+    "ils_dist_nm",
+    "loc_dev_deg",
+    "gs_dev_ft",
+    "brake_temp",
+    "autobrake_active",
+    "oil_press",
+    "oil_temp",
+    "egt",
+    "engine_fire",
+    "fire_bottles",
+    "rat_deployed",
+    "flap_operable",
+    "gear_operable",
+    "tcas_alert",
+    "master_caution",
+    "parking_brake",
+    "outside_temp_c",
+    "precip_intensity",
+    "time_s",
+)
+
+_FIELD_SET = frozenset(STEP_FIELDS)
+
+# Optional outputs grouped by the work step() does to produce them. Fields
+# outside these groups describe the flight state and the safety warnings
+# and are filled every frame.
+OUTPUT_GROUPS = {
+    "attitude": ("vs_fpm", "pitch_deg", "roll_deg"),
+    "controls": (
+        "flap",
+        "gear",
+        "speedbrake",
+        "flap_operable",
+        "gear_operable",
+        "parking_brake",
+    ),
+    "systems": (
+        "hyd_press",
+        "elec_charge",
+        "bleed_press",
+        "anti_ice_on",
+        "ice_accum",
+        "wing_anti_ice_on",
+        "wing_ice_accum",
+        "rat_deployed",
+    ),
+    "engines": ("egt", "oil_press", "oil_temp", "fire_bottles"),
+    "fuel": (
+        "fuel_lbs",
+        "fuel_left_lbs",
+        "fuel_right_lbs",
+        "fuel_flow_lbs_hr_eng1",
+        "fuel_flow_lbs_hr_eng2",
+        "apu_flow_lbs_hr",
+        "crossfeed",
+    ),
+    "cabin": ("cabin_altitude_ft", "cabin_diff_psi", "cabin_temp_c", "oxygen_level"),
+    "navigation": ("nav_dist_nm", "ils_dist_nm", "loc_dev_deg", "gs_dev_ft"),
+    "brakes": ("brake_temp", "autobrake_active"),
+    "environment": ("outside_temp_c", "precip_intensity", "weather_radar"),
+}
+
+_FIELD_GROUP = {
+    field: group for group, fields in OUTPUT_GROUPS.items() for field in fields
+}
+
+
+def output_groups(fields) -> frozenset:
+    """Return the names of the :data:`OUTPUT_GROUPS` covering *fields*."""
+    return frozenset(_FIELD_GROUP[f] for f in fields if f in _FIELD_GROUP)
+
+
+class Subscriptions:
+    """Union of the outputs requested by independent consumers.
+
+    Each consumer calls :meth:`subscribe` with the names it reads and keeps
+    the returned token for :meth:`unsubscribe`. :attr:`active` is the union
+    of all subscriptions, or every known name while nobody has subscribed,
+    so producers only need to check membership.
+    """
+
+    def __init__(self, names) -> None:
+        self.names = tuple(names)
+        self._known = frozenset(self.names)
+        self._subscribers: dict[int, frozenset] = {}
+        self._next_token = 0
+        self.active = self._known
+
+    @property
+    def projected(self) -> bool:
+        """True while the subscriptions leave out at least one name."""
+        return self.active != self._known
+
+    def subscribe(self, names) -> int:
+        """Request *names* and return a token for :meth:`unsubscribe`."""
+        names = frozenset(names)
+        unknown = names - self._known
+        if unknown:
+            raise ValueError(f"Unknown output: {', '.join(sorted(unknown))}")
+        token = self._next_token
+        self._next_token += 1
+        self._subscribers[token] = names
+        self._update()
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        """Withdraw the subscription identified by *token*."""
+        if self._subscribers.pop(token, None) is not None:
+            self._update()
+
+    def _update(self) -> None:
+        if self._subscribers:
+            self.active = frozenset().union(*self._subscribers.values())
+        else:
+            self.active = self._known
+
+
+class StepFrame(Mapping):
+    """Step outputs filled in place by the autopilot and the simulation.
+
+    One record is allocated per simulation and overwritten every frame, so
+    stepping creates no new containers; the per-engine ``n1`` and ``egt``
+    lists are updated element-wise. Fields are read as attributes. The
+    record also behaves as a read-only mapping for code written against
+    the former result dict, and :meth:`as_dict` returns an independent
+    copy for callers that keep frames around.
+    """
+
+    __slots__ = STEP_FIELDS
+
+    def __init__(self, engines: int = 2) -> None:
+        for name in STEP_FIELDS:
+            setattr(self, name, None)
+        self.n1 = [0.0] * engines
+        self.egt = [0.0] * engines
+
+    def __getitem__(self, name: str):
+        if name not in _FIELD_SET:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __iter__(self):
+        return iter(STEP_FIELDS)
+
+    def __len__(self) -> int:
+        return len(STEP_FIELDS)
+
+    def as_dict(self) -> dict:
+        """Return the outputs as a new dictionary detached from the record."""
+        data = {name: getattr(self, name) for name in STEP_FIELDS}
+        # The per-engine lists are None while their output group is cleared
+        for name in ("n1", "egt"):
+            if data[name] is not None:
+                data[name] = list(data[name])
+        return data
+
+    def clear(self, names) -> None:
+        """Set the fields in *names* to None, e.g. outputs nobody reads."""
+        for name in names:
+            setattr(self, name, None)
+
+    def fill_dict(self, data: dict) -> dict:
+        """Write all outputs into *data* and return it, reusing its storage."""
+        for name in STEP_FIELDS:
+            data[name] = getattr(self, name)
+        return data
+
+    def __repr__(self) -> str:
+        return f"StepFrame(time_s={self.time_s!r}, altitude_ft={self.altitude_ft!r})"
@@ -0,0 +1,238 @@
+"""Check the geodesy helpers against an independent spherical reference.
+
+The reference works on earth-centred unit vectors: distances use the
+Vincenty form of the central angle, bearings project the destination onto
+the local north/east plane and cross-track distances use the normal of the
+leg's great circle. None of it shares code or formulas with
+:mod:`geodesy`.
+"""
+
+import math
+import random
+
+import pytest
+
+import geodesy
+from geodesy import EARTH_RADIUS_NM
+
+# Distances agree to well below a metre; along-track distances come from an
+# arccosine, which loses precision for points close to the leg start.
+DIST_TOL_NM = 1e-6
+ALONG_TOL_NM = 1e-4
+BEARING_TOL_DEG = 1e-6
+
+
+def _vec(lat, lon):
+    lat = math.radians(lat)
+    lon = math.radians(lon)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a, b):
+    return (
+        a[1] * b[2] - a[2] * b[1],
+        a[2] * b[0] - a[0] * b[2],
+        a[0] * b[1] - a[1] * b[0],
+    )
+
+
+def _norm(a):
+    return math.sqrt(_dot(a, a))
+
+
+def ref_distance(lat1, lon1, lat2, lon2):
+    """Vincenty central angle on the sphere, in NM."""
+    p1 = math.radians(lat1)
+    p2 = math.radians(lat2)
+    dlon = math.radians(lon2 - lon1)
+    y = math.hypot(
+        math.cos(p2) * math.sin(dlon),
+        math.cos(p1) * math.sin(p2) - math.sin(p1) * math.cos(p2) * math.cos(dlon),
+    )
+    x = math.sin(p1) * math.sin(p2) + math.cos(p1) * math.cos(p2) * math.cos(dlon)
+    return math.atan2(y, x) * EARTH_RADIUS_NM
+
+
+def ref_bearing(lat1, lon1, lat2, lon2):
+    """Initial bearing from the local north and east unit vectors."""
+    a = _vec(lat1, lon1)
+    b = _vec(lat2, lon2)
+    lat = math.radians(lat1)
+    lon = math.radians(lon1)
+    north = (-math.sin(lat) * math.cos(lon), -math.sin(lat) * math.sin(lon), math.cos(lat))
+    east = (-math.sin(lon), math.cos(lon), 0.0)
+    ab = _dot(a, b)
+    d = (b[0] - ab * a[0], b[1] - ab * a[1], b[2] - ab * a[2])
+    return math.degrees(math.atan2(_dot(d, east), _dot(d, north))) % 360
+
+
+def ref_cross_track(lat, lon, lat1, lon1, lat2, lon2):
+    """Cross-track (positive right) and along-track distance in NM."""
+    a = _vec(lat1, lon1)
+    b = _vec(lat2, lon2)
+    p = _vec(lat, lon)
+    n = _cross(a, b)
+    length = _norm(n)
+    n = (n[0] / length, n[1] / length, n[2] / length)
+    # The normal points left of the course
+    np_ = _dot(n, p)
+    xt = -math.asin(max(-1.0, min(1.0, np_)))
+    q = (p[0] - np_ * n[0], p[1] - np_ * n[1], p[2] - np_ * n[2])
+    at = math.atan2(_norm(_cross(a, q)), _dot(a, q))
+    return xt * EARTH_RADIUS_NM, at * EARTH_RADIUS_NM
+
+
+def _bearing_diff(a, b):
+    return abs((a - b + 180) % 360 - 180)
+
+
+def _random_pairs(count, seed):
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        # Uniform on the sphere rather than in latitude
+        lat1 = math.degrees(math.asin(rng.uniform(-1, 1)))
+        lon1 = rng.uniform(-180, 180)
+        lat2 = math.degrees(math.asin(rng.uniform(-1, 1)))
+        lon2 = rng.uniform(-180, 180)
+        pairs.append((lat1, lon1, lat2, lon2))
+    return pairs
+
+
+SPECIAL_PAIRS = [
+    # Short separations, down to about a metre
+    (47.0, 8.0, 47.0, 8.00001),
+    (47.0, 8.0, 47.00001, 8.0),
+    (-33.9, 151.2, -33.90002, 151.20003),
+    (0.0, 0.0, 0.001, 0.001),
+    (51.47, -0.46, 51.48, -0.44),
+    # Across the antimeridian in both directions
+    (10.0, 179.9, 10.0, -179.9),
+    (10.0, -179.9, 10.0, 179.9),
+    (-45.0, 179.5, -44.5, -179.5),
+    (65.0, -170.0, 60.0, 170.0),
+    # Near the poles and across them
+    (89.9, 0.0, 89.9, 180.0),
+    (-89.9, 45.0, -89.9, -135.0),
+    (85.0, 10.0, 88.0, -170.0),
+    (-80.0, 0.0, -89.0, 90.0),
+    # Long legs, short of antipodal
+    (0.0, 0.0, 0.0, 179.0),
+    (40.0, -74.0, -33.9, 151.2),
+]
+
+
+@pytest.mark.parametrize("lat1,lon1,lat2,lon2", SPECIAL_PAIRS + _random_pairs(200, 1))
+def test_bearing_distance_matches_reference(lat1, lon1, lat2, lon2):
+    bearing, dist = geodesy.bearing_distance(lat1, lon1, lat2, lon2)
+    assert dist == pytest.approx(ref_distance(lat1, lon1, lat2, lon2), abs=DIST_TOL_NM)
+    assert geodesy.distance_nm(lat1, lon1, lat2, lon2) == pytest.approx(dist, abs=DIST_TOL_NM)
+    assert _bearing_diff(bearing, ref_bearing(lat1, lon1, lat2, lon2)) < BEARING_TOL_DEG
+    assert geodesy.bearing_deg(lat1, lon1, lat2, lon2) == bearing
+
+
+def test_known_values():
+    quarter = math.pi / 2 * EARTH_RADIUS_NM
+    assert geodesy.distance_nm(0.0, 0.0, 90.0, 0.0) == pytest.approx(quarter)
+    assert geodesy.distance_nm(90.0, 0.0, -90.0, 0.0) == pytest.approx(2 * quarter)
+    assert geodesy.distance_nm(10.0, 20.0, 10.0, 20.0) == 0.0
+    # One minute of arc is one nautical mile
+    assert geodesy.distance_nm(0.0, 0.0, 1 / 60, 0.0) == pytest.approx(
+        EARTH_RADIUS_NM * math.radians(1 / 60)
+    )
+    assert geodesy.bearing_deg(0.0, 0.0, 0.0, 1.0) == pytest.approx(90.0)
+    assert geodesy.bearing_deg(0.0, 0.0, 0.0, -1.0) == pytest.approx(270.0)
+    assert geodesy.bearing_deg(10.0, 179.9, 10.0, -179.9) == pytest.approx(90.0, abs=0.1)
+    assert geodesy.bearing_deg(10.0, -179.9, 10.0, 179.9) == pytest.approx(270.0, abs=0.1)
+
+
+@pytest.mark.parametrize("lat,lon", [(0.0, 0.0), (45.0, -120.0), (-60.0, 170.0), (89.0, 30.0)])
+def test_bearing_to_poles(lat, lon):
+    assert _bearing_diff(geodesy.bearing_deg(lat, lon, 90.0, 0.0), 0.0) < BEARING_TOL_DEG
+    assert _bearing_diff(geodesy.bearing_deg(lat, lon, -90.0, 0.0), 180.0) < BEARING_TOL_DEG
+
+
+def test_unit_vector():
+    for lat, lon in [(0.0, 0.0), (90.0, 0.0), (-33.9, 151.2), (10.0, -179.9)]:
+        assert geodesy.unit_vector(lat, lon) == pytest.approx(_vec(lat, lon), abs=1e-15)
+
+
+LEGS = [
+    (0.0, 0.0, 0.0, 1.0),
+    (47.0, 8.0, 47.2, 8.3),
+    (10.0, 179.5, 10.5, -179.5),
+    (85.0, 0.0, 85.0, 180.0 - 1e-3),
+    (-70.0, -60.0, -80.0, 120.0),
+    (40.0, -74.0, 51.5, -0.5),
+]
+
+
+def _points_near(leg, seed):
+    lat1, lon1, lat2, lon2 = leg
+    rng = random.Random(seed)
+    points = [(lat1, lon1), (lat2, lon2)]
+    for _ in range(40):
+        t = rng.uniform(-0.5, 1.5)
+        lat = lat1 + t * (lat2 - lat1) + rng.uniform(-0.5, 0.5)
+        lon = lon1 + t * ((lon2 - lon1 + 180) % 360 - 180) + rng.uniform(-0.5, 0.5)
+        lat = max(-89.9, min(89.9, lat))
+        lon = (lon + 180) % 360 - 180
+        points.append((lat, lon))
+    return points
+
+
+@pytest.mark.parametrize("leg", LEGS)
+def test_cross_track_matches_reference(leg):
+    for lat, lon in _points_near(leg, 2):
+        xt, at = geodesy.cross_track(lat, lon, *leg)
+        ref_xt, ref_at = ref_cross_track(lat, lon, *leg)
+        assert xt == pytest.approx(ref_xt, abs=DIST_TOL_NM)
+        assert at == pytest.approx(ref_at, abs=ALONG_TOL_NM)
+
+
+def test_cross_track_sign():
+    # Flying east along the equator, north is left
+    xt, at = geodesy.cross_track(1.0, 0.5, 0.0, 0.0, 0.0, 1.0)
+    assert xt == pytest.approx(-EARTH_RADIUS_NM * math.radians(1.0))
+    assert at > 0
+    xt, _ = geodesy.cross_track(-1.0, 0.5, 0.0, 0.0, 0.0, 1.0)
+    assert xt == pytest.approx(EARTH_RADIUS_NM * math.radians(1.0))
+    # A point on the leg across the antimeridian
+    xt, at = geodesy.cross_track(0.0, -179.5, 0.0, 179.0, 0.0, -179.0)
+    assert xt == pytest.approx(0.0, abs=DIST_TOL_NM)
+    assert at == pytest.approx(EARTH_RADIUS_NM * math.radians(1.5))
+
+
+def test_array_variants_match_scalar():
+    np = pytest.importorskip("numpy")
+    pairs = SPECIAL_PAIRS + _random_pairs(500, 3)
+    lat1, lon1, lat2, lon2 = (np.array(c) for c in zip(*pairs))
+    bearings, dists = geodesy.bearing_distance_array(lat1, lon1, lat2, lon2)
+    assert np.allclose(
+        geodesy.distance_array(lat1, lon1, lat2, lon2), dists, rtol=0, atol=DIST_TOL_NM
+    )
+    assert np.array_equal(geodesy.bearing_array(lat1, lon1, lat2, lon2), bearings)
+    for i, pair in enumerate(pairs):
+        assert dists[i] == pytest.approx(ref_distance(*pair), abs=DIST_TOL_NM)
+        assert _bearing_diff(bearings[i], ref_bearing(*pair)) < BEARING_TOL_DEG
+    # Scalar arguments broadcast against arrays
+    _, dists = geodesy.bearing_distance_array(47.0, 8.0, lat2, lon2)
+    for i, (lat, lon) in enumerate(zip(lat2, lon2)):
+        assert dists[i] == pytest.approx(ref_distance(47.0, 8.0, lat, lon), abs=DIST_TOL_NM)
+
+
+@pytest.mark.parametrize("leg", LEGS)
+def test_cross_track_array_matches_reference(leg):
+    np = pytest.importorskip("numpy")
+    points = _points_near(leg, 4)
+    lats = np.array([p[0] for p in points])
+    lons = np.array([p[1] for p in points])
+    xts, ats = geodesy.cross_track_array(lats, lons, *leg)
+    for i, (lat, lon) in enumerate(points):
+        ref_xt, ref_at = ref_cross_track(lat, lon, *leg)
+        assert xts[i] == pytest.approx(ref_xt, abs=DIST_TOL_NM)
+        assert ats[i] == pytest.approx(ref_at, abs=ALONG_TOL_NM)
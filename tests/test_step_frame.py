@@ -0,0 +1,66 @@
+"""Step outputs of a simulation whose consumers subscribed to a subset."""
+
+import pytest
+
+from step_frame import OUTPUT_GROUPS, STEP_FIELDS, StepFrame
+
+
+def _make_sim(tmp_path):
+    ifrsim = pytest.importorskip("ifrsim")
+    from fake_fdm import FakeFDM
+    from navdb import NavDatabase
+
+    (tmp_path / "airports.csv").write_text(
+        "ident,name,lat_deg,lon_deg\nKJFK,JFK,40.6398,-73.7789\nKLAX,LAX,33.9425,-118.408\n"
+    )
+    (tmp_path / "waypoints.csv").write_text("ident,lat_deg,lon_deg\nWPT1,39.0,-90.0\n")
+    (tmp_path / "ils.csv").write_text(
+        "freq_mhz,lat_deg,lon_deg,heading_deg,alt_ft\n111.10,33.942,-118.408,250.0,125.0\n"
+    )
+    nav_db = NavDatabase(
+        tmp_path / "airports.csv",
+        tmp_path / "waypoints.csv",
+        tmp_path / "ils.csv",
+        use_cache=False,
+    )
+    return ifrsim.A320IFRSim(seed=1, nav_db=nav_db, fdm=FakeFDM())
+
+
+@pytest.fixture
+def sim(tmp_path):
+    return _make_sim(tmp_path)
+
+
+def test_as_dict_of_cleared_frame():
+    frame = StepFrame()
+    for fields in OUTPUT_GROUPS.values():
+        frame.clear(fields)
+    data = frame.as_dict()
+    assert list(data) == list(STEP_FIELDS)
+    assert data["egt"] is None
+    assert data["n1"] == [0.0, 0.0] and data["n1"] is not frame.n1
+
+
+def test_as_dict_of_subscribed_sim(sim):
+    token = sim.subscribe(["altitude_ft", "speed_kt"])
+    frame = sim.step(real_time=False)
+    data = frame.as_dict()
+    assert data["altitude_ft"] == frame.altitude_ft
+    assert data["egt"] is None and data["cabin_temp_c"] is None
+    assert data["n1"] == frame.n1 and data["n1"] is not frame.n1
+
+    sim.unsubscribe(token)
+    data = sim.step(real_time=False).as_dict()
+    assert len(data["egt"]) == len(data["n1"])
+
+
+def test_unsubscribed_systems_keep_running(tmp_path):
+    full = _make_sim(tmp_path)
+    projected = _make_sim(tmp_path)
+    token = projected.subscribe(["altitude_ft"])
+    for _ in range(300):
+        full.step(real_time=False)
+        projected.step(real_time=False)
+    projected.unsubscribe(token)
+    assert projected.cabin_temp.cabin_temp == full.cabin_temp.cabin_temp
+    assert projected.step(real_time=False).as_dict() == full.step(real_time=False).as_dict()